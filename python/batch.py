@@ -0,0 +1,352 @@
+"""Vectorized NumPy engine that plays N games of 45s side by side.
+
+Every game lives in a row of a handful of arrays: hands are 52-bit masks
+(one uint64 per seat, bit i is card `DECK[i]`), and the trick order, legal
+moves and bidding heuristics are lookup tables built from `card.py` and
+`rules.py`, so each step of play is a few array operations over all games
+at once instead of per-card Python objects:
+
+    python batch.py --games 100000 --seed 1
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from card import DECK, SUITS, SUIT_INDEX, is_ace_of_hearts, less_than, rank_table
+from rules import HAND_SIZE, KITTY_SIZE, TRICK_POINTS, WINNING_SCORE
+from strategy import FACE_CARD_POINTS
+
+NO_SUIT = len(SUITS)  # suit index used for "no suit led yet"
+ALL_CARDS = np.arange(len(DECK))
+CARD_SUIT = np.append(ALL_CARDS // 13, -1)
+CARD_BITS = np.append(np.left_shift(np.uint64(1), ALL_CARDS.astype(np.uint64)), np.uint64(0))
+NO_CARD = len(DECK)  # padding for empty slots in card index arrays
+ZERO = np.uint64(0)
+ONE = np.uint64(1)
+
+
+def _mask(cards) -> np.uint64:
+    bits = ZERO
+    for card in cards:
+        bits |= CARD_BITS[card.index]
+    return bits
+
+
+# RANKS[suit_led, trump, card]: the card.py rank tables as one array, with
+# NO_SUIT standing for "nothing led yet" and NO_CARD ranked below everything.
+RANKS = np.array(
+    [
+        [rank_table(suit_led, trump) + (-1,) for trump in SUITS]
+        for suit_led in SUITS + (None,)
+    ],
+    dtype=np.int16,
+)
+
+SUIT_MASK = np.array([_mask(c for c in DECK if c.suit == s) for s in SUITS])
+KING_MASK = _mask(c for c in DECK if c.value == 13)
+
+
+def _legal_tables() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per (card led, trump) masks mirroring `rules.legal_moves`."""
+    follow = np.zeros((len(DECK), len(SUITS)), dtype=np.uint64)
+    renegable = np.zeros_like(follow)
+    led_trump = np.zeros(follow.shape, dtype=bool)
+    for led in DECK:
+        for t, trump in enumerate(SUITS):
+            suit_led = trump if is_ace_of_hearts(led) else led.suit
+            follow[led.index, t] = _mask(
+                c for c in DECK
+                if c.suit == suit_led or c.suit == trump or is_ace_of_hearts(c)
+            )
+            renegable[led.index, t] = _mask(
+                c for c in DECK
+                if (is_ace_of_hearts(c) or (c.suit == trump and c.value in (5, 11)))
+                and not less_than(c, led, suit_led, trump)
+            )
+            led_trump[led.index, t] = suit_led == trump
+    return follow, renegable, led_trump
+
+
+FOLLOW_MASK, RENEGABLE_MASK, LED_IS_TRUMP = _legal_tables()
+
+
+def _bid_tables() -> tuple[np.ndarray, np.ndarray]:
+    """evaluate_hand_bid is additive per card, so a hand's per-suit "sure
+    points" and small-card counts are sums of rows of these tables."""
+    sure = np.zeros((len(DECK) + 1, len(SUITS)), dtype=np.int16)
+    small = np.zeros_like(sure)
+    for card in DECK:
+        suit = SUIT_INDEX[card.suit]
+        if is_ace_of_hearts(card):
+            sure[card.index, :] = 5
+        elif card.value in FACE_CARD_POINTS:
+            sure[card.index, suit] = FACE_CARD_POINTS[card.value]
+        else:
+            small[card.index, suit] = 1
+    return sure, small
+
+
+BID_SURE, BID_SMALL = _bid_tables()
+
+
+def hand_cards(masks: np.ndarray, size: int = HAND_SIZE) -> np.ndarray:
+    """The first `size` cards of each mask as card indices in ascending
+    order, padded with NO_CARD."""
+    cards = np.empty(masks.shape + (size,), dtype=np.intp)
+    rest = masks.copy()
+    for slot in range(size):
+        low = rest & (~rest + ONE)
+        cards[..., slot] = np.where(low == 0, NO_CARD, np.bitwise_count(low - ONE))
+        rest ^= low
+    return cards
+
+
+def lowest_cards(masks: np.ndarray, count: int) -> np.ndarray:
+    """Keeps the `count` lowest-indexed cards of each mask."""
+    kept = np.zeros_like(masks)
+    rest = masks.copy()
+    for _ in range(count):
+        low = rest & (~rest + ONE)
+        kept |= low
+        rest ^= low
+    return kept
+
+
+# ── Policies ────────────────────────────────────────────────────────
+#
+# A policy picks one card per game: policy(legal, trick, suit_led, trump)
+# gets the legal cards as an (n, 5) card index array from hand_cards, the
+# cards already on the table as an (n, k) index array, and suit indices
+# (NO_SUIT when leading). It returns the chosen card indices.
+
+
+def tbot_policy(legal, trick, suit_led, trump) -> np.ndarray:
+    """`strategy.evaluate_hand_play`, with hands ordered by card index."""
+    rows = np.arange(len(legal))
+    ranks = RANKS[suit_led[:, None], trump[:, None], legal]
+    best = ranks.argmax(axis=1)
+    if trick.shape[1] == 0:
+        return legal[rows, best]
+
+    table = RANKS[suit_led[:, None], trump[:, None], trick].max(axis=1)
+    can_win = ranks[rows, best] > table
+
+    suits = CARD_SUIT[legal]
+    unset = np.iinfo(np.int16).max
+    trumps = suits == trump[:, None]
+    worst_trump = np.where(trumps, ranks, unset).argmin(axis=1)
+    use_trump = (suit_led == trump) & trumps.any(axis=1)
+
+    # get_min_card breaks ties towards the later card, hence the reversal.
+    offsuit = (legal != NO_CARD) & (suits != suit_led[:, None]) & (suits != trump[:, None])
+    lowest_offsuit = legal.shape[1] - 1 - np.where(offsuit, ranks, unset)[:, ::-1].argmin(axis=1)
+
+    slot = np.where(
+        can_win,
+        best,
+        np.where(use_trump, worst_trump, np.where(offsuit.any(axis=1), lowest_offsuit, 0)),
+    )
+    return legal[rows, slot]
+
+
+def random_policy(rng: np.random.Generator):
+    """A policy playing a uniformly random legal card."""
+
+    def policy(legal, trick, suit_led, trump) -> np.ndarray:
+        pick = np.where(legal != NO_CARD, rng.random(legal.shape), -1.0).argmax(axis=1)
+        return legal[np.arange(len(legal)), pick]
+
+    return policy
+
+
+# ── Rounds ──────────────────────────────────────────────────────────
+
+
+class BatchRound:
+    """One round (deal to scoring) of `n` independent games."""
+
+    def __init__(self, dealer: np.ndarray, rng: np.random.Generator, policy=tbot_policy) -> None:
+        self.n = len(dealer)
+        self.rows = np.arange(self.n)
+        self.dealer = dealer
+        self.policy = policy
+
+        self.stock = rng.permuted(np.tile(ALL_CARDS, (self.n, 1)), axis=1)
+        self.stock_pos = np.zeros(self.n, dtype=np.intp)
+        self.hands = np.stack([self.draw(HAND_SIZE) for _ in range(4)], axis=1)
+
+        self.bid = np.zeros(self.n, dtype=np.int16)
+        self.bid_seat = np.zeros(self.n, dtype=np.intp)
+        self.trump = np.zeros(self.n, dtype=np.intp)
+        self.points = np.zeros((self.n, 2), dtype=np.int16)
+        self.leader = None
+        self.suit_led = np.full(self.n, NO_SUIT, dtype=np.intp)
+        self.winning_cards = []
+        self.winning_seats = []
+
+    def draw(self, count) -> np.ndarray:
+        """Draws `count` cards (a scalar or one count per game) from the stock."""
+        count = np.broadcast_to(count, (self.n,))
+        drawn = np.zeros(self.n, dtype=np.uint64)
+        for j in range(int(count.max(initial=0))):
+            take = j < count
+            card = self.stock[self.rows, np.minimum(self.stock_pos, len(DECK) - 1)]
+            drawn |= np.where(take, CARD_BITS[card], ZERO)
+            self.stock_pos += take
+        return drawn
+
+    def bidding(self) -> None:
+        """Every seat bids with `strategy.choose_bid`, starting left of the dealer."""
+        cards = hand_cards(self.hands)
+        sure = BID_SURE[cards].sum(axis=2)
+        small = BID_SMALL[cards].sum(axis=2)
+        suit = sure.argmax(axis=2)
+        estimate = (
+            np.take_along_axis(small, suit[..., None], axis=2)[..., 0] * 3
+            + np.take_along_axis(sure, suit[..., None], axis=2)[..., 0]
+        )
+        value = np.where(estimate >= 15, estimate // 5 * 5, 0)
+
+        for turn in range(4):
+            seat = (self.dealer + 1 + turn) % 4
+            bagged = (turn == 3) & (self.bid == 0)
+            offer = value[self.rows, seat]
+            bid = np.where(bagged, 15, np.where(offer > self.bid, offer, 0))
+            raised = bid > self.bid
+            self.bid = np.where(raised, bid, self.bid)
+            self.bid_seat = np.where(raised, seat, self.bid_seat)
+            self.trump = np.where(raised, suit[self.rows, seat], self.trump)
+
+    def discarding(self) -> None:
+        """The bidder takes the kitty, everyone keeps trumps and kings
+        (`strategy.choose_discard`), and hands are refilled in seat order."""
+        self.hands[self.rows, self.bid_seat] |= self.draw(KITTY_SIZE)
+        keep = self.hands & (SUIT_MASK[self.trump] | KING_MASK)[:, None]
+        keep = np.where(keep == 0, self.hands, keep)
+        self.hands = lowest_cards(keep, HAND_SIZE)
+        for seat in range(4):
+            need = HAND_SIZE - np.bitwise_count(self.hands[:, seat]).astype(np.intp)
+            self.hands[:, seat] |= self.draw(need)
+        self.leader = self.bid_seat.copy()
+
+    def legal(self, hands: np.ndarray, card_led: np.ndarray) -> np.ndarray:
+        """Vectorized `rules.legal_moves`."""
+        legal = hands & FOLLOW_MASK[card_led, self.trump]
+        whole_hand = (
+            (legal == 0)
+            | (~LED_IS_TRUMP[card_led, self.trump] & ((legal & ~SUIT_MASK[self.trump]) == 0))
+            | ((legal & ~RENEGABLE_MASK[card_led, self.trump]) == 0)
+        )
+        return np.where(whole_hand, hands, legal)
+
+    def play_trick(self) -> np.ndarray:
+        """Plays one trick in every game. Returns the cards in play order."""
+        seats = (self.leader[:, None] + np.arange(4)) % 4
+        trick = np.empty((self.n, 4), dtype=np.intp)
+        suit_led = np.full(self.n, NO_SUIT, dtype=np.intp)
+
+        for turn in range(4):
+            seat = seats[:, turn]
+            hands = self.hands[self.rows, seat]
+            legal = hands if turn == 0 else self.legal(hands, trick[:, 0])
+            card = self.policy(hand_cards(legal), trick[:, :turn], suit_led, self.trump)
+            if np.any((legal & CARD_BITS[card]) == 0):
+                raise ValueError("Policy played an illegal card.")
+            self.hands[self.rows, seat] = hands & ~CARD_BITS[card]
+            trick[:, turn] = card
+            if turn == 0:
+                suit_led = CARD_SUIT[card]
+
+        ranks = RANKS[suit_led[:, None], self.trump[:, None], trick]
+        winner = ranks.argmax(axis=1)
+        self.leader = seats[self.rows, winner]
+        self.points[self.rows, self.leader % 2] += TRICK_POINTS
+        self.winning_cards.append(trick[self.rows, winner])
+        self.winning_seats.append(self.leader)
+        self.suit_led = suit_led
+        return trick
+
+    def play(self) -> None:
+        self.bidding()
+        self.discarding()
+        for _ in range(HAND_SIZE):
+            self.play_trick()
+
+        # The best of the five trick-winning cards earns its team a bonus.
+        cards = np.stack(self.winning_cards, axis=1)
+        seats = np.stack(self.winning_seats, axis=1)
+        ranks = RANKS[self.suit_led[:, None], self.trump[:, None], cards]
+        best_seat = seats[self.rows, ranks.argmax(axis=1)]
+        self.points[self.rows, best_seat % 2] += TRICK_POINTS
+
+    @property
+    def made(self) -> np.ndarray:
+        return self.points[self.rows, self.bid_seat % 2] >= self.bid
+
+
+def play_games(n: int, rng: np.random.Generator, policy=tbot_policy) -> dict:
+    """Plays `n` games to 120. Rounds only run for games still in progress."""
+    scores = np.zeros((n, 2), dtype=np.int32)
+    dealer = rng.integers(0, 4, n)
+    winner = np.full(n, -1, dtype=np.int8)
+    rounds = np.zeros(n, dtype=np.int32)
+    bids = made = 0
+
+    active = np.arange(n)
+    while len(active):
+        hand = BatchRound(dealer[active], rng, policy)
+        hand.play()
+
+        bid_team = hand.bid_seat % 2
+        change = hand.points.astype(np.int32)
+        change[hand.rows, bid_team] = np.where(hand.made, change[hand.rows, bid_team], -hand.bid)
+        scores[active] += change
+        rounds[active] += 1
+        bids += len(active)
+        made += int(hand.made.sum())
+
+        won = np.where(
+            scores[active, 0] >= WINNING_SCORE,
+            0,
+            np.where(scores[active, 1] >= WINNING_SCORE, 1, -1),
+        )
+        winner[active] = won
+        dealer[active] = (dealer[active] + 1) % 4
+        active = active[won == -1]
+
+    return {
+        "winner": winner,
+        "scores": scores,
+        "rounds": rounds,
+        "bid_made_rate": made / bids,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play batches of 45s games with NumPy.")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    wins = np.zeros(2, dtype=np.int64)
+    rounds = 0
+
+    start = time.perf_counter()
+    for offset in range(0, args.games, args.batch_size):
+        result = play_games(min(args.batch_size, args.games - offset), rng)
+        wins += np.bincount(result["winner"], minlength=2)
+        rounds += int(result["rounds"].sum())
+    elapsed = time.perf_counter() - start
+
+    tricks = rounds * HAND_SIZE
+    print(f"{args.games} games, {rounds} rounds in {elapsed:.2f}s "
+          f"({args.games / elapsed:,.0f} games/s, {tricks / elapsed:,.0f} tricks/s)")
+    print(f"team 0 wins: {wins[0]}  team 1 wins: {wins[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+"""Seeded micro-benchmarks for card.py, the decision rules and page parsing.
+
+Every benchmark runs one function over a fixed, seeded list of inputs and
+reports the best of REPEAT runs in calls per second. Results can be saved
+as a baseline, and later runs fail when a benchmark's throughput drops
+by more than the threshold below it:
+
+    python bench.py --save-baseline        # on the commit before a change
+    python bench.py                        # after it; exits 1 on a regression
+    python bench.py --filter card --threshold 0.25
+
+The baseline goes to --baseline, or TBOT_BENCH_BASELINE, or else
+bench_baseline.json next to this file, which git ignores.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+from card import DECK, SUITS, Card, eval_trump, is_ace_of_hearts, less_than, rank_key, rank_table
+from gameview import card_value, parse_card, parse_game_view
+from hand import legal_mask, mask_of
+from rules import legal_moves, renegable
+from strategy import evaluate_hand_bid, evaluate_hand_play, get_max_card, get_min_card
+
+SEED = 45
+SAMPLES = 20_000
+# Page parses are ~100x slower than the card primitives.
+PAGES = 500
+REPEAT = 5
+MIN_RUN_TIME = 0.2
+THRESHOLD = 0.15
+# Machine-specific, so not checked in (see .gitignore).
+BASELINE_PATH = Path(
+    os.getenv("TBOT_BENCH_BASELINE", Path(__file__).with_name("bench_baseline.json"))
+)
+
+CARD_VALUES = ("A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K")
+
+
+def verify_rank_order() -> None:
+    """Check rank_key against less_than for every card pair and context."""
+    for suit_led in SUITS + (None,):
+        for trump in SUITS + (None,):
+            for a in DECK:
+                for b in DECK:
+                    ra, rb = rank_key(a, suit_led, trump), rank_key(b, suit_led, trump)
+                    expected = less_than(a, b, suit_led, trump)
+                    if expected != (ra < rb or ra == rb == 0):
+                        raise AssertionError(f"{a} < {b} led={suit_led} trump={trump}")
+
+
+def reference_legal_moves(hand, card_led, trump):
+    """`rules.legal_moves` as list filters, before the bitset version."""
+    if not hand or card_led is None:
+        return hand
+    suit_led = trump if is_ace_of_hearts(card_led) else card_led.suit
+    legal = [c for c in hand if c.suit == suit_led or c.suit == trump or is_ace_of_hearts(c)]
+    if not legal:
+        return hand
+    if suit_led != trump and all(c.suit == trump for c in legal):
+        return hand
+    if all(renegable(c, trump, card_led, suit_led) for c in legal):
+        return hand
+    return legal
+
+
+def pairwise_max(cards, suit_led, trump):
+    max_card = cards[0]
+    for card in cards[1:]:
+        if not less_than(card, max_card, suit_led, trump):
+            max_card = card
+    return max_card
+
+
+def table_max(cards, suit_led, trump):
+    ranks = rank_table(suit_led, trump)
+    return max(cards, key=lambda card: ranks[card.index])
+
+
+# ── Inputs ──────────────────────────────────────────────────────────
+
+
+def make_samples(n: int) -> list[tuple]:
+    rng = random.Random(SEED)
+    return [
+        (rng.sample(DECK, 5), rng.choice(SUITS + (None,)), rng.choice(SUITS))
+        for _ in range(n)
+    ]
+
+
+def make_card_args(n: int) -> list[tuple]:
+    rng = random.Random(SEED)
+    return [(rng.choice(CARD_VALUES), rng.choice(SUITS)) for _ in range(n)]
+
+
+def make_card_values(n: int) -> list[tuple]:
+    rng = random.Random(SEED)
+    return [(card_value(rng.choice(DECK)),) for _ in range(n)]
+
+
+def make_pairs(n: int) -> list[tuple]:
+    rng = random.Random(SEED)
+    return [(*rng.sample(DECK, 2), rng.choice(SUITS), rng.choice(SUITS)) for _ in range(n)]
+
+
+def make_trump_args(n: int) -> list[tuple]:
+    rng = random.Random(SEED)
+    return [(rng.choice(DECK), rng.choice(SUITS)) for _ in range(n)]
+
+
+def make_hands(n: int) -> list[tuple]:
+    rng = random.Random(SEED)
+    return [(rng.sample(DECK, 5),) for _ in range(n)]
+
+
+def make_plays(n: int) -> list[tuple]:
+    """`evaluate_hand_play` arguments: a hand and the 0-3 cards played so far."""
+    rng = random.Random(SEED)
+    samples = []
+    for _ in range(n):
+        cards = rng.sample(DECK, 8)
+        current = cards[5:5 + rng.randrange(4)]
+        suit_led = current[0].suit if current else None
+        samples.append((suit_led, cards[:5], current, rng.choice(SUITS)))
+    return samples
+
+
+def game_page_html(rng: random.Random) -> str:
+    """A Playing-phase game page shaped like GameLive's render, with the
+    layout around it, for `parse_game_view`."""
+    cards = rng.sample(DECK, 5 + rng.randrange(4))
+    hand, table = cards[:5], cards[5:]
+    trump = rng.choice(SUITS).long_name()
+    suit_led = table[0].suit.long_name() if table else "nil"
+
+    nav = "".join(
+        f'<li><a href="/page/{i}" data-phx-link="redirect" data-phx-link-state="push">Link {i}</a></li>'
+        for i in range(8)
+    )
+    slots = "".join(
+        f'<div id="played_cards-{i}" class="player-slot player-{i}">'
+        f'<p class="player-name">Player {i}</p>'
+        f'<img class="card rotate" src="/images/cards/{card_value(c)}.png" '
+        f'phx-value-card="{card_value(c)}"/></div>'
+        for i, c in enumerate(table)
+    )
+    hand_imgs = "".join(
+        f'<img src="/images/cards/{card_value(c)}.png" class="card{" grayed-out" if i % 2 else ""}" '
+        f'data-card-value="{card_value(c)}"/>'
+        for i, c in enumerate(hand)
+    )
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"/>'
+        '<meta name="csrf-token" content="dGhpcyBpcyBhIGNzcmYgdG9rZW4"/>'
+        '<title>45s</title><link rel="stylesheet" href="/assets/app.css"/></head><body>'
+        f'<header class="site-header"><nav><ul>{nav}</ul></nav></header>'
+        '<div id="phx-F6n1" data-phx-main data-phx-session="SFMyNTY" data-phx-static="SFMyNTY" '
+        'class="phx-connected">'
+        '<div id="game-container" class="game" data-phase="Playing" data-current-turn="true" '
+        f'data-bagged="false" data-current-bid="20" data-trump="{trump}" '
+        f'data-suit-led="{suit_led}" data-auto-playing="false" data-confirm-discard-clicked="false">'
+        '<div style="text-align: center;"><div style="display: flex; gap: 1rem;">'
+        f'<p style="color: #d2e8f9;">Trump: {trump.capitalize()}</p>'
+        '<button class="score-button" phx-click="toggle_score_overlay">View Scores</button></div>'
+        '<div class="actions-list">Player 1 bid 20 hearts, Player 2 passed, Player 3 passed</div>'
+        '<p class="turn-message">Your turn</p>'
+        f'<div id="table" class="table" phx-update="stream">{slots}</div>'
+        '<button id="play-card-button" class="blue-button" phx-click="play_card">Play</button>'
+        '<div id="player-hand" class="player-hand" phx-hook="CardSelection" data-phase="Playing" '
+        'data-auto-playing="false" data-selection-version="3" data-selected-cards="[]">'
+        f'{hand_imgs}</div></div></div>'
+        '<div id="flash-group"><div id="client-error" role="alert" hidden></div></div>'
+        '</div><script defer src="/assets/app.js"></script></body></html>'
+    )
+
+
+def make_leads(n: int) -> list[tuple]:
+    """`legal_moves` arguments: a hand, the card led and trump."""
+    rng = random.Random(SEED)
+    return [(cards[:5], cards[5], rng.choice(SUITS)) for cards in (rng.sample(DECK, 6) for _ in range(n))]
+
+
+def make_lead_masks(n: int) -> list[tuple]:
+    return [(mask_of(hand), card_led, trump) for hand, card_led, trump in make_leads(n)]
+
+
+def make_pages(n: int) -> list[tuple]:
+    rng = random.Random(SEED)
+    return [(game_page_html(rng),) for _ in range(n)]
+
+
+# ── Benchmarks ──────────────────────────────────────────────────────
+
+# name -> (function, input maker, number of inputs)
+BENCHMARKS: dict[str, tuple[Callable, Callable[[int], list[tuple]], int]] = {
+    "card_construct": (Card, make_card_args, SAMPLES),
+    "card_parse": (parse_card, make_card_values, SAMPLES),
+    "less_than": (less_than, make_pairs, SAMPLES),
+    "eval_trump": (eval_trump, make_trump_args, SAMPLES),
+    "max_card_less_than": (pairwise_max, make_samples, SAMPLES),
+    "get_max_card": (get_max_card, make_samples, SAMPLES),
+    "get_min_card": (get_min_card, make_samples, SAMPLES),
+    "evaluate_hand_bid": (evaluate_hand_bid, make_hands, SAMPLES),
+    "evaluate_hand_play": (evaluate_hand_play, make_plays, SAMPLES),
+    "legal_moves": (legal_moves, make_leads, SAMPLES),
+    "legal_mask": (legal_mask, make_lead_masks, SAMPLES),
+    "parse_game_view": (parse_game_view, make_pages, PAGES),
+}
+
+
+def ops_per_sec(fn, samples) -> float:
+    """Best of REPEAT timed runs, each at least MIN_RUN_TIME long so short
+    benchmarks are not dominated by timer and scheduler noise."""
+
+    def timed(loops: int) -> float:
+        start = time.perf_counter()
+        for _ in range(loops):
+            for args in samples:
+                fn(*args)
+        return time.perf_counter() - start
+
+    loops = 1
+    while (elapsed := timed(loops)) < MIN_RUN_TIME:
+        loops *= 2
+    best = elapsed
+    for _ in range(REPEAT - 1):
+        best = min(best, timed(loops))
+    return loops * len(samples) / best
+
+
+def verify() -> None:
+    """The fast paths must agree with the reference implementations."""
+    verify_rank_order()
+    for args in make_samples(SAMPLES):
+        assert pairwise_max(*args) is table_max(*args)
+    for hand, card_led, trump in make_leads(SAMPLES):
+        assert legal_moves(hand, card_led, trump) == reference_legal_moves(hand, card_led, trump)
+    for (page,) in make_pages(20):
+        view = parse_game_view(page)
+        assert len(view.hand) == 5 and view.phase == "Playing", view
+
+
+def _calibration_work(x: int) -> int:
+    table = {0: 1, 1: 2, 2: 3}
+    return sum(table[i % 3] * x for i in range(8))
+
+
+def calibrate() -> float:
+    """Speed of a fixed pure-Python workload. Comparisons are scaled by it,
+    so a slower or busier machine is not reported as a regression."""
+    return ops_per_sec(_calibration_work, [(i,) for i in range(SAMPLES)])
+
+
+def run(names: list[str]) -> dict[str, float]:
+    results = {}
+    for name in names:
+        fn, make_inputs, n = BENCHMARKS[name]
+        results[name] = ops_per_sec(fn, make_inputs(n))
+    return results
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], threshold: float, scale: float = 1.0
+) -> list[str]:
+    """Prints results against the baseline, whose numbers are multiplied by
+    `scale` first; returns the regressed names."""
+    regressed = []
+    print(f"{'benchmark':<22}{'ops/s':>14}{'baseline':>14}{'change':>9}")
+    for name, ops in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<22}{ops:>14,.0f}{'-':>14}{'':>9}")
+            continue
+        base *= scale
+        change = ops / base - 1
+        flag = ""
+        if change < -threshold:
+            regressed.append(name)
+            flag = "  REGRESSED"
+        print(f"{name:<22}{ops:>14,.0f}{base:>14,.0f}{change:>+9.1%}{flag}")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark card.py, strategy.py and page parsing.")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results to --baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="fail when ops/s drops by more than this fraction")
+    parser.add_argument("--raw", action="store_true",
+                        help="compare raw ops/s, without scaling by the calibration run")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if not names:
+        parser.error(f"No benchmark matches {args.filter!r}; have {list(BENCHMARKS)}")
+
+    verify()
+    calibration = calibrate()
+    results = run(names)
+    # Average over the run, in case the machine's speed drifted during it.
+    calibration = (calibration + calibrate()) / 2
+
+    saved = {}
+    if args.baseline.exists():
+        saved = json.loads(args.baseline.read_text(encoding="utf-8"))
+
+    if args.save_baseline:
+        if saved.get("calibration"):
+            # Keep earlier results comparable with the ones saved now.
+            scale = calibration / saved["calibration"]
+            saved["results"] = {name: ops * scale for name, ops in saved["results"].items()}
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "calibration": calibration,
+            "results": {**saved.get("results", {}), **results},
+        }, indent=2) + "\n", encoding="utf-8")
+        compare(results, {}, args.threshold)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not saved:
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+    scale = 1.0
+    if saved.get("calibration") and not args.raw:
+        scale = calibration / saved["calibration"]
+        print(f"Machine speed vs. baseline: {scale:.2f}x (baseline scaled to match)")
+    regressed = compare(results, saved.get("results", {}), args.threshold, scale)
+    if regressed:
+        print(f"{len(regressed)} benchmark(s) regressed by more than {args.threshold:.0%}: "
+              f"{', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
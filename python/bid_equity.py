@@ -0,0 +1,202 @@
+"""Simulation-backed bid evaluation with a canonicalizing LRU cache.
+
+`evaluate_hand_bid` scores a hand with fixed weights. `BidEquity` instead
+estimates, for every candidate trump, the points the bidding team takes
+when it wins the bid with that hand: it deals the other 47 cards at random,
+plays the rest of the round with the tbot rules (`sim.finish_round`) and
+averages over a fixed number of deals.
+
+Results are memoized per hand under suit symmetry. The only exact symmetry
+of the rules is swapping clubs and spades: hearts is special because the
+ace of hearts is always a trump, and diamonds differ from the black suits
+because low cards rank "high in red, low in black". Each hand is therefore
+mapped to the smaller of its two relabelings, so a hand and its clubs/spades
+mirror share one entry. The seed of every simulation is derived from the
+canonical hand, so cached and fresh results are identical and the cache can
+be saved to disk and warm-loaded by later runs:
+
+    python bid_equity.py --hands 2000 --cache bid_equity.json
+"""
+
+import argparse
+import json
+import random
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from card import DECK, SUITS, Suit, Card
+from rules import BID_VALUES, HAND_SIZE
+from sim import TbotStrategy, finish_round
+
+DEFAULT_SAMPLES = 100
+DEFAULT_CACHE_SIZE = 200_000
+CACHE_VERSION = 1
+
+# Suit relabelings (by SUITS index) that leave the rules unchanged.
+SUIT_SYMMETRIES = ((0, 1, 2, 3), (0, 1, 3, 2))
+
+
+def canonical_hand(hand: list[Card]) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Returns the canonical card indices of `hand` and the suit relabeling
+    that produced them."""
+    best = None
+    for perm in SUIT_SYMMETRIES:
+        key = tuple(sorted(perm[c.index // 13] * 13 + c.index % 13 for c in hand))
+        if best is None or key < best[0]:
+            best = (key, perm)
+    return best
+
+
+class LRUCache:
+    """A dict with least-recently-used eviction beyond `maxsize` entries."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value) -> None:
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+
+def simulate_hand(key: tuple[int, ...], samples: int, seed: int) -> tuple[float, ...]:
+    """Average bidding-team points for the canonical hand `key` with each of
+    the four trumps. Every trump is played on the same sampled deals."""
+    rng = random.Random(f"{seed}:{key}")
+    hand = [DECK[i] for i in key]
+    rest = [c for c in DECK if c.index not in key]
+    strategies = [TbotStrategy()] * 4
+
+    deals = []
+    for _ in range(samples):
+        rng.shuffle(rest)
+        deals.append(list(rest))
+
+    expected = []
+    for trump in SUITS:
+        total = 0
+        for deal in deals:
+            hands = [list(hand)] + [deal[i:i + HAND_SIZE] for i in range(0, 15, HAND_SIZE)]
+            total += finish_round(strategies, hands, deal[15:], 0, trump)[0]
+        expected.append(total / samples)
+    return tuple(expected)
+
+
+class BidEquity:
+    def __init__(
+        self,
+        samples: int = DEFAULT_SAMPLES,
+        seed: int = 0,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.samples = samples
+        self.seed = seed
+        self.cache = LRUCache(maxsize)
+
+    def expected_points(self, hand: list[Card]) -> dict[Suit, float]:
+        """Expected bidding-team points for each trump the hand could name."""
+        key, perm = canonical_hand(hand)
+        values = self.cache.get(key)
+        if values is None:
+            values = simulate_hand(key, self.samples, self.seed)
+            self.cache.put(key, values)
+        return {suit: values[perm[i]] for i, suit in enumerate(SUITS)}
+
+    def evaluate_hand_bid(self, hand: list[Card]) -> tuple[int, Suit]:
+        """Same contract as `strategy.evaluate_hand_bid`: the highest bid the
+        expected points cover (0 if none) and the best trump."""
+        expected = self.expected_points(hand)
+        suit = max(expected, key=expected.get)
+        covered = [bid for bid in BID_VALUES if bid <= expected[suit]]
+        return (covered[-1] if covered else 0), suit
+
+    # ── Persistence ─────────────────────────────────────────────────
+
+    def save(self, path: Path) -> None:
+        data = {
+            "version": CACHE_VERSION,
+            "samples": self.samples,
+            "seed": self.seed,
+            "entries": [[list(key), list(values)] for key, values in self.cache.entries.items()],
+        }
+        tmp = Path(f"{path}.tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        tmp.replace(path)
+
+    def load(self, path: Path) -> int:
+        """Warm-loads a saved cache. Returns the number of entries loaded."""
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if (data.get("version"), data.get("samples"), data.get("seed")) != (
+            CACHE_VERSION, self.samples, self.seed,
+        ):
+            raise ValueError(
+                f"{path} was built with samples={data.get('samples')} seed={data.get('seed')}, "
+                f"expected samples={self.samples} seed={self.seed}"
+            )
+        for key, values in data["entries"]:
+            self.cache.put(tuple(key), tuple(values))
+        return len(data["entries"])
+
+
+class BidEquityStrategy(TbotStrategy):
+    """tbot discard and play rules with simulation-backed bidding."""
+
+    name = "equity"
+
+    def __init__(self, rng: Optional[random.Random] = None, equity: Optional[BidEquity] = None) -> None:
+        self.equity = equity or BidEquity()
+
+    def bid(self, hand: list[Card], max_bid: int, bagged: bool) -> tuple[int, Suit]:
+        value, suit = self.equity.evaluate_hand_bid(hand)
+        if bagged:
+            return 15, suit
+        if value > max_bid:
+            return value, suit
+        return 0, Suit.PASS
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate random hands with BidEquity.")
+    parser.add_argument("--hands", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", type=Path, default=None, help="JSON file to warm-load and save")
+    args = parser.parse_args()
+
+    equity = BidEquity(samples=args.samples, seed=args.seed)
+    if args.cache and args.cache.exists():
+        print(f"Loaded {equity.load(args.cache)} cached hands from {args.cache}")
+
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    for _ in range(args.hands):
+        equity.evaluate_hand_bid(rng.sample(DECK, HAND_SIZE))
+    elapsed = time.perf_counter() - start
+
+    cache = equity.cache
+    print(f"{args.hands} hands in {elapsed:.2f}s, {cache.hits} cache hits, "
+          f"{cache.misses} simulated, {len(cache)} cached")
+    if args.cache:
+        equity.save(args.cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Many Selenium bots on a few shared headless Chrome processes.
+
+A `BrowserPool` launches at most `size` Chromes. Each `open_tab()` call
+creates a fresh browser context in the least loaded one (an incognito-like
+profile with its own cookies, so every tab is a separate player to the
+server) and opens a tab in it. The `PooledDriver` it returns stands in for
+a `webdriver.Chrome`. A WebDriver session drives one tab at a time, so
+every command takes the browser's lock and switches to its tab first, and
+the bots' commands are interleaved one at a time per browser. Bots must
+not hold a browser with long blocking scripts; `tbot.PhxWeb` polls when it
+runs on a pooled driver. To run eight tbot players in two Chromes:
+
+    TBOT_BOTS=8 TBOT_BROWSERS=2 python tbot.py
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+CHROMEDRIVER_PATH = "/usr/local/bin/chromedriver"
+# How long a new tab may take to show up in window_handles.
+TAB_TIMEOUT = 10
+
+
+def get_driver() -> webdriver.Chrome:
+    """Return a headless Chrome driver for CI and local smoke checks."""
+    chrome_options = Options()
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--headless=new")
+    # Tabs that are not in front must keep their timers and sockets running.
+    chrome_options.add_argument("--disable-background-timer-throttling")
+    chrome_options.add_argument("--disable-backgrounding-occluded-windows")
+    chrome_options.add_argument("--disable-renderer-backgrounding")
+
+    if os.path.exists(CHROMEDRIVER_PATH):
+        service = Service(executable_path=CHROMEDRIVER_PATH)
+        return webdriver.Chrome(service=service, options=chrome_options)
+
+    return webdriver.Chrome(options=chrome_options)
+
+
+class _Browser:
+    def __init__(self, driver: webdriver.Chrome) -> None:
+        self.driver = driver
+        self.lock = threading.RLock()
+        # The session's own first window; selected whenever a tab closes.
+        self.home = driver.current_window_handle
+        self.current = self.home
+        self.tabs = 0
+
+    def select(self, handle: str) -> None:
+        """Switches the session to `handle`. Call with the lock held."""
+        if self.current != handle:
+            self.driver.switch_to.window(handle)
+            self.current = handle
+
+
+def _is_selenium(value) -> bool:
+    return type(value).__module__.startswith("selenium.")
+
+
+class _Locked:
+    """Forwards attribute access to `target` with the browser's lock held
+    and the tab selected. Selenium objects that come back (WebElements,
+    `switch_to`, alerts, shadow roots) are wrapped too, since their methods
+    also drive whichever tab the session has selected."""
+
+    def __init__(self, browser: _Browser, handle: str, target) -> None:
+        self._browser = browser
+        self._handle = handle
+        self._target = target
+
+    def _wrap(self, value):
+        if _is_selenium(value):
+            return _Locked(self._browser, self._handle, value)
+        if isinstance(value, list) and value and all(map(_is_selenium, value)):
+            return [_Locked(self._browser, self._handle, item) for item in value]
+        return value
+
+    def __getattr__(self, name: str):
+        browser = self._browser
+        with browser.lock:
+            browser.select(self._handle)
+            value = getattr(self._target, name)
+        if not callable(value):
+            return self._wrap(value)
+
+        def call(*args, **kwargs):
+            with browser.lock:
+                browser.select(self._handle)
+                return self._wrap(value(*args, **kwargs))
+
+        return call
+
+
+class PooledDriver(_Locked):
+    """One player's tab. `quit()` closes the tab and its browser context,
+    not the browser."""
+
+    shared = True
+
+    def __init__(
+        self, pool: "BrowserPool", browser: _Browser, handle: str, target_id: str, context_id: str
+    ) -> None:
+        super().__init__(browser, handle, browser.driver)
+        self._pool = pool
+        self._target_id = target_id
+        self._context_id = context_id
+
+    def quit(self) -> None:
+        self._pool.close_tab(self)
+
+
+class BrowserPool:
+    def __init__(self, size: int, tabs_per_browser: Optional[int] = None) -> None:
+        self.size = size
+        self.tabs_per_browser = tabs_per_browser
+        self.browsers: list[_Browser] = []
+        self.lock = threading.Lock()
+
+    def _pick_browser(self) -> _Browser:
+        """The least loaded browser, launching a new one while under `size`
+        and every running one already has a tab."""
+        with self.lock:
+            idle = min(self.browsers, key=lambda b: b.tabs, default=None)
+            if idle is None or (idle.tabs > 0 and len(self.browsers) < self.size):
+                idle = _Browser(get_driver())
+                self.browsers.append(idle)
+            if self.tabs_per_browser is not None and idle.tabs >= self.tabs_per_browser:
+                raise RuntimeError(
+                    f"Browser pool is full: {self.size} browsers x {self.tabs_per_browser} tabs."
+                )
+            idle.tabs += 1
+            return idle
+
+    def open_tab(self) -> PooledDriver:
+        browser = self._pick_browser()
+        try:
+            with browser.lock:
+                driver = browser.driver
+                known = set(driver.window_handles)
+                context_id = driver.execute_cdp_cmd(
+                    "Target.createBrowserContext", {"disposeOnDetach": False}
+                )["browserContextId"]
+                target_id = driver.execute_cdp_cmd(
+                    "Target.createTarget", {"url": "about:blank", "browserContextId": context_id}
+                )["targetId"]
+                # The WebDriver handle need not be the CDP target id; it is
+                # the one window that was not there before.
+                handle = self._new_handle(driver, known)
+        except Exception:
+            with self.lock:
+                browser.tabs -= 1
+            raise
+        return PooledDriver(self, browser, handle, target_id, context_id)
+
+    @staticmethod
+    def _new_handle(driver: webdriver.Chrome, known: set[str]) -> str:
+        """The handle of the window opened since `known` was taken. Call
+        with the browser's lock held, so no other tab opens meanwhile."""
+        deadline = time.monotonic() + TAB_TIMEOUT
+        while True:
+            new = set(driver.window_handles) - known
+            if len(new) == 1:
+                return new.pop()
+            if len(new) > 1:
+                raise RuntimeError(f"Expected one new window, found {len(new)}.")
+            if time.monotonic() >= deadline:
+                raise RuntimeError("The new tab did not appear in window_handles.")
+            time.sleep(0.05)
+
+    def close_tab(self, tab: PooledDriver) -> None:
+        browser = tab._browser
+        with browser.lock:
+            driver = browser.driver
+            try:
+                driver.execute_cdp_cmd("Target.closeTarget", {"targetId": tab._target_id})
+                driver.execute_cdp_cmd(
+                    "Target.disposeBrowserContext", {"browserContextId": tab._context_id}
+                )
+            finally:
+                if browser.current == tab._handle:
+                    driver.switch_to.window(browser.home)
+                    browser.current = browser.home
+        with self.lock:
+            browser.tabs -= 1
+
+    def close(self) -> None:
+        with self.lock:
+            browsers, self.browsers = self.browsers, []
+        for browser in browsers:
+            browser.driver.quit()
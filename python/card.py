@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Optional
 
 
 class Suit(Enum):
@@ -8,6 +9,10 @@ class Suit(Enum):
     SPADES = "S"
     PASS = "pass"
 
+    # Members are singletons, so identity hashing is safe and avoids the
+    # Python-level Enum.__hash__ on every dict lookup keyed by suit.
+    __hash__ = object.__hash__
+
     def long_name(self) -> str:
         return {
             "H": "hearts",
@@ -18,15 +23,48 @@ class Suit(Enum):
         }[self.value]
 
 
+SUITS = (Suit.HEARTS, Suit.DIAMONDS, Suit.CLUBS, Suit.SPADES)
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+
+
 class Card:
-    value_mapping = {"A": 1, "K": 13, "Q": 12, "J": 11}
+    """Cards are interned: `Card("K", Suit.HEARTS) is Card("13", Suit.HEARTS)`,
+    so identity, `==` and `in` agree however a card was parsed.
+
+    Raises ValueError for a value outside A/1-13 (K/13)."""
+
+    __slots__ = ("value", "suit", "index")
 
-    def __init__(self, value: str, suit: Suit) -> None:
+    value_mapping = {"A": 1, "K": 13, "Q": 12, "J": 11}
+    # (value as given, suit) -> card for the canonical spellings ("A", "1",
+    # ..., "13"), so it stays bounded; and Card.index -> card.
+    _interned: dict = {}
+    _by_index: dict = {}
+
+    def __new__(cls, value: str, suit: Suit) -> "Card":
+        card = cls._interned.get((value, suit))
+        if card is not None:
+            return card
         if value in Card.value_mapping:
-            self.value = Card.value_mapping[value]
+            number = Card.value_mapping[value]
         else:
-            self.value = int(value)
-        self.suit = suit
+            number = int(value)
+        if not 1 <= number <= 13:
+            raise ValueError(f"Card value {value!r} is not between 1 and 13")
+        index = SUIT_INDEX[suit] * 13 + number - 1
+        card = cls._by_index.get(index)
+        if card is None:
+            card = object.__new__(cls)
+            card.value = number
+            card.suit = suit
+            card.index = index
+            cls._by_index[index] = card
+        if value in Card.value_mapping or value == str(number):
+            cls._interned[value, suit] = card
+        return card
+
+    def __reduce__(self):
+        return Card, (str(self.value), self.suit)
 
     def __repr__(self) -> str:
         return f"{self.value}{self.suit.value}"
@@ -97,3 +135,45 @@ def less_than(card1: Card, card2: Card, suit_led: Suit, trump: Suit) -> bool:
         return eval_offsuite(card1) < eval_offsuite(card2)
 
     return True
+
+
+# ── Precomputed trick ranks ─────────────────────────────────────────
+#
+# For a fixed (suit_led, trump) pair, less_than is a strict order on the
+# cards that can win a trick (trumps, the ace of hearts and the led suit),
+# and every other card loses to everything. RANK_TABLES maps each pair to a
+# 52-entry tuple indexed by Card.index so comparisons become a lookup:
+# less_than(a, b) == (ranks[a.index] < ranks[b.index] or both ranks are 0).
+
+def _rank(card: Card, suit_led: Optional[Suit], trump: Optional[Suit]) -> int:
+    if is_ace_of_hearts(card) or card.suit == trump:
+        return 200 + eval_trump(card, trump)
+    if card.suit == suit_led:
+        return 100 + eval_offsuite(card)
+    return 0
+
+
+DECK = tuple(Card(str(value), suit) for suit in SUITS for value in range(1, 14))
+
+RANK_TABLES = {
+    (suit_led, trump): tuple(_rank(card, suit_led, trump) for card in DECK)
+    for suit_led in SUITS + (None,)
+    for trump in SUITS + (None,)
+}
+
+
+def rank_table(suit_led: Optional[Suit], trump: Optional[Suit]) -> tuple[int, ...]:
+    return RANK_TABLES[suit_led, trump]
+
+
+# The same ranks keyed by card, for hot loops: `max(cards, key=ranks.__getitem__)`
+# runs in C, where a `card.index` lambda does not.
+RANK_MAPS = {key: dict(zip(DECK, table)) for key, table in RANK_TABLES.items()}
+
+
+def rank_map(suit_led: Optional[Suit], trump: Optional[Suit]) -> dict[Card, int]:
+    return RANK_MAPS[suit_led, trump]
+
+
+def rank_key(card: Card, suit_led: Optional[Suit], trump: Optional[Suit]) -> int:
+    return RANK_TABLES[suit_led, trump][card.index]
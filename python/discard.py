@@ -0,0 +1,182 @@
+"""Search-based discard: keep sets scored by simulated redraw and play.
+
+`strategy.choose_discard` keeps trumps and kings or falls back to
+`hand[:5]`. `DiscardOptimizer` instead enumerates the keep sets of 1-5
+cards, less the dominated ones:
+
+- Trumps are always kept (a trump beats a random draw). With five or more
+  trumps, only the five best are kept.
+- Within an off suit, the kept cards are always that suit's highest.
+
+What is left is scored by Monte Carlo. Each sample deals the unknown
+cards: the other three players keep by `choose_discard` and refill, we
+redraw, and the round is played out with the tbot rules. Every surviving
+keep set is scored on the same samples, so differences between them are
+not sampling noise. The weaker half is dropped every HALVING_SAMPLES
+rounds until the budget runs out.
+
+Keep sets are only merged under a true symmetry of the rules: swapping
+clubs and spades (see `bid_equity`), when that leaves the hand and trump
+unchanged. Keeping the K of clubs or the K of spades is otherwise two
+evaluations, since what is discarded, and so what the others can hold,
+differs. Nothing carries over between hands.
+"""
+
+import math
+import os
+import random
+import time
+from itertools import product
+from typing import Optional
+
+from bid_equity import SUIT_SYMMETRIES
+from card import DECK, SUIT_INDEX, SUITS, Suit, Card, is_ace_of_hearts, rank_table
+from ismcts import MAX_POINTS, Deal
+from rules import HAND_SIZE
+from sim import TbotStrategy
+from strategy import choose_discard
+
+DEFAULT_TIME_BUDGET = float(os.getenv("TBOT_DISCARD_BUDGET", "1.0"))
+HALVING_SAMPLES = 8
+
+
+def is_trump(card: Card, trump: Suit) -> bool:
+    return card.suit == trump or is_ace_of_hearts(card)
+
+
+def candidate_keeps(hand: list[Card], trump: Suit) -> list[list[Card]]:
+    """Every keep set of `hand` that no other keep set dominates."""
+    trump_ranks = rank_table(trump, trump)
+    trumps = sorted(
+        (c for c in hand if is_trump(c, trump)), key=lambda c: trump_ranks[c.index], reverse=True
+    )
+    if len(trumps) >= HAND_SIZE:
+        return [trumps[:HAND_SIZE]]
+
+    by_suit = []
+    for suit in SUITS:
+        ranks = rank_table(suit, trump)
+        cards = sorted(
+            (c for c in hand if c.suit == suit and not is_trump(c, trump)),
+            key=lambda c: ranks[c.index],
+            reverse=True,
+        )
+        if cards:
+            by_suit.append(cards)
+
+    room = HAND_SIZE - len(trumps)
+    keeps = []
+    for counts in product(*(range(len(cards) + 1) for cards in by_suit)):
+        if sum(counts) > room or not (trumps or any(counts)):
+            continue
+        keeps.append(trumps + [c for cards, n in zip(by_suit, counts) for c in cards[:n]])
+    return keeps
+
+
+def keep_key(keep: list[Card], hand: list[Card], trump: Suit) -> tuple[int, ...]:
+    """Equal for keep sets of `hand` that a suit relabeling leaving `hand`
+    and `trump` unchanged maps onto each other."""
+    hand_key = sorted(c.index for c in hand)
+    keys = []
+    for perm in SUIT_SYMMETRIES:
+        if perm[SUIT_INDEX[trump]] != SUIT_INDEX[trump]:
+            continue
+        relabeled = [perm[c.index // 13] * 13 + c.index % 13 for c in hand]
+        if sorted(relabeled) != hand_key:
+            continue
+        keys.append(tuple(sorted(perm[c.index // 13] * 13 + c.index % 13 for c in keep)))
+    return min(keys)
+
+
+def sample_deal(
+    hand: list[Card], trump: Suit, rng: random.Random
+) -> tuple[list[list[Card]], list[Card]]:
+    """The other three hands after their discard and refill, and the
+    rest of the deck we redraw from, in one random deal."""
+    in_hand = {c.index for c in hand}
+    unknown = [card for card in DECK if card.index not in in_hand]
+    rng.shuffle(unknown)
+    others = [
+        choose_discard(unknown[i * HAND_SIZE:(i + 1) * HAND_SIZE], trump) for i in range(3)
+    ]
+    deck = unknown[3 * HAND_SIZE:]
+    for other in others:
+        other.extend(deck.pop() for _ in range(HAND_SIZE - len(other)))
+    return others, deck
+
+
+def score_keep(
+    keep: list[Card], others: list[list[Card]], deck: list[Card], trump: Suit, leader: int
+) -> float:
+    """Our team's share of the round's points when keeping `keep`."""
+    hands = [keep + deck[:HAND_SIZE - len(keep)]] + [list(other) for other in others]
+    deal = Deal(hands, [], leader, trump, [])
+    deal.play_out()
+    return deal.result()[0] / MAX_POINTS
+
+
+class DiscardOptimizer:
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        time_budget: float = DEFAULT_TIME_BUDGET,
+        max_samples: Optional[int] = None,
+    ) -> None:
+        """With `time_budget` infinite, only `max_samples` stops the search,
+        so the choice does not depend on machine speed."""
+        if math.isinf(time_budget) and max_samples is None:
+            raise ValueError("An unlimited time budget needs max_samples")
+        self.rng = rng or random.Random()
+        self.time_budget = time_budget
+        self.max_samples = max_samples
+
+    def choose(self, hand: list[Card], trump: Suit) -> list[Card]:
+        keeps = candidate_keeps(hand, trump)
+        if len(keeps) == 1:
+            return keeps[0]
+        deadline = time.perf_counter() + self.time_budget
+        # The bidder took the kitty and leads the first trick.
+        bidder = len(hand) > HAND_SIZE
+
+        alive: dict[tuple, list[Card]] = {}
+        for keep in keeps:
+            alive.setdefault(keep_key(keep, hand, trump), keep)
+        # keep key -> [samples, total score], all over this call's deals.
+        stats = {key: [0, 0.0] for key in alive}
+
+        samples = 0
+        while self.max_samples is None or samples < self.max_samples:
+            if samples and time.perf_counter() >= deadline:
+                break
+            others, deck = sample_deal(hand, trump, self.rng)
+            leader = 0 if bidder else self.rng.randrange(1, 4)
+            for key, keep in alive.items():
+                entry = stats[key]
+                entry[0] += 1
+                entry[1] += score_keep(keep, others, deck, trump, leader)
+            samples += 1
+            if samples % HALVING_SAMPLES == 0 and len(alive) > 2:
+                ranked = sorted(alive, key=lambda s: stats[s][1] / stats[s][0], reverse=True)
+                alive = {key: alive[key] for key in ranked[:(len(ranked) + 1) // 2]}
+
+        best = max(alive, key=lambda s: stats[s][1] / stats[s][0])
+        return alive[best]
+
+
+class SearchDiscardStrategy(TbotStrategy):
+    """tbot with the search-based discard. Offline it stops at a sample
+    count only, so seeded games replay the same on any machine."""
+
+    name = "discard"
+
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        time_budget: float = math.inf,
+        max_samples: Optional[int] = 200,
+    ) -> None:
+        super().__init__()
+        self.optimizer = DiscardOptimizer(rng, time_budget, max_samples)
+
+    def discard(self, hand, trump):
+        return self.optimizer.choose(hand, trump)
@@ -0,0 +1,429 @@
+"""Double-dummy solver: optimal trick points with all four hands known.
+
+Given every hand, trump, the trick in progress and the winners of the
+tricks already played, `DoubleDummySolver` finds the points each team takes
+from here on when all four players play perfectly, scored like
+`sim.finish_round`: 5 per trick plus 5 for the team whose trick-winning
+card is the best of the round. Legal moves are `rules.legal_moves`, with
+reneging and the ace of hearts as a trump. The trick winner is
+`rules.trick_winner`, judged by the suit of the first card played.
+
+The search is alpha-beta minimax, team 0 maximizing, over hands held as
+bitmasks of `Card.index`. Exact scores are found by bisection with
+null-window searches. A transposition table keyed at trick boundaries
+stores bounds and the best lead. Leads are tried strongest first.
+Followers try the cheapest winning card first, or their lowest card when
+partner is winning. Of two cards that no live card separates in rank,
+only one is searched.
+
+    python double_dummy.py --deals 10000 --seed 1 --workers 8
+"""
+
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+
+from card import DECK, SUIT_INDEX, SUITS, Suit, Card, is_ace_of_hearts, rank_table
+from rules import HAND_SIZE, TRICK_POINTS, legal_moves, renegable, team_for, trick_winner
+from strategy import evaluate_hand_play
+
+ACE_OF_HEARTS = next(card.index for card in DECK if is_ace_of_hearts(card))
+SUIT_MASKS = {suit: sum(1 << card.index for card in DECK if card.suit == suit) for suit in SUITS}
+# Card classes: the four suits by SUIT_INDEX (without their trumps) and the
+# trumps with the ace of hearts.
+TRUMP_CLASS = len(SUITS)
+
+# Per trump: see _trump_tables.
+_TRUMP_TABLES: dict[Suit, tuple] = {}
+
+
+def to_mask(cards: Sequence[Card]) -> int:
+    mask = 0
+    for card in cards:
+        mask |= 1 << card.index
+    return mask
+
+
+def _bits(mask: int) -> list[int]:
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
+
+
+def _trump_tables(trump: Suit) -> tuple[list, list[int], list[list[int]]]:
+    """Per led card, the effective suit led and the cards that may renege
+    against it; per card pair of one class, the cards of that class ranked
+    strictly between them. Built once per trump."""
+    tables = _TRUMP_TABLES.get(trump)
+    if tables is not None:
+        return tables
+    suit_led = [trump if is_ace_of_hearts(card) else card.suit for card in DECK]
+    renege = [
+        to_mask([c for c in DECK if renegable(c, trump, card, suit_led[card.index])])
+        for card in DECK
+    ]
+    trumps = SUIT_MASKS[trump] | 1 << ACE_OF_HEARTS
+    order = [rank_table(card.suit, trump)[card.index] for card in DECK]
+    same_class = [
+        trumps if trumps >> card.index & 1 else SUIT_MASKS[card.suit] & ~trumps for card in DECK
+    ]
+    between = [
+        [
+            sum(
+                1 << c for c in _bits(same_class[a])
+                if min(order[a], order[b]) < order[c] < max(order[a], order[b])
+            )
+            for b in range(len(DECK))
+        ]
+        for a in range(len(DECK))
+    ]
+    tables = _TRUMP_TABLES[trump] = (suit_led, renege, between)
+    return tables
+
+
+class DoubleDummySolver:
+    """Solver for one trump suit. The transposition table is kept between
+    calls, so solving many positions of one deal shares work."""
+
+    def __init__(self, trump: Suit) -> None:
+        self.trump = trump
+        self.trump_mask = SUIT_MASKS[trump] | 1 << ACE_OF_HEARTS
+        # Trick ranks by the suit of the first card, as rules.trick_winner.
+        self.ranks = {suit: rank_table(suit, trump) for suit in SUITS}
+        # Each card's rank in a trick its own suit leads: its strength
+        # within its class, the trumps (with the ace of hearts) or its suit.
+        self.order = [self.ranks[card.suit][card.index] for card in DECK]
+        # Follow order by suit led: trick rank first, then `order`, so that
+        # cards of one class always come strongest first.
+        self.follow_order = {
+            suit: [ranks[i] * 1000 + self.order[i] for i in range(len(DECK))]
+            for suit, ranks in self.ranks.items()
+        }
+        self.card_class = [
+            TRUMP_CLASS if self.trump_mask >> card.index & 1 else SUIT_INDEX[card.suit]
+            for card in DECK
+        ]
+        self.suit_led, self.renege, self.between = _trump_tables(trump)
+        # Cards whose reneging rights make them unlike their neighbours.
+        self.renege_special = to_mask(
+            [card for card in DECK if is_ace_of_hearts(card)
+             or (card.suit == trump and card.value in (5, 11))]
+        )
+        self.table: dict[tuple, tuple[int, int, int]] = {}
+        self.nodes = 0
+
+    # ── Rules on bitmasks ───────────────────────────────────────────
+
+    def legal(self, hand: int, led: Optional[int]) -> int:
+        """`rules.legal_moves` on a hand bitmask."""
+        if led is None:
+            return hand
+        suit_led = self.suit_led[led]
+        legal = hand & (SUIT_MASKS[suit_led] | self.trump_mask)
+        if not legal:
+            return hand
+        if suit_led != self.trump and not legal & ~SUIT_MASKS[self.trump]:
+            return hand
+        if not legal & ~self.renege[led]:
+            return hand
+        return legal
+
+    # The bonus goes to the best trick-winning card, ranked by the suit led
+    # to the last trick: the best trump among them, else the best card of
+    # that suit, else the first trick's winner. So only the best winner of
+    # each class and the first winner's team matter, which keeps more
+    # positions equal in the transposition table. `won` holds, per class,
+    # `card * 2 + team` of the best winner or -1, then the first team.
+
+    def _add_winner(self, won: tuple, card: int, team: int) -> tuple:
+        if won[-1] < 0:
+            won = won[:-1] + (team,)
+        cls = self.card_class[card]
+        best = won[cls]
+        if best < 0 or self.order[card] > self.order[best >> 1]:
+            won = won[:cls] + (card * 2 + team,) + won[cls + 1:]
+        return won
+
+    def _bonus(self, won: tuple, last_led: int) -> int:
+        """Team 0's share of the bonus."""
+        best = won[TRUMP_CLASS]
+        if best < 0:
+            best = won[SUIT_INDEX[DECK[last_led].suit]]
+        team = best & 1 if best >= 0 else won[-1]
+        return TRICK_POINTS if team == 0 else 0
+
+    def _moves(self, legal: int, live: int, key: list[int], first: int = -1) -> list[int]:
+        """`legal` best first by `key` (with `first` before all), skipping a
+        card when the next better legal card of its class is equivalent: no
+        live card ranks between them and neither is special (the 5 and
+        jack of trump, the ace of hearts)."""
+        moves = sorted(_bits(legal), key=key.__getitem__, reverse=True)
+        if len(moves) < 2:
+            return moves
+        kept, last = [], {}
+        special = self.renege_special
+        for card in moves:
+            cls = self.card_class[card]
+            above = last.get(cls)
+            last[cls] = card
+            if (
+                above is not None
+                and not (special >> card | special >> above) & 1
+                and not self.between[above][card] & live
+            ):
+                continue
+            kept.append(card)
+        if first in kept:
+            kept.remove(first)
+            kept.insert(0, first)
+        return kept
+
+    # ── Search ──────────────────────────────────────────────────────
+
+    def _search(
+        self, hands: tuple, leader: int, cards: tuple, won: tuple, alpha: int, beta: int
+    ) -> int:
+        """Team 0's points from the remaining play, within (alpha, beta)."""
+        self.nodes += 1
+        turn = len(cards)
+
+        if turn == 4:
+            ranks = self.ranks[DECK[cards[0]].suit]
+            best = max(range(4), key=lambda i: ranks[cards[i]])
+            seat = (leader + best) % 4
+            team = team_for(seat)
+            won = self._add_winner(won, cards[best], team)
+            points = TRICK_POINTS if team == 0 else 0
+            if not hands[seat]:
+                return points + self._bonus(won, cards[0])
+            return points + self._search(hands, seat, (), won, alpha - points, beta - points)
+
+        key = None
+        first = -1
+        if turn == 0:
+            if not hands[leader] & (hands[leader] - 1):
+                return self._last_trick(hands, leader, won)
+            key = (hands, leader, won)
+            entry = self.table.get(key)
+            if entry is not None:
+                lower, upper, first = entry
+                if lower >= beta or lower == upper:
+                    return lower
+                if upper <= alpha:
+                    return upper
+                alpha, beta = max(alpha, lower), min(beta, upper)
+        alpha_in, beta_in = alpha, beta
+
+        live = hands[0] | hands[1] | hands[2] | hands[3]
+        for card in cards:
+            live |= 1 << card
+        for best in won[:-1]:
+            if best >= 0:
+                live |= 1 << (best >> 1)
+
+        seat = (leader + turn) % 4
+        hand = hands[seat]
+        if turn == 0:
+            moves = self._moves(hand, live, self.order, first)
+        else:
+            suit = DECK[cards[0]].suit
+            moves = self._moves(self.legal(hand, cards[0]), live, self.follow_order[suit])
+            if len(moves) > 1:
+                # Cheapest card that takes the trick first, then the rest
+                # from the bottom, unless partner is already winning.
+                ranks = self.ranks[suit]
+                top = max(range(turn), key=lambda i: ranks[cards[i]])
+                if turn - top != 2:
+                    to_beat = ranks[cards[top]]
+                    winning = [card for card in moves if ranks[card] > to_beat]
+                    winning.reverse()
+                    moves = winning + [card for card in reversed(moves) if ranks[card] <= to_beat]
+                else:
+                    moves.reverse()
+
+        maximizing = team_for(seat) == 0
+        best = -1 if maximizing else 1 << 30
+        best_card = -1
+        for card in moves:
+            child = hands[:seat] + (hand & ~(1 << card),) + hands[seat + 1:]
+            value = self._search(child, leader, cards + (card,), won, alpha, beta)
+            if maximizing:
+                if value > best:
+                    best, best_card = value, card
+                    alpha = max(alpha, value)
+            elif value < best:
+                best, best_card = value, card
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        if key is not None:
+            # (lower bound, upper bound, best lead to try first next time)
+            lower, upper, _ = self.table.get(key, (0, 1 << 30, -1))
+            if best <= alpha_in:
+                upper = min(upper, best)
+            elif best >= beta_in:
+                lower = max(lower, best)
+            else:
+                lower = upper = best
+            self.table[key] = (lower, upper, best_card)
+        return best
+
+    def _last_trick(self, hands: tuple, leader: int, won: tuple) -> int:
+        """Team 0's points when every hand holds one card."""
+        cards = [hands[(leader + turn) % 4].bit_length() - 1 for turn in range(4)]
+        ranks = self.ranks[DECK[cards[0]].suit]
+        best = max(range(4), key=lambda i: ranks[cards[i]])
+        team = team_for(leader + best)
+        won = self._add_winner(won, cards[best], team)
+        return (TRICK_POINTS if team == 0 else 0) + self._bonus(won, cards[0])
+
+    def _solve(self, hands: tuple, leader: int, cards: tuple, won: tuple, total: int) -> int:
+        """Exact value by bisection on the score with null-window searches,
+        which cut off far more than one full-window search."""
+        low, high = 0, total
+        while low < high:
+            # Scores are multiples of TRICK_POINTS.
+            guess = (low + high) // (2 * TRICK_POINTS) * TRICK_POINTS + TRICK_POINTS
+            if self._search(hands, leader, cards, won, guess - 1, guess) >= guess:
+                low = guess
+            else:
+                high = guess - TRICK_POINTS
+        return low
+
+    def _position(
+        self,
+        hands: Sequence[Sequence[Card]],
+        current_cards: Sequence[Card],
+        winners: Sequence[tuple[Card, int]],
+    ) -> tuple[tuple, tuple, tuple]:
+        won = (-1,) * (TRUMP_CLASS + 2)
+        for card, seat in winners:
+            won = self._add_winner(won, card.index, team_for(seat))
+        return (
+            tuple(to_mask(hand) for hand in hands),
+            tuple(card.index for card in current_cards),
+            won,
+        )
+
+    def solve(
+        self,
+        hands: Sequence[Sequence[Card]],
+        leader: int,
+        current_cards: Sequence[Card] = (),
+        winners: Sequence[tuple[Card, int]] = (),
+    ) -> list[int]:
+        """Points per team from the rest of the round under perfect play.
+
+        `hands` are indexed by seat, `leader` is the seat that led the
+        current trick and `current_cards` the cards played to it so far.
+        `winners` are the `(winning card, seat)` of the tricks already
+        played this round, which decide the bonus.
+        """
+        masks, cards, won = self._position(hands, current_cards, winners)
+        total = TRICK_POINTS * (max(bin(m).count("1") for m in masks) + 1)
+        team0 = self._solve(masks, leader, cards, won, total)
+        return [team0, total - team0]
+
+    def card_values(
+        self,
+        hands: Sequence[Sequence[Card]],
+        leader: int,
+        current_cards: Sequence[Card] = (),
+        winners: Sequence[tuple[Card, int]] = (),
+    ) -> dict[int, int]:
+        """Points the mover's team takes from here after each legal card,
+        by card index, for the seat to move."""
+        masks, cards, won = self._position(hands, current_cards, winners)
+        total = TRICK_POINTS * (max(bin(m).count("1") for m in masks) + 1)
+        seat = (leader + len(cards)) % 4
+        legal = self.legal(masks[seat], cards[0] if cards else None)
+        values = {}
+        for card in _bits(legal):
+            child = masks[:seat] + (masks[seat] & ~(1 << card),) + masks[seat + 1:]
+            team0 = self._solve(child, leader, cards + (card,), won, total)
+            values[card] = team0 if team_for(seat) == 0 else total - team0
+        return values
+
+
+def solve(
+    hands: Sequence[Sequence[Card]],
+    trump: Suit,
+    leader: int,
+    current_cards: Sequence[Card] = (),
+    winners: Sequence[tuple[Card, int]] = (),
+) -> list[int]:
+    """`DoubleDummySolver.solve` with a fresh solver."""
+    return DoubleDummySolver(trump).solve(hands, leader, current_cards, winners)
+
+
+# ── Batch analysis ──────────────────────────────────────────────────
+
+
+def heuristic_points(hands: list[list[Card]], trump: Suit, leader: int) -> list[int]:
+    """Points per team when all four play `evaluate_hand_play`, scored like
+    the solver. `hands` are consumed."""
+    points = [0, 0]
+    winners = []
+    while hands[leader]:
+        cards = []
+        for turn in range(4):
+            hand = hands[(leader + turn) % 4]
+            legal = legal_moves(hand, cards[0], trump) if cards else hand
+            card = evaluate_hand_play(cards[0].suit if cards else None, legal, cards, trump)
+            hand.remove(card)
+            cards.append(card)
+        best = trick_winner(cards, cards[0].suit, trump)
+        leader = (leader + best) % 4
+        points[team_for(leader)] += TRICK_POINTS
+        winners.append((cards[best], leader))
+    best = trick_winner([card for card, _ in winners], cards[0].suit, trump)
+    points[team_for(winners[best][1])] += TRICK_POINTS
+    return points
+
+
+def analyze_deal(seed: int, deal: int) -> tuple[int, int, int]:
+    """Deals random hands, trump and leader for one deal of a batch; returns
+    the leader's team's points double dummy and with the tbot rules, and
+    the nodes searched."""
+    rng = random.Random(f"{seed}/{deal}")
+    deck = list(DECK)
+    rng.shuffle(deck)
+    hands = [deck[i * HAND_SIZE:(i + 1) * HAND_SIZE] for i in range(4)]
+    trump, leader = rng.choice(SUITS), rng.randrange(4)
+    solver = DoubleDummySolver(trump)
+    solved = solver.solve(hands, leader)[team_for(leader)]
+    heuristic = heuristic_points([list(h) for h in hands], trump, leader)[team_for(leader)]
+    return solved, heuristic, solver.nodes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Solve random 45s deals double dummy.")
+    parser.add_argument("--deals", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    deals = range(args.deals)
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(analyze_deal, [args.seed] * args.deals, deals, chunksize=64))
+    else:
+        results = [analyze_deal(args.seed, deal) for deal in deals]
+    elapsed = time.perf_counter() - start
+
+    solved, heuristic, nodes = (sum(column) for column in zip(*results))
+    print(f"{args.deals} deals in {elapsed:.2f}s ({args.deals / elapsed:,.1f} deals/s, "
+          f"{nodes / args.deals:,.0f} nodes/deal)")
+    print(f"leader's team, double dummy: {solved / args.deals:.2f} points/deal")
+    print(f"leader's team, tbot rules:   {heuristic / args.deals:.2f} points/deal")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Flight recorder: the last few hundred steps before a bot failed.
+
+A screenshot at the moment of failure shows where a bot ended up, not the
+transition that went wrong. `FlightRecorder` keeps the last `capacity`
+events of a run in a ring buffer (a bounded deque):
+
+    state   the page state JSON the bot extracted (GAME_VIEW_JS)
+    action  a click or other input the bot sent
+    wait    a wait_until: what it waited for, how long, whether it held
+    log     a line the bot logged
+
+Recording is cheap enough to leave on. A state equal to the previous one
+only bumps that event's repeat count. A changed one is compressed on its
+own against a preset dictionary of the strings every state shares, so
+evicting old events never breaks decoding. `dump` writes the buffer as a
+gzipped JSON-lines timeline, and running this module prints one with only
+what changed between consecutive states:
+
+    python flightrecorder.py artifacts/tbot_1_flight.jsonl.gz
+"""
+
+import argparse
+import gzip
+import json
+import time
+import zlib
+from collections import deque
+from dataclasses import fields as dataclass_fields
+from pathlib import Path
+from typing import Optional
+
+from card import DECK, Suit
+from gameview import card_value, game_view_from_json
+
+DEFAULT_CAPACITY = 2000
+
+# zlib matches against the end of the dictionary most cheaply, so the
+# skeleton every state shares goes last.
+_SKELETON = {
+    "url": "http://localhost:4000/game/",
+    "connected": True,
+    "queueRoot": False,
+    "container": {
+        "data-phase": "Playing",
+        "data-current-turn": "false",
+        "data-bagged": "false",
+        "data-current-bid": "0",
+        "data-trump": "hearts",
+        "data-suit-led": "",
+        "data-auto-playing": "false",
+        "data-confirm-discard-clicked": "false",
+    },
+    "hand": {
+        "data-phase": "Playing",
+        "data-auto-playing": "false",
+        "data-selection-version": "",
+        "data-selected-cards": "[]",
+    },
+    "handCards": [],
+    "table": [],
+    "buttons": [
+        ["pass-bid-button", False],
+        ["confirm-bid-button", False],
+        ["confirm-discard-button", False],
+        ["play-card-button", False],
+        ["resume-control-button", False],
+        ["join-queue-button", True],
+        ["leave-queue-button", True],
+    ],
+}
+ZDICT = (
+    ",".join(f'["{card_value(card)}",false]' for card in DECK)
+    + json.dumps(_SKELETON, separators=(",", ":"))
+).encode()
+
+
+# A state is a couple of KB, so a 4 KB window holds it and the dictionary.
+# zlib's default 32 KB window and large hash tables cost more to set up
+# than the compression itself; every state starts from a copy of these
+# small templates, with the dictionary already loaded.
+_WBITS = 12
+_COMPRESSOR = zlib.compressobj(1, zlib.DEFLATED, _WBITS, 4, zdict=ZDICT)
+_DECOMPRESSOR = zlib.decompressobj(_WBITS, zdict=ZDICT)
+
+
+def compress_state(raw: str) -> bytes:
+    compressor = _COMPRESSOR.copy()
+    return compressor.compress(raw.encode()) + compressor.flush()
+
+
+def decompress_state(blob: bytes) -> str:
+    decompressor = _DECOMPRESSOR.copy()
+    return (decompressor.decompress(blob) + decompressor.flush()).decode()
+
+
+class FlightRecorder:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        # Events are lists: [t, kind, ...]. A state event is
+        # [t, "state", blob, repeats, last seen] and is updated in place.
+        self.events: deque = deque(maxlen=capacity)
+        self.started = time.time()
+        self._origin = time.perf_counter()
+        self.recorded = 0
+        self._last_raw: Optional[str] = None
+        self._last_state: Optional[list] = None
+
+    def _now(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def _append(self, event: list) -> None:
+        self.events.append(event)
+        self.recorded += 1
+
+    def state(self, raw: str) -> None:
+        now = self._now()
+        if raw == self._last_raw:
+            self._last_state[3] += 1
+            self._last_state[4] = now
+            return
+        self._last_raw = raw
+        self._last_state = [now, "state", compress_state(raw), 0, now]
+        self._append(self._last_state)
+
+    def action(self, what: str) -> None:
+        self._append([self._now(), "action", what])
+
+    def wait(self, what: str, seconds: float, ok: bool) -> None:
+        self._append([self._now(), "wait", what, seconds, ok])
+
+    def log(self, msg: str) -> None:
+        self._append([self._now(), "log", msg])
+
+    def nbytes(self) -> int:
+        """Roughly the memory held by recorded states, for tuning capacity."""
+        return sum(len(event[2]) for event in self.events if event[1] == "state")
+
+    def dump(self, path: Path) -> Path:
+        """Writes the buffer, oldest event first, as gzipped JSON lines."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            header = {
+                "started": self.started,
+                "capacity": self.events.maxlen,
+                "recorded": self.recorded,
+                "dropped": self.recorded - len(self.events),
+            }
+            f.write(json.dumps(header) + "\n")
+            for event in list(self.events):
+                f.write(json.dumps(_event_dict(event), separators=(",", ":")) + "\n")
+        return path
+
+
+def _event_dict(event: list) -> dict:
+    t, kind = round(event[0], 4), event[1]
+    if kind == "state":
+        return {
+            "t": t, "kind": kind, "state": json.loads(decompress_state(event[2])),
+            "repeats": event[3], "until": round(event[4], 4),
+        }
+    if kind == "wait":
+        return {"t": t, "kind": kind, "what": event[2], "seconds": round(event[3], 4), "ok": event[4]}
+    if kind == "action":
+        return {"t": t, "kind": kind, "what": event[2]}
+    return {"t": t, "kind": kind, "msg": event[2]}
+
+
+# ── Reading timelines ───────────────────────────────────────────────
+
+
+def read_timeline(path: Path) -> tuple[dict, list[dict]]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        return header, [json.loads(line) for line in f]
+
+
+def _view_fields(state: dict) -> dict[str, str]:
+    """The `GameView` a bot would have read from `state`, as printable fields."""
+    view = game_view_from_json(json.dumps(state))
+    fields = {}
+    for field in dataclass_fields(view):
+        value = getattr(view, field.name)
+        if isinstance(value, list):
+            value = " ".join(map(str, value))
+        elif isinstance(value, dict):
+            value = " ".join(name for name, enabled in value.items() if enabled)
+        elif isinstance(value, Suit):
+            value = value.long_name()
+        fields[field.name] = str(value)
+    return fields
+
+
+def format_timeline(header: dict, events: list[dict]) -> str:
+    lines = [
+        f"{header['recorded']} events recorded, {header['dropped']} dropped by the "
+        f"{header['capacity']}-event buffer; run started {time.ctime(header['started'])}"
+    ]
+    previous: dict = {}
+    for event in events:
+        stamp = f"{event['t']:>10.3f}"
+        kind = event["kind"]
+        if kind == "state":
+            fields = _view_fields(event["state"])
+            changed = {k: v for k, v in fields.items() if previous.get(k) != v}
+            previous = fields
+            seen = f" (x{event['repeats'] + 1} until {event['until']:.3f})" if event["repeats"] else ""
+            lines.append(f"{stamp} state{seen}")
+            lines.extend(f"{'':>12}{key} = {value}" for key, value in changed.items())
+        elif kind == "wait":
+            outcome = "ok" if event["ok"] else "TIMED OUT"
+            lines.append(f"{stamp} wait   {event['what']}: {event['seconds']:.3f}s {outcome}")
+        elif kind == "action":
+            lines.append(f"{stamp} action {event['what']}")
+        else:
+            lines.append(f"{stamp} log    {event['msg']}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print a tbot flight recorder timeline.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--tail", type=int, default=None, help="only the last N events")
+    args = parser.parse_args()
+
+    header, events = read_timeline(args.path)
+    if args.tail is not None:
+        events = events[-args.tail:]
+    print(format_timeline(header, events))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+"""Fixed-width binary game records and a streaming analyzer.
+
+JSON transcripts (transcript.py) keep every decision with the state it saw,
+which is what replay needs but far too much for millions of games. A game
+log keeps one 97-byte record per round instead, with cards as `Card.index`
+and suits as `SUITS` indices:
+
+    game        uint32     game number within the log
+    round       uint8      round number within the game
+    dealer, bid_seat, bid, trump
+                uint8
+    bids        uint8[4]   each seat's bid, 0 for a pass
+    bid_suits   uint8[4]   each seat's bid suit, PASS_SUIT for a pass
+    deal        uint8[4,5] the hands as dealt
+    kitty       uint8[3]   the cards the bidder took
+    kept        uint8[4]   how many cards each seat kept in the discard
+    hands       uint8[4,5] the hands after the redraw, kept cards first
+    leaders     uint8[5]   the seat that led each trick
+    tricks      uint8[5,4] each trick's cards in play order
+    points      uint8[2]   the round's points per team
+    scores      int16[2]   the team totals after the round
+    winner      int8       the winning team on a game's last round, else -1
+    flags       uint8      FLAG_BAGGED if the dealer was bagged into bidding
+
+after a 16-byte header. `record` plays `sim.play_game` games in worker
+processes and appends their rounds. `read_rounds` memory-maps a log and
+yields NumPy record arrays a chunk at a time, and `analyze` folds those
+into aggregates, so a log of any size is analyzed in constant memory:
+
+    python gamelog.py record --games 1000000 --seed 1 --out games.bin
+    python gamelog.py analyze games.bin
+"""
+
+import argparse
+import json
+import os
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+from batch import BID_SMALL, BID_SURE
+from card import SUIT_INDEX, SUITS, Card, Suit
+from rules import BID_VALUES, HAND_SIZE, KITTY_SIZE, TRICK_POINTS, score_round
+from sim import play_card, play_game
+from tournament import make_strategy, shard_rng
+
+MAGIC = b"45SGAME\0"
+VERSION = 2
+HEADER = struct.Struct("<8sHHI")  # magic, version, record size, reserved
+PASS_SUIT = len(SUITS)
+FLAG_BAGGED = 1
+CHUNK = 1 << 16
+# The most points a team can take in a round: every trick and the bonus.
+MAX_POINTS = (HAND_SIZE + 1) * TRICK_POINTS
+
+ROUND = np.dtype([
+    ("game", "<u4"),
+    ("round", "u1"),
+    ("dealer", "u1"),
+    ("bid_seat", "u1"),
+    ("bid", "u1"),
+    ("trump", "u1"),
+    ("bids", "u1", (4,)),
+    ("bid_suits", "u1", (4,)),
+    ("deal", "u1", (4, HAND_SIZE)),
+    ("kitty", "u1", (KITTY_SIZE,)),
+    ("kept", "u1", (4,)),
+    ("hands", "u1", (4, HAND_SIZE)),
+    ("leaders", "u1", (HAND_SIZE,)),
+    ("tricks", "u1", (HAND_SIZE, 4)),
+    ("points", "u1", (2,)),
+    ("scores", "<i2", (2,)),
+    ("winner", "i1"),
+    ("flags", "u1"),
+])
+
+
+def suit_index(suit: Suit) -> int:
+    return PASS_SUIT if suit == Suit.PASS else SUIT_INDEX[suit]
+
+
+# ── Recording ───────────────────────────────────────────────────────
+
+
+class RoundCapture:
+    """Collects the cards of each round of one game from its strategy calls.
+
+    `sim.play_round` asks all four seats to bid before anything else, so a
+    bid after the round's fourth starts the next round."""
+
+    def __init__(self) -> None:
+        self.rounds: list[dict] = []
+        self.bids = 4
+        self.plays = 0
+
+    def bid(self, seat: int, hand: list[Card], bagged: bool, decision: tuple[int, Suit]) -> None:
+        if self.bids == 4:
+            self.rounds.append({
+                "deal": [None] * 4, "bids": [0] * 4, "bid_suits": [PASS_SUIT] * 4,
+                "kitty": [], "kept": [0] * 4, "hands": [None] * 4,
+                "leaders": [], "tricks": [], "flags": 0,
+            })
+            self.bids = self.plays = 0
+        current = self.rounds[-1]
+        current["deal"][seat] = [card.index for card in hand]
+        current["bids"][seat] = decision[0]
+        current["bid_suits"][seat] = suit_index(decision[1])
+        if bagged:
+            current["flags"] |= FLAG_BAGGED
+        self.bids += 1
+
+    def discard(self, seat: int, hand: list[Card], keep: list[Card]) -> None:
+        current = self.rounds[-1]
+        current["kept"][seat] = len(keep)
+        # finish_round adds the kitty to the end of the bidder's hand.
+        if len(hand) > HAND_SIZE:
+            current["kitty"] = [card.index for card in hand[HAND_SIZE:]]
+
+    def play(self, seat: int, current_cards: list[Card], hand: list[Card], card: Card) -> None:
+        current = self.rounds[-1]
+        # A seat's first play sees its whole hand after the redraw.
+        if self.plays < 4:
+            current["hands"][seat] = [c.index for c in hand]
+        if not current_cards:
+            current["leaders"].append(seat)
+            current["tricks"].append([])
+        current["tricks"][-1].append(card.index)
+        self.plays += 1
+
+
+class CapturingStrategy:
+    """Wraps a strategy and reports its decisions for `seat` to a `RoundCapture`."""
+
+    def __init__(self, inner, capture: RoundCapture, seat: int) -> None:
+        self.inner = inner
+        self.capture = capture
+        self.seat = seat
+        self.name = getattr(inner, "name", type(inner).__name__)
+
+    def bid(self, hand: list[Card], max_bid: int, bagged: bool) -> tuple[int, Suit]:
+        decision = self.inner.bid(hand, max_bid, bagged)
+        self.capture.bid(self.seat, hand, bagged, decision)
+        return decision
+
+    def discard(self, hand: list[Card], trump: Suit) -> list[Card]:
+        keep = self.inner.discard(hand, trump)
+        self.capture.discard(self.seat, hand, keep)
+        return keep
+
+    def play(self, suit_led, legal, current_cards, trump, hand=None, seen=()) -> Card:
+        card = play_card(self.inner, suit_led, legal, current_cards, trump, hand, seen)
+        self.capture.play(self.seat, current_cards, hand, card)
+        return card
+
+
+def record_games(strategies: list, rng, games: int, first_game: int = 0) -> np.ndarray:
+    """Plays `games` games and returns their rounds as `ROUND` records."""
+    rows = []
+    for game in range(first_game, first_game + games):
+        capture = RoundCapture()
+        result = play_game(
+            [CapturingStrategy(s, capture, seat) for seat, s in enumerate(strategies)], rng
+        )
+        scores = [0, 0]
+        last = len(result.rounds) - 1
+        for number, (r, cards) in enumerate(zip(result.rounds, capture.rounds)):
+            scores, _ = score_round(r.points, scores, r.bid, r.bid_seat)
+            rows.append((
+                game, number, r.dealer, r.bid_seat, r.bid, suit_index(r.trump),
+                cards["bids"], cards["bid_suits"], cards["deal"], cards["kitty"], cards["kept"],
+                cards["hands"], cards["leaders"], cards["tricks"], r.points, scores,
+                result.winner if number == last else -1, cards["flags"],
+            ))
+    return np.array(rows, dtype=ROUND)
+
+
+def record_shard(seats: list[str], seed: int, shard: int, games: int, first_game: int) -> bytes:
+    rng = shard_rng(seed, shard)
+    strategies = [make_strategy(spec, random.Random(rng.getrandbits(64))) for spec in seats]
+    return record_games(strategies, rng, games, first_game).tobytes()
+
+
+def open_log(path: Path) -> tuple[int, int]:
+    """Creates `path` with a header if it does not exist. Returns the
+    number of rounds and the next free game number."""
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(HEADER.pack(MAGIC, VERSION, ROUND.itemsize, 0))
+        return 0, 0
+    rounds = map_rounds(path)
+    return len(rounds), int(rounds["game"].max()) + 1 if len(rounds) else 0
+
+
+def record(
+    path: Path, seats: list[str], games: int, seed: int, shard_size: int, workers: int
+) -> int:
+    """Appends `games` games to the log at `path`. Returns the rounds written."""
+    _, first_game = open_log(path)
+    shards = [
+        (shard, min(shard_size, games - offset), first_game + offset)
+        for shard, offset in enumerate(range(0, games, shard_size))
+    ]
+    written = 0
+    start = time.perf_counter()
+    with path.open("ab") as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(record_shard, seats, seed, *shard) for shard in shards]
+        # In shard order, so a seeded log is the same bytes however the
+        # workers are scheduled.
+        for done, future in enumerate(futures, 1):
+            data = future.result()
+            f.write(data)
+            written += len(data) // ROUND.itemsize
+            if done % max(len(futures) // 10, 1) == 0 and done < len(futures):
+                print(f"[{done}/{len(futures)} shards] {written:,} rounds "
+                      f"in {time.perf_counter() - start:.0f}s", flush=True)
+    return written
+
+
+# ── Reading ─────────────────────────────────────────────────────────
+
+
+def map_rounds(path: Path) -> np.ndarray:
+    """All of a log's rounds as a read-only memory-mapped record array."""
+    with path.open("rb") as f:
+        magic, version, size, _ = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or version != VERSION or size != ROUND.itemsize:
+        raise ValueError(f"{path} is not a version {VERSION} game log")
+    count = (path.stat().st_size - HEADER.size) // ROUND.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=ROUND)
+    return np.memmap(path, dtype=ROUND, mode="r", offset=HEADER.size, shape=(count,))
+
+
+def read_rounds(path: Path, chunk: int = CHUNK) -> Iterator[np.ndarray]:
+    """The log's rounds, `chunk` at a time. Only the pages of the chunk in
+    use need to be resident."""
+    rounds = map_rounds(path)
+    for start in range(0, len(rounds), chunk):
+        yield rounds[start:start + chunk]
+
+
+# ── Analysis ────────────────────────────────────────────────────────
+
+
+def predicted_bids(hands: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """`strategy.evaluate_hand_bid` for an (n, 5) array of card indices:
+    the raw estimate, the bid it makes of it, and the suit index."""
+    sure = BID_SURE[hands].sum(axis=1)
+    small = BID_SMALL[hands].sum(axis=1)
+    suit = sure.argmax(axis=1)
+    rows = np.arange(len(hands))
+    estimate = small[rows, suit].astype(np.int64) * 3 + sure[rows, suit]
+    return estimate, np.where(estimate >= 15, estimate // 5 * 5, 0), suit
+
+
+class Analysis:
+    """Aggregates over any number of chunks of rounds."""
+
+    def __init__(self) -> None:
+        bids, suits, bins = len(BID_VALUES), len(SUITS), MAX_POINTS // TRICK_POINTS + 1
+        self.rounds = 0
+        self.games = 0
+        self.bagged = 0
+        # [bid value, trump]
+        self.contracts = np.zeros((bids, suits), dtype=np.int64)
+        self.made = np.zeros((bids, suits), dtype=np.int64)
+        # [bid value, points / TRICK_POINTS]
+        self.bidder_points = np.zeros((bids, bins), dtype=np.int64)
+        self.defender_points = np.zeros((bids, bins), dtype=np.int64)
+        # The bidder's dealt hand under evaluate_hand_bid, by the bid it
+        # would make: [bid / 5] -> rounds, made, bidding team points.
+        # Bagged dealers land in the 0 row.
+        self.by_prediction = np.zeros((bins, 3), dtype=np.int64)
+        self.suit_matches = 0
+        # Sums for the correlation of the raw estimate with bidder points.
+        self.moments = np.zeros(6)  # n, x, y, xx, yy, xy
+
+    def add(self, rounds: np.ndarray) -> None:
+        n = len(rounds)
+        rows = np.arange(n)
+        bid = rounds["bid"].astype(np.int64)
+        trump = rounds["trump"].astype(np.int64)
+        bid_team = rounds["bid_seat"] % 2
+        points = rounds["points"].astype(np.int64)
+        bidder = points[rows, bid_team]
+        defender = points[rows, 1 - bid_team]
+        made = bidder >= bid
+        row = np.searchsorted(BID_VALUES, bid)
+
+        self.rounds += n
+        self.games += int((rounds["winner"] >= 0).sum())
+        np.add.at(self.contracts, (row, trump), 1)
+        np.add.at(self.made, (row, trump), made)
+        np.add.at(self.bidder_points, (row, bidder // TRICK_POINTS), 1)
+        np.add.at(self.defender_points, (row, defender // TRICK_POINTS), 1)
+
+        dealt = rounds["deal"][rows, rounds["bid_seat"]]
+        self.bagged += int(((rounds["flags"] & FLAG_BAGGED) != 0).sum())
+        estimate, predicted, suit = predicted_bids(dealt)
+        slot = np.minimum(predicted // 5, len(self.by_prediction) - 1)
+        np.add.at(self.by_prediction, (slot, 0), 1)
+        np.add.at(self.by_prediction, (slot, 1), made)
+        np.add.at(self.by_prediction, (slot, 2), bidder)
+        self.suit_matches += int((suit == trump).sum())
+
+        x, y = estimate.astype(float), bidder.astype(float)
+        self.moments += (n, x.sum(), y.sum(), (x * x).sum(), (y * y).sum(), (x * y).sum())
+
+    def correlation(self) -> float:
+        n, x, y, xx, yy, xy = self.moments
+        if n < 2:
+            return 0.0
+        var_x, var_y = n * xx - x * x, n * yy - y * y
+        if var_x <= 0 or var_y <= 0:
+            return 0.0
+        return float((n * xy - x * y) / np.sqrt(var_x * var_y))
+
+    def to_dict(self) -> dict:
+        suits = [suit.long_name() for suit in SUITS]
+        bins = [points * TRICK_POINTS for points in range(self.bidder_points.shape[1])]
+        return {
+            "rounds": self.rounds,
+            "games": self.games,
+            "make_rate": {
+                str(bid): {
+                    **{suit: _rate(self.made[i, j], self.contracts[i, j]) for j, suit in enumerate(suits)},
+                    "all": _rate(self.made[i].sum(), self.contracts[i].sum()),
+                    "contracts": int(self.contracts[i].sum()),
+                }
+                for i, bid in enumerate(BID_VALUES)
+            },
+            "bidder_points": {
+                str(bid): dict(zip(map(str, bins), self.bidder_points[i].tolist()))
+                for i, bid in enumerate(BID_VALUES)
+            },
+            "defender_points": {
+                str(bid): dict(zip(map(str, bins), self.defender_points[i].tolist()))
+                for i, bid in enumerate(BID_VALUES)
+            },
+            "predictor": {
+                "bagged": self.bagged,
+                "suit_match_rate": _rate(self.suit_matches, self.rounds),
+                "correlation": self.correlation(),
+                "by_prediction": {
+                    str(slot * 5): {
+                        "rounds": int(rounds),
+                        "make_rate": _rate(made, rounds),
+                        "mean_points": float(points / rounds),
+                    }
+                    for slot, (rounds, made, points) in enumerate(self.by_prediction.tolist())
+                    if rounds
+                },
+            },
+        }
+
+
+def _rate(successes, trials) -> Optional[float]:
+    return float(successes / trials) if trials else None
+
+
+def analyze(paths: Sequence[Path], chunk: int = CHUNK) -> dict:
+    analysis = Analysis()
+    for path in paths:
+        for rounds in read_rounds(path, chunk):
+            analysis.add(rounds)
+    return analysis.to_dict()
+
+
+def _percent(rate: Optional[float]) -> str:
+    return "-" if rate is None else f"{rate:.1%}"
+
+
+def format_analysis(report: dict) -> str:
+    suits = [suit.long_name() for suit in SUITS]
+    lines = [
+        f"{report['rounds']:,} rounds of {report['games']:,} games",
+        "",
+        "make rate by bid and trump",
+        f"{'bid':<6}" + "".join(f"{suit:>10}" for suit in suits) + f"{'all':>10}{'contracts':>12}",
+    ]
+    for bid, row in report["make_rate"].items():
+        lines.append(
+            f"{bid:<6}" + "".join(f"{_percent(row[suit]):>10}" for suit in suits)
+            + f"{_percent(row['all']):>10}{row['contracts']:>12,}"
+        )
+
+    for key, title in (("bidder_points", "bidding team"), ("defender_points", "defending team")):
+        bins = next(iter(report[key].values())).keys()
+        lines += ["", f"{title} points by bid (share of rounds)",
+                  f"{'bid':<6}" + "".join(f"{points:>8}" for points in bins)]
+        for bid, counts in report[key].items():
+            total = sum(counts.values())
+            lines.append(
+                f"{bid:<6}" + "".join(
+                    f"{_percent(count / total if total else None):>8}" for count in counts.values()
+                )
+            )
+
+    predictor = report["predictor"]
+    lines += [
+        "",
+        "evaluate_hand_bid on the bidder's dealt hand",
+        f"estimate vs bidding team points: r = {predictor['correlation']:.3f}; "
+        f"suit is trump in {_percent(predictor['suit_match_rate'])}; "
+        f"{predictor['bagged']:,} bagged bids",
+        f"{'predicted':<10}{'rounds':>12}{'made':>10}{'points':>10}",
+    ]
+    for predicted, row in predictor["by_prediction"].items():
+        lines.append(
+            f"{predicted:<10}{row['rounds']:>12,}{_percent(row['make_rate']):>10}"
+            f"{row['mean_points']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record and analyze binary 45s game logs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    write = commands.add_parser("record", help="append offline games to a log")
+    write.add_argument("--games", type=int, default=10_000)
+    write.add_argument("--seed", type=int, default=0)
+    write.add_argument("--seats", default="tbot,tbot,tbot,tbot")
+    write.add_argument("--shard-size", type=int, default=500)
+    write.add_argument("--workers", type=int, default=os.cpu_count())
+    write.add_argument("--out", type=Path, default=Path("games.bin"))
+
+    read = commands.add_parser("analyze", help="aggregate statistics over logs")
+    read.add_argument("paths", type=Path, nargs="+")
+    read.add_argument("--chunk", type=int, default=CHUNK, help="rounds per chunk")
+    read.add_argument("--json", type=Path, default=None, help="also write the report here")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        seats = args.seats.split(",")
+        if len(seats) != 4:
+            parser.error("--seats needs exactly four strategies")
+        start = time.perf_counter()
+        written = record(args.out, seats, args.games, args.seed, args.shard_size, args.workers)
+        elapsed = time.perf_counter() - start
+        print(f"Recorded {args.games:,} games ({written:,} rounds, "
+              f"{written * ROUND.itemsize / 1e6:.1f} MB) to {args.out} in {elapsed:.1f}s")
+        return
+
+    start = time.perf_counter()
+    report = analyze(args.paths, args.chunk)
+    print(format_analysis(report))
+    print(f"\nAnalyzed in {time.perf_counter() - start:.1f}s")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""Everything a bot reads from the game page, extracted in one pass.
+
+`GameView` holds the `data-*` attributes `GameLive` renders on
+`#game-container`, the cards in `#player-hand` (and which of them are not
+grayed out), the cards on `#table`, the actions line (bids, trick winners),
+the score table shown while scoring and the page's buttons. It is built
+either from page HTML by `parse_game_view`, a single targeted scan with no
+DOM tree, or from the JSON that `tbot.py`'s in-browser extractor returns
+by `game_view_from_json`.
+"""
+
+import json
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Optional
+
+from card import Suit, Card
+
+
+def parse_suit(raw: Optional[str]) -> Optional[Suit]:
+    raw = (raw or "").strip()
+    if raw in ("", "nil", "none"):
+        return None
+    return Suit[raw.upper()]
+
+
+# "value_suit" string -> card; there are only 52 valid keys.
+_PARSED: dict[str, Card] = {}
+
+
+def parse_card(card_value: str) -> Card:
+    """Parses the `"10_hearts"` form used in `data-card-value`."""
+    card = _PARSED.get(card_value)
+    if card is None:
+        value, suit = card_value.split("_")
+        card = _PARSED[card_value] = Card(value, Suit[suit.upper()])
+    return card
+
+
+def card_value(card: Card) -> str:
+    return f"{card.value}_{card.suit.long_name()}"
+
+
+@dataclass
+class GameView:
+    phase: str = ""
+    my_turn: bool = False
+    bagged: bool = False
+    current_bid: int = 0
+    trump: Optional[Suit] = None
+    suit_led: Optional[Suit] = None
+    auto_playing: bool = False
+    confirm_discard_clicked: bool = False
+    hand: list[Card] = field(default_factory=list)
+    playable: list[Card] = field(default_factory=list)
+    table: list[Card] = field(default_factory=list)
+    # The ".actions-list" line split into entries, e.g. "ann bid 20".
+    actions: list[str] = field(default_factory=list)
+    # Rows of the score table, one per round: each team's "total change".
+    score_rows: list[list[str]] = field(default_factory=list)
+    # Card values selected in the hand (set client-side by the CardSelection hook).
+    selected: list[str] = field(default_factory=list)
+    # Button id -> enabled.
+    buttons: dict[str, bool] = field(default_factory=dict)
+    queue_ready: bool = False
+    url: str = ""
+    connected: bool = False
+
+    @property
+    def in_game(self) -> bool:
+        return bool(self.phase)
+
+    @property
+    def in_queue(self) -> bool:
+        return "leave-queue-button" in self.buttons
+
+    @property
+    def scores(self) -> list[list[int]]:
+        """Both teams' totals after each round, from the score table."""
+        return [[int(cell.split()[0]) for cell in row] for row in self.score_rows if all(row)]
+
+
+def split_actions(text: str) -> list[str]:
+    text = " ".join(text.split())
+    return text.split(", ") if text else []
+
+
+def _read_container(view: GameView, attrs: dict) -> None:
+    view.phase = attrs.get("data-phase") or ""
+    view.my_turn = attrs.get("data-current-turn") == "true"
+    view.bagged = attrs.get("data-bagged") == "true"
+    view.current_bid = int(attrs.get("data-current-bid") or 0)
+    view.trump = parse_suit(attrs.get("data-trump"))
+    view.suit_led = parse_suit(attrs.get("data-suit-led"))
+    view.auto_playing = attrs.get("data-auto-playing") == "true"
+    view.confirm_discard_clicked = attrs.get("data-confirm-discard-clicked") == "true"
+
+
+def _add_hand_card(view: GameView, value: str, grayed_out: bool) -> None:
+    card = parse_card(value)
+    view.hand.append(card)
+    if not grayed_out:
+        view.playable.append(card)
+
+
+class _ViewParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.view = GameView()
+        self.section = None
+        self.depth = 0
+        self.text: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        element_id = attrs.get("id")
+        view = self.view
+
+        if element_id == "game-container":
+            _read_container(view, attrs)
+        elif element_id == "player-hand":
+            view.selected = json.loads(attrs.get("data-selected-cards") or "[]")
+        elif element_id == "queue-root":
+            view.queue_ready = True
+
+        if tag == "div":
+            if self.section:
+                self.depth += 1
+            elif element_id in ("player-hand", "table"):
+                self.section, self.depth = element_id, 1
+            elif "actions-list" in (attrs.get("class") or "").split():
+                self.section, self.depth = "actions", 1
+        elif tag == "tbody" and view.phase and not self.section:
+            self.section, self.depth = "scores", 1
+        elif tag == "tr" and self.section == "scores":
+            view.score_rows.append([])
+        elif tag == "td" and self.section == "scores":
+            self.text = []
+        elif tag == "button" and element_id:
+            view.buttons[element_id] = "disabled" not in attrs
+        elif tag == "img" and self.section == "player-hand":
+            value = attrs.get("data-card-value")
+            if value:
+                _add_hand_card(view, value, "grayed-out" in (attrs.get("class") or "").split())
+        elif tag == "img" and self.section == "table":
+            value = attrs.get("phx-value-card")
+            if value:
+                view.table.append(parse_card(value))
+
+    def handle_data(self, data):
+        if self.section in ("actions", "scores"):
+            self.text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "td" and self.section == "scores":
+            self.view.score_rows[-1].append(" ".join("".join(self.text).split()))
+        elif tag == "tbody" and self.section == "scores":
+            self.section = None
+        elif tag == "div" and self.section and self.section != "scores":
+            self.depth -= 1
+            if self.depth == 0:
+                if self.section == "actions":
+                    self.view.actions = split_actions("".join(self.text))
+                self.section = None
+
+
+def parse_game_view(html: str) -> GameView:
+    parser = _ViewParser()
+    parser.feed(html)
+    parser.close()
+    return parser.view
+
+
+def game_view_from_json(raw: str) -> GameView:
+    data = json.loads(raw)
+    view = GameView(
+        buttons=dict(data["buttons"]),
+        queue_ready=data["queueRoot"],
+        url=data["url"],
+        connected=data["connected"],
+    )
+    if data["container"] is not None:
+        _read_container(view, data["container"])
+    if data["hand"] is not None:
+        view.selected = json.loads(data["hand"].get("data-selected-cards") or "[]")
+    for value, grayed_out in data["handCards"]:
+        if value:
+            _add_hand_card(view, value, grayed_out)
+    view.table = [parse_card(value) for value in data["table"] if value]
+    view.actions = split_actions(data.get("actions") or "")
+    view.score_rows = data.get("scoreRows") or []
+    return view
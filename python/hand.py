@@ -0,0 +1,132 @@
+"""Bitset hands: bit `Card.index` is set for every card in the hand.
+
+`Hand` is an immutable 52-bit int. Suit, trump and legal-move filters on
+it are a few AND/OR operations against the masks below. `legal_mask`
+matches `rules.renegable`'s reneging of the 5 and jack of trump and the
+ace of hearts, because RENEGE_MASKS is built from the same `less_than`
+order.
+"""
+
+from typing import Iterable, Iterator, Optional
+
+from card import DECK, SUIT_INDEX, SUITS, Suit, Card, is_ace_of_hearts, less_than
+
+SUIT_MASKS = {suit: 0x1FFF << (13 * SUIT_INDEX[suit]) for suit in SUITS}
+ACE_OF_HEARTS = Card("1", Suit.HEARTS)
+ACE_OF_HEARTS_MASK = 1 << ACE_OF_HEARTS.index
+# Every card that counts as trump: the suit and the ace of hearts.
+TRUMP_MASKS = {trump: SUIT_MASKS[trump] | ACE_OF_HEARTS_MASK for trump in SUITS}
+# The 5 and jack of trump and the ace of hearts.
+RENEGABLE_MASKS = {
+    trump: ACE_OF_HEARTS_MASK | 1 << Card("5", trump).index | 1 << Card("J", trump).index
+    for trump in SUITS
+}
+
+
+def suit_led_by(card_led: Card, trump: Suit) -> Suit:
+    """The ace of hearts leads trump."""
+    return trump if is_ace_of_hearts(card_led) else card_led.suit
+
+
+def _renege_mask(card_led: Card, trump: Suit) -> int:
+    suit_led = suit_led_by(card_led, trump)
+    mask = 0
+    for card in DECK:
+        bit = 1 << card.index
+        if RENEGABLE_MASKS[trump] & bit and not less_than(card, card_led, suit_led, trump):
+            mask |= bit
+    return mask
+
+
+# RENEGE_MASKS[trump][card_led.index]: the cards that need not follow it.
+RENEGE_MASKS = {trump: tuple(_renege_mask(led, trump) for led in DECK) for trump in SUITS}
+
+ALL_CARDS = (1 << len(DECK)) - 1
+
+
+def _legal_rule(card_led: Card, trump: Suit) -> tuple[int, int, int]:
+    suit_led = suit_led_by(card_led, trump)
+    # Trumping in is optional when nothing of the suit led is held, so
+    # some followed card must be off the trump suit unless trump was led.
+    off_trump = ALL_CARDS if suit_led == trump else ALL_CARDS & ~SUIT_MASKS[trump]
+    return (
+        SUIT_MASKS[suit_led] | TRUMP_MASKS[trump],
+        off_trump,
+        ALL_CARDS & ~RENEGE_MASKS[trump][card_led.index],
+    )
+
+
+# LEGAL_RULES[trump][card_led.index]: (the cards that follow, the mask one
+# of them must hit for following to be forced, the same for reneging).
+LEGAL_RULES = {trump: tuple(_legal_rule(led, trump) for led in DECK) for trump in SUITS}
+
+
+def mask_of(cards: Iterable[Card]) -> int:
+    mask = 0
+    for card in cards:
+        mask |= 1 << card.index
+    return mask
+
+
+def cards_of(mask: int) -> list[Card]:
+    """The cards in `mask`, by index."""
+    cards = []
+    while mask:
+        low = mask & -mask
+        cards.append(DECK[low.bit_length() - 1])
+        mask ^= low
+    return cards
+
+
+def legal_mask(hand: int, card_led: Optional[Card], trump: Suit) -> int:
+    """The cards of `hand` that may be played after `card_led` led the
+    trick, as `rules.legal_moves` decides."""
+    if not hand or card_led is None:
+        return hand
+    follows, off_trump, not_renegable = LEGAL_RULES[trump][card_led.index]
+    follow = hand & follows
+    # Nothing of the suit led (trumping in is optional), or only cards
+    # that may renege.
+    if follow & off_trump and follow & not_renegable:
+        return follow
+    return hand
+
+
+
+class Hand(int):
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, cards: Iterable[Card]) -> "Hand":
+        return cls(mask_of(cards))
+
+    def __iter__(self) -> Iterator[Card]:
+        return iter(cards_of(self))
+
+    def __len__(self) -> int:
+        return self.bit_count()
+
+    def __contains__(self, card: Card) -> bool:
+        return bool(self >> card.index & 1)
+
+    def add(self, card: Card) -> "Hand":
+        return Hand(self | 1 << card.index)
+
+    def remove(self, card: Card) -> "Hand":
+        return Hand(self & ~(1 << card.index))
+
+    def suit(self, suit: Suit) -> "Hand":
+        return Hand(self & SUIT_MASKS[suit])
+
+    def trumps(self, trump: Suit) -> "Hand":
+        """The trump suit and the ace of hearts."""
+        return Hand(self & TRUMP_MASKS[trump])
+
+    def has_ace_of_hearts(self) -> bool:
+        return bool(self & ACE_OF_HEARTS_MASK)
+
+    def legal(self, card_led: Optional[Card], trump: Suit) -> "Hand":
+        return Hand(legal_mask(self, card_led, trump))
+
+    def __repr__(self) -> str:
+        return f"Hand({cards_of(self)})"
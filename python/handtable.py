@@ -0,0 +1,221 @@
+"""Precomputed hand strength for every 5-card hand, read by memory map.
+
+The table holds the expected points of our team (tricks and bonus) for
+each of the C(52, 5) = 2,598,960 hands under each trump. The estimate
+assumes we lead and the other three hands are random, played out with the
+tbot rules. It is the average over `--samples` random deals, shared
+across the four trumps.
+
+File layout (little endian): a 24-byte header, then one uint8 per hand and
+trump, trump-major in `SUITS` order. Inside a trump, a hand sits at its
+combinatorial number system rank: sum(C(c_i, i + 1)) over its sorted card
+indices c_0 < ... < c_4. A byte holds points * SCALE, so the file is about
+10 MB.
+
+Spades are not simulated. Swapping clubs and spades maps every hand under
+clubs trump to an equally strong hand under spades, so the spades entries
+are copied from clubs. At 16 samples the build takes about five CPU
+hours.
+
+    python handtable.py build --samples 16 --workers 32
+    python handtable.py lookup 5_hearts 11_hearts 1_hearts 13_hearts 2_clubs
+
+`HandTable` maps the file read-only: opening it costs nothing and worker
+processes share the page cache instead of each loading a copy.
+"""
+
+import argparse
+import mmap
+import os
+import random
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from math import comb
+from pathlib import Path
+from typing import Sequence
+
+from card import DECK, SUIT_INDEX, SUITS, Suit, Card
+from gameview import parse_card
+from ismcts import Deal
+from rules import HAND_SIZE
+
+MAGIC = b"45SHAND\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHHII")  # magic, version, scale, samples, hands
+SCALE = 8
+HANDS = comb(52, HAND_SIZE)
+CHUNK = 1 << 14
+DEFAULT_PATH = Path(os.getenv("TBOT_HAND_TABLE", Path(__file__).with_name("hand_strength.bin")))
+
+# BINOM[n][k] = C(n, k) for the ranks below.
+BINOM = tuple(tuple(comb(n, k) for k in range(HAND_SIZE + 1)) for n in range(53))
+CLUBS, SPADES = SUIT_INDEX[Suit.CLUBS] * 13, SUIT_INDEX[Suit.SPADES] * 13
+# Simulated trumps; spades are derived from clubs.
+SIMULATED = (Suit.HEARTS, Suit.DIAMONDS, Suit.CLUBS)
+
+
+def hand_rank(indices: Sequence[int]) -> int:
+    """Combinatorial number system rank of five distinct card indices."""
+    return sum(BINOM[c][k] for k, c in enumerate(sorted(indices), 1))
+
+
+def hand_unrank(rank: int) -> list[int]:
+    """The sorted card indices with the given rank."""
+    indices = []
+    c = 52
+    for k in range(HAND_SIZE, 0, -1):
+        c -= 1
+        while BINOM[c][k] > rank:
+            c -= 1
+        indices.append(c)
+        rank -= BINOM[c][k]
+    return indices[::-1]
+
+
+def swap_black(index: int) -> int:
+    if CLUBS <= index < CLUBS + 13:
+        return index - CLUBS + SPADES
+    if SPADES <= index < SPADES + 13:
+        return index - SPADES + CLUBS
+    return index
+
+
+# ── Builder ─────────────────────────────────────────────────────────
+
+
+def build_chunk(start: int, stop: int, samples: int, seed: int) -> dict[Suit, bytes]:
+    """Table bytes for ranks [start, stop) under each simulated trump."""
+    rng = random.Random(seed)
+    out = {trump: bytearray(stop - start) for trump in SIMULATED}
+    limit = 255 / SCALE
+    for offset, rank in enumerate(range(start, stop)):
+        indices = hand_unrank(rank)
+        hand = [DECK[i] for i in indices]
+        rest = [card for card in DECK if card.index not in indices]
+        totals = dict.fromkeys(SIMULATED, 0)
+        for _ in range(samples):
+            rng.shuffle(rest)
+            others = [rest[i * HAND_SIZE:(i + 1) * HAND_SIZE] for i in range(3)]
+            for trump in SIMULATED:
+                deal = Deal([list(hand)] + [list(o) for o in others], [], 0, trump, [])
+                deal.play_out()
+                totals[trump] += deal.result()[0]
+        for trump in SIMULATED:
+            out[trump][offset] = round(min(totals[trump] / samples, limit) * SCALE)
+    return {trump: bytes(values) for trump, values in out.items()}
+
+
+def build(path: Path, samples: int, workers: int, seed: int) -> None:
+    size = HEADER.size + len(SUITS) * HANDS
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as f:
+        f.truncate(size)
+    with tmp.open("r+b") as f, mmap.mmap(f.fileno(), size) as table:
+        table[:HEADER.size] = HEADER.pack(MAGIC, VERSION, SCALE, samples, HANDS)
+
+        def region(trump: Suit, start: int, stop: int) -> slice:
+            base = HEADER.size + SUIT_INDEX[trump] * HANDS
+            return slice(base + start, base + stop)
+
+        chunks = [(start, min(start + CHUNK, HANDS)) for start in range(0, HANDS, CHUNK)]
+        begin = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(build_chunk, start, stop, samples, seed * 1_000_003 + n): (start, stop)
+                for n, (start, stop) in enumerate(chunks)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                start, stop = futures[future]
+                for trump, values in future.result().items():
+                    table[region(trump, start, stop)] = values
+                if done % max(len(chunks) // 20, 1) == 0:
+                    elapsed = time.perf_counter() - begin
+                    print(f"[{done}/{len(chunks)} chunks] {elapsed:.0f}s, "
+                          f"~{elapsed / done * (len(chunks) - done):.0f}s left", flush=True)
+
+        clubs = table[region(Suit.CLUBS, 0, HANDS)]
+        spades = bytearray(HANDS)
+        for rank in range(HANDS):
+            spades[rank] = clubs[hand_rank([swap_black(i) for i in hand_unrank(rank)])]
+        table[region(Suit.SPADES, 0, HANDS)] = bytes(spades)
+        table.flush()
+    tmp.replace(path)
+
+
+# ── Reader ──────────────────────────────────────────────────────────
+
+
+class HandTable:
+    def __init__(self, path: Path = DEFAULT_PATH) -> None:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f"{path} is too short for a hand strength table")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.scale, self.samples, hands = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or hands != HANDS:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} hand strength table")
+        if len(self._map) != HEADER.size + len(SUITS) * HANDS:
+            self._map.close()
+            raise ValueError(f"{path} is truncated")
+
+    def points(self, hand: Sequence[Card], trump: Suit) -> float:
+        """Expected points of our team for a 5-card `hand` under `trump`."""
+        offset = HEADER.size + SUIT_INDEX[trump] * HANDS + hand_rank([c.index for c in hand])
+        return self._map[offset] / self.scale
+
+    def best_trump(self, hand: Sequence[Card]) -> tuple[Suit, float]:
+        """The trump with the most expected points, and those points."""
+        rank = hand_rank([c.index for c in hand])
+        values = [self._map[HEADER.size + i * HANDS + rank] for i in range(len(SUITS))]
+        best = max(range(len(SUITS)), key=values.__getitem__)
+        return SUITS[best], values[best] / self.scale
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "HandTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@lru_cache(maxsize=None)
+def get_table(path: Path = DEFAULT_PATH) -> HandTable:
+    """This process's mapping of the table at `path`."""
+    return HandTable(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or query the hand strength table.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    builder = commands.add_parser("build", help="simulate every hand and write the table")
+    builder.add_argument("--out", type=Path, default=DEFAULT_PATH)
+    builder.add_argument("--samples", type=int, default=16, help="random deals per hand")
+    builder.add_argument("--workers", type=int, default=os.cpu_count())
+    builder.add_argument("--seed", type=int, default=0)
+
+    lookup = commands.add_parser("lookup", help="print a hand's expected points per trump")
+    lookup.add_argument("cards", nargs=HAND_SIZE, help="cards like 5_hearts 11_diamonds")
+    lookup.add_argument("--table", type=Path, default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args.out, args.samples, args.workers, args.seed)
+        print(f"Wrote {args.out}")
+        return
+
+    hand = [parse_card(card) for card in args.cards]
+    if len({card.index for card in hand}) != HAND_SIZE:
+        parser.error("the hand needs five different cards")
+    with HandTable(args.table) as table:
+        for trump in SUITS:
+            print(f"{trump.long_name():<10}{table.points(hand, trump):6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+"""Information-set Monte Carlo tree search for the Playing and Discard phases.
+
+Play: single-observer ISMCTS. Every iteration deals the unseen cards
+into the other hands at random, which is a determinization consistent
+with what we know. It walks one shared tree, in which every player's
+card is an edge, choosing only among cards legal in that deal by UCB with
+availability counts. It expands one new card and plays the rest of the
+hand with the tbot rules. Each node keeps the points of the team that
+played into it, so both teams search for their own best play. Points are
+those of the whole round, earlier tricks included, so the values stored
+in the tree stay comparable when it outlives the decision: on our next
+turn in the same hand, the cards played since are walked down from our
+last card and the search continues from there.
+
+Discard: a flat UCB search over the cards to keep. Trumps are always kept
+unless there are more than five. Each evaluation deals the unknown cards,
+refills every hand and plays the round out with the tbot rules.
+
+Both searches are anytime: they stop at a wall-clock budget or an
+iteration count, whichever comes first. Offline only the iteration count
+applies, so seeded games replay the same on any machine; live bots add
+the budget. Root parallelism over worker
+processes is optional. Each worker searches its own tree, and their root
+visit counts are summed.
+"""
+
+import math
+import os
+import random
+import time
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import combinations
+from typing import Optional, Sequence
+
+from card import DECK, Suit, Card, is_ace_of_hearts
+from rules import HAND_SIZE, TRICK_POINTS, earlier_winners, legal_moves, trick_winner
+from sim import TbotStrategy
+from strategy import choose_discard, evaluate_hand_play
+
+# Seconds per decision for live bots.
+LIVE_TIME_BUDGET = float(os.getenv("TBOT_ISMCTS_BUDGET", "1.0"))
+DEFAULT_MAX_ITERATIONS = 400
+EXPLORATION = 0.7
+# Points at stake in a hand: five tricks and the best-card bonus.
+MAX_POINTS = TRICK_POINTS * (HAND_SIZE + 1)
+# A reused tree is dropped once it grows past this many nodes.
+MAX_NODES = 1_000_000
+
+
+class Tree:
+    """Search tree as parallel arrays indexed by node id, with children
+    in a linked list through `first_child`/`next_sibling`. A node costs
+    about 25 bytes."""
+
+    def __init__(self) -> None:
+        self.card = array("b", [-1])
+        self.first_child = array("i", [-1])
+        self.next_sibling = array("i", [-1])
+        self.visits = array("i", [0])
+        self.avail = array("i", [0])
+        self.reward = array("d", [0.0])
+        self.root = 0
+
+    def __len__(self) -> int:
+        return len(self.card)
+
+    def child(self, node: int, card: int) -> int:
+        child = self.first_child[node]
+        while child >= 0 and self.card[child] != card:
+            child = self.next_sibling[child]
+        return child
+
+    def add_child(self, node: int, card: int) -> int:
+        child = len(self.card)
+        self.card.append(card)
+        self.first_child.append(-1)
+        self.next_sibling.append(self.first_child[node])
+        self.visits.append(0)
+        self.avail.append(1)
+        self.reward.append(0.0)
+        self.first_child[node] = child
+        return child
+
+    def root_visits(self) -> dict[int, int]:
+        visits = {}
+        child = self.first_child[self.root]
+        while child >= 0:
+            visits[self.card[child]] = self.visits[child]
+            child = self.next_sibling[child]
+        return visits
+
+
+class Deal:
+    """One determinized deal played forward. Seats are offsets from the
+    searching player, who is 0; offsets 0 and 2 are our team (team 0)."""
+
+    __slots__ = ("hands", "cards", "leader", "trump", "points", "winners", "last_led")
+
+    def __init__(
+        self,
+        hands: list[list[Card]],
+        cards: list[Card],
+        leader: int,
+        trump: Suit,
+        winners: list[tuple[Card, int]],
+    ) -> None:
+        self.hands = hands
+        self.cards = cards
+        self.leader = leader
+        self.trump = trump
+        # (winning card, team) of every trick this round, including the
+        # ones finished before the deal starts; their points count too.
+        self.winners = winners
+        self.points = [0, 0]
+        for _, team in winners:
+            self.points[team] += TRICK_POINTS
+        self.last_led = None
+
+    def to_move(self) -> int:
+        return (self.leader + len(self.cards)) % 4
+
+    def over(self) -> bool:
+        return not self.cards and not self.hands[self.leader]
+
+    def legal(self) -> list[Card]:
+        hand = self.hands[self.to_move()]
+        return legal_moves(hand, self.cards[0], self.trump) if self.cards else hand
+
+    def play(self, card: Card) -> None:
+        self.hands[self.to_move()].remove(card)
+        self.cards.append(card)
+        if len(self.cards) == 4:
+            self.last_led = self.cards[0].suit
+            best = trick_winner(self.cards, self.last_led, self.trump)
+            self.leader = (self.leader + best) % 4
+            team = self.leader % 2
+            self.points[team] += TRICK_POINTS
+            self.winners.append((self.cards[best], team))
+            self.cards = []
+
+    def play_out(self) -> None:
+        while not self.over():
+            cards = self.cards
+            suit_led = cards[0].suit if cards else None
+            self.play(evaluate_hand_play(suit_led, self.legal(), cards, self.trump))
+
+    def result(self) -> list[int]:
+        """Points per team for the whole round, bonus included."""
+        points = list(self.points)
+        best = trick_winner([card for card, _ in self.winners], self.last_led, self.trump)
+        points[self.winners[best][1]] += TRICK_POINTS
+        return points
+
+
+def earlier_teams(
+    earlier: Sequence[Card], current_cards: Sequence[Card], trump: Suit
+) -> list[tuple[Card, int]]:
+    """`(winning card, team)` of the finished tricks in `earlier`, with our
+    team as 0. Raises ValueError unless `earlier` holds only whole tricks."""
+    leader = -len(current_cards) % 4
+    return [(card, seat % 2) for card, seat in earlier_winners(list(earlier), leader, trump)]
+
+
+# ── Play ────────────────────────────────────────────────────────────
+
+
+def search(
+    tree: Tree,
+    hand: list[Card],
+    current_cards: list[Card],
+    earlier: list[Card],
+    trump: Suit,
+    time_budget: float,
+    max_iterations: Optional[int],
+    rng: random.Random,
+) -> int:
+    """Grows `tree` from its root; returns the number of iterations."""
+    deadline = time.perf_counter() + time_budget
+    known = {c.index for c in hand} | {c.index for c in current_cards} | {c.index for c in earlier}
+    unseen = [card for card in DECK if card.index not in known]
+    # Players after us in this trick hold as many cards as we do, the
+    # ones who already played hold one fewer.
+    after = 3 - len(current_cards)
+    sizes = [len(hand)] * after + [len(hand) - 1] * len(current_cards)
+    winners = earlier_teams(earlier, current_cards, trump)
+    card_ids, first_child, next_sibling = tree.card, tree.first_child, tree.next_sibling
+    visits, avail, reward = tree.visits, tree.avail, tree.reward
+
+    iterations = 0
+    while max_iterations is None or iterations < max_iterations:
+        if iterations and time.perf_counter() >= deadline:
+            break
+        rng.shuffle(unseen)
+        hands, start = [list(hand)], 0
+        for size in sizes:
+            hands.append(unseen[start:start + size])
+            start += size
+        deal = Deal(hands, list(current_cards), -len(current_cards) % 4, trump, list(winners))
+
+        node, path = tree.root, []
+        while not deal.over():
+            team = deal.to_move() % 2
+            untried, best, best_card, best_score = [], -1, None, -1.0
+            for card in deal.legal():
+                child = first_child[node]
+                while child >= 0 and card_ids[child] != card.index:
+                    child = next_sibling[child]
+                if child < 0:
+                    untried.append(card)
+                    continue
+                avail[child] += 1
+                n = visits[child]
+                score = reward[child] / n + EXPLORATION * math.sqrt(math.log(avail[child]) / n)
+                if score > best_score:
+                    best, best_card, best_score = child, card, score
+            if untried:
+                card = rng.choice(untried)
+                node = tree.add_child(node, card.index)
+                deal.play(card)
+                path.append((node, team))
+                break
+            node = best
+            deal.play(best_card)
+            path.append((node, team))
+
+        deal.play_out()
+        points = deal.result()
+        visits[tree.root] += 1
+        for node, team in path:
+            visits[node] += 1
+            reward[node] += points[team] / MAX_POINTS
+        iterations += 1
+    return iterations
+
+
+def run_search(
+    hand: list[int],
+    current_cards: list[int],
+    earlier: list[int],
+    trump: Suit,
+    time_budget: float,
+    max_iterations: Optional[int],
+    seed: int,
+) -> dict[int, int]:
+    """A fresh search for a worker process. Takes card indices and returns
+    the root's visit counts by card index."""
+    tree = Tree()
+    search(
+        tree,
+        [DECK[i] for i in hand],
+        [DECK[i] for i in current_cards],
+        [DECK[i] for i in earlier],
+        trump,
+        time_budget,
+        max_iterations,
+        random.Random(seed),
+    )
+    return tree.root_visits()
+
+
+# ── Discard ─────────────────────────────────────────────────────────
+
+
+def keep_candidates(hand: list[Card], trump: Suit) -> list[list[Card]]:
+    trumps = [c for c in hand if c.suit == trump or is_ace_of_hearts(c)]
+    if len(trumps) >= HAND_SIZE:
+        return [list(keep) for keep in combinations(trumps, HAND_SIZE)]
+    others = [c for c in hand if not (c.suit == trump or is_ace_of_hearts(c))]
+    return [
+        trumps + list(extra)
+        for k in range(HAND_SIZE - len(trumps) + 1)
+        for extra in combinations(others, k)
+        if trumps or extra
+    ]
+
+
+def evaluate_keep(
+    keep: list[Card], hand: list[Card], trump: Suit, rng: random.Random
+) -> float:
+    """Our team's share of the round's points after keeping `keep`, in one
+    random deal of the unknown cards."""
+    in_hand = {c.index for c in hand}
+    unknown = [card for card in DECK if card.index not in in_hand]
+    rng.shuffle(unknown)
+    hands, start = [list(keep)], 0
+    for _ in range(3):
+        hands.append(choose_discard(unknown[start:start + HAND_SIZE], trump))
+        start += HAND_SIZE
+    deck = unknown[start:]
+    for h in hands:
+        h.extend(deck.pop() for _ in range(HAND_SIZE - len(h)))
+    # The bidder took the kitty and leads; otherwise the bidder is unknown.
+    leader = 0 if len(hand) > HAND_SIZE else rng.randrange(1, 4)
+    deal = Deal(hands, [], leader, trump, [])
+    deal.play_out()
+    return deal.result()[0] / MAX_POINTS
+
+
+def _check_limits(time_budget: float, max_iterations: Optional[int]) -> None:
+    if math.isinf(time_budget) and max_iterations is None:
+        raise ValueError("An unlimited time budget needs max_iterations")
+
+
+def choose_keep(
+    hand: list[Card],
+    trump: Suit,
+    time_budget: float = math.inf,
+    max_iterations: Optional[int] = DEFAULT_MAX_ITERATIONS,
+    rng: Optional[random.Random] = None,
+) -> list[Card]:
+    """The cards to keep from `hand`, by UCB1 over the keep candidates."""
+    _check_limits(time_budget, max_iterations)
+    rng = rng or random.Random()
+    candidates = keep_candidates(hand, trump)
+    if len(candidates) == 1:
+        return candidates[0]
+    deadline = time.perf_counter() + time_budget
+    pulls = [0] * len(candidates)
+    totals = [0.0] * len(candidates)
+    iterations = 0
+    while max_iterations is None or iterations < max_iterations:
+        if iterations >= len(candidates) and time.perf_counter() >= deadline:
+            break
+        if iterations < len(candidates):
+            i = iterations
+        else:
+            log_n = math.log(iterations)
+            i = max(
+                range(len(candidates)),
+                key=lambda j: totals[j] / pulls[j] + EXPLORATION * math.sqrt(log_n / pulls[j]),
+            )
+        totals[i] += evaluate_keep(candidates[i], hand, trump, rng)
+        pulls[i] += 1
+        iterations += 1
+    return candidates[max(range(len(candidates)), key=pulls.__getitem__)]
+
+
+# ── Engine ──────────────────────────────────────────────────────────
+
+
+class ISMCTS:
+    """Keeps the play tree between the decisions of one hand."""
+
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        time_budget: float = math.inf,
+        max_iterations: Optional[int] = DEFAULT_MAX_ITERATIONS,
+        workers: int = 1,
+        pool: Optional[Executor] = None,
+    ) -> None:
+        _check_limits(time_budget, max_iterations)
+        self.rng = rng or random.Random()
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.workers = workers
+        self.pool = pool
+        self.tree: Optional[Tree] = None
+        # Card indices played this round up to and including our last card.
+        self.history: tuple[int, ...] = ()
+        self.reused = 0
+
+    def _reroot(self, history: tuple[int, ...]) -> None:
+        """Moves the root down the cards played since our last decision,
+        or starts a new tree if they are not in it."""
+        tree = self.tree
+        if tree is not None and history[:len(self.history)] == self.history and len(tree) < MAX_NODES:
+            node = tree.root
+            for card in history[len(self.history):]:
+                node = tree.child(node, card)
+                if node < 0:
+                    break
+            else:
+                tree.root = node
+                self.reused += 1
+                return
+        self.tree = Tree()
+
+    def choose_card(
+        self,
+        hand: list[Card],
+        legal: list[Card],
+        current_cards: list[Card],
+        trump: Suit,
+        seen: Sequence[Card] = (),
+    ) -> Card:
+        """`hand` is the full hand and `seen` the cards of earlier tricks
+        this round in play order (cards of the current trick are ignored).
+        Raises ValueError if `seen` has a partial earlier trick."""
+        if len(legal) == 1:
+            self.tree = None
+            return legal[0]
+        in_trick = {c.index for c in current_cards}
+        earlier = [c for c in seen if c.index not in in_trick]
+        # Fail before touching the tree.
+        earlier_teams(earlier, current_cards, trump)
+        history = tuple(c.index for c in earlier) + tuple(c.index for c in current_cards)
+
+        if self.workers <= 1:
+            self._reroot(history)
+            search(
+                self.tree, hand, list(current_cards), earlier, trump,
+                self.time_budget, self.max_iterations, self.rng,
+            )
+            visits = self.tree.root_visits()
+        else:
+            self.tree = None
+            visits = self._search_parallel(hand, current_cards, earlier, trump)
+
+        card = max(legal, key=lambda c: visits.get(c.index, -1))
+        if self.tree is not None:
+            node = self.tree.child(self.tree.root, card.index)
+            if node >= 0:
+                self.tree.root = node
+                self.history = history + (card.index,)
+            else:
+                self.tree = None
+        return card
+
+    def _search_parallel(self, hand, current_cards, earlier, trump) -> dict[int, int]:
+        share = None if self.max_iterations is None else -(-self.max_iterations // self.workers)
+        args = (
+            [c.index for c in hand],
+            [c.index for c in current_cards],
+            [c.index for c in earlier],
+            trump,
+            self.time_budget,
+            share,
+        )
+        owned = self.pool is None
+        pool = self.pool or ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            futures = [
+                pool.submit(run_search, *args, self.rng.getrandbits(64))
+                for _ in range(self.workers)
+            ]
+            visits: dict[int, int] = {}
+            for future in futures:
+                for card, count in future.result().items():
+                    visits[card] = visits.get(card, 0) + count
+        finally:
+            if owned:
+                pool.shutdown()
+        return visits
+
+    def choose_keep(self, hand: list[Card], trump: Suit) -> list[Card]:
+        return choose_keep(hand, trump, self.time_budget, self.max_iterations, self.rng)
+
+
+class ISMCTSStrategy:
+    """Bids like tbot; discards and plays by ISMCTS."""
+
+    name = "ismcts"
+
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        time_budget: float = math.inf,
+        max_iterations: Optional[int] = DEFAULT_MAX_ITERATIONS,
+    ) -> None:
+        self.engine = ISMCTS(rng, time_budget, max_iterations)
+        self.fallback = TbotStrategy()
+
+    def bid(self, hand, max_bid, bagged):
+        return self.fallback.bid(hand, max_bid, bagged)
+
+    def discard(self, hand, trump):
+        return self.engine.choose_keep(hand, trump)
+
+    def play(self, suit_led, legal, current_cards, trump, hand=None, seen=()) -> Card:
+        if hand is None:
+            return self.fallback.play(suit_led, legal, current_cards, trump)
+        return self.engine.choose_card(hand, legal, current_cards, trump, seen)
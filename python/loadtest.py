@@ -0,0 +1,219 @@
+"""Load generator for the game server: many browser-free players at once.
+
+Starts `--players` LiveView bots (`lvclient.LiveBot`) on an arrival profile,
+lets each queue up and play one game, and reports latency percentiles for
+every stage a player goes through:
+
+    queue_join  page load, LiveView join and queue acknowledgement
+    match       queue acknowledgement until the game page is joined
+    bid         bid events until the turn moves on
+    discard     confirm_discard until the server acknowledges it
+    play        play-card until the turn moves on
+    game        game page joined until Final Scoring
+
+Per-window numbers next to the count of players online show where
+matchmaking and the game processes start to saturate:
+
+    python loadtest.py --players 400 --profile ramp --duration 120 --processes 4 --json load.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from lvclient import SEARCH_BUDGET, LiveBot
+from tournament import make_strategy
+
+PROFILES = ("burst", "uniform", "ramp", "poisson")
+ACTIONS = ("queue_join", "match", "bid", "discard", "play", "game")
+PERCENTILES = (50, 95, 99)
+
+
+def arrival_offsets(profile: str, players: int, duration: float, rng: random.Random) -> list[float]:
+    """Seconds after the start at which each player arrives."""
+    if profile == "burst":
+        return [0.0] * players
+    if profile == "uniform":
+        return [duration * i / players for i in range(players)]
+    if profile == "ramp":
+        # The arrival rate grows linearly and peaks at `duration`.
+        return [duration * math.sqrt(i / players) for i in range(players)]
+    if profile == "poisson":
+        offsets, t = [], 0.0
+        for _ in range(players):
+            offsets.append(t)
+            t += rng.expovariate(players / duration) if duration > 0 else 0.0
+        return offsets
+    raise ValueError(f"Unknown arrival profile {profile!r}; use one of {PROFILES}")
+
+
+@dataclass
+class PlayerResult:
+    instance: int
+    arrived: float
+    ended: float
+    samples: list[tuple[str, float, float]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+# ── Running players ─────────────────────────────────────────────────
+
+
+async def run_player(url: str, strategy: str, instance: int, arrive_at: float, seed: int) -> PlayerResult:
+    await asyncio.sleep(max(arrive_at - time.time(), 0))
+    arrived = time.time()
+    bot_strategy = make_strategy(strategy, random.Random(seed), SEARCH_BUDGET)
+    bot = LiveBot(url, bot_strategy, str(instance), quiet=True)
+    error = None
+    try:
+        await bot.run()
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    return PlayerResult(instance, arrived, time.time(), bot.samples, error)
+
+
+def run_shard(url: str, strategy: str, arrivals: list[tuple[int, float]], seed: int) -> list[PlayerResult]:
+    """Runs one process's share of the players in a single event loop."""
+
+    async def run_all():
+        return await asyncio.gather(*(
+            run_player(url, strategy, instance, arrive_at, seed * 1_000_003 + instance)
+            for instance, arrive_at in arrivals
+        ))
+
+    return asyncio.run(run_all())
+
+
+# ── Reporting ───────────────────────────────────────────────────────
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted `values`."""
+    if not values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def latency_summary(values: list[float]) -> dict:
+    values = sorted(values)
+    summary = {"count": len(values)}
+    for q in PERCENTILES:
+        summary[f"p{q}"] = percentile(values, q)
+    summary["max"] = values[-1] if values else 0.0
+    return summary
+
+
+def summarize(results: list[PlayerResult], start: float, window: float) -> dict:
+    by_action: dict[str, list[float]] = {action: [] for action in ACTIONS}
+    for result in results:
+        for action, _, seconds in result.samples:
+            by_action.setdefault(action, []).append(seconds)
+
+    end = max((result.ended for result in results), default=start)
+    windows = []
+    for i in range(max(math.ceil((end - start) / window), 1)):
+        low, high = start + i * window, start + (i + 1) * window
+        in_window = [
+            (action, seconds)
+            for result in results
+            for action, started, seconds in result.samples
+            if low <= started < high
+        ]
+        windows.append({
+            "start": i * window,
+            "online": sum(1 for r in results if r.arrived < high and r.ended >= low),
+            "arrivals": sum(1 for r in results if low <= r.arrived < high),
+            "actions_per_s": len(in_window) / window,
+            **{
+                f"{action}_p95": percentile(sorted(s for a, s in in_window if a == action), 95)
+                for action in ("queue_join", "match", "bid", "play")
+            },
+        })
+
+    failed = [result for result in results if result.error]
+    return {
+        "players": len(results),
+        "finished": len(results) - len(failed),
+        "failed": len(failed),
+        "errors": Counter(result.error.split(":")[0] for result in failed).most_common(),
+        "duration": end - start,
+        "latency": {action: latency_summary(values) for action, values in by_action.items()},
+        "windows": windows,
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{report['finished']}/{report['players']} players finished in {report['duration']:.1f}s"
+        + (f", {report['failed']} failed: {report['errors']}" if report["failed"] else ""),
+        f"{'action':<12}{'count':>8}" + "".join(f"{f'p{q}':>9}" for q in PERCENTILES) + f"{'max':>9}",
+    ]
+    for action, summary in report["latency"].items():
+        lines.append(
+            f"{action:<12}{summary['count']:>8}"
+            + "".join(f"{summary[f'p{q}']:>9.3f}" for q in PERCENTILES)
+            + f"{summary['max']:>9.3f}"
+        )
+    lines.append(f"{'window':>8}{'online':>8}{'arrive':>8}{'act/s':>8}{'bid p95':>9}{'play p95':>9}")
+    for w in report["windows"]:
+        lines.append(
+            f"{w['start']:>7.0f}s{w['online']:>8}{w['arrivals']:>8}{w['actions_per_s']:>8.1f}"
+            f"{w['bid_p95']:>9.3f}{w['play_p95']:>9.3f}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the 45s server with browser-free bots.")
+    parser.add_argument("--url", default=os.getenv("APP_BASE_URL", "http://localhost:4000/play"))
+    parser.add_argument("--players", type=int, default=40)
+    parser.add_argument("--profile", choices=PROFILES, default="uniform")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds over which players arrive")
+    parser.add_argument("--strategy", default="tbot")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--window", type=float, default=10.0, help="seconds per report window")
+    parser.add_argument("--json", default=None, help="write the report and raw samples here")
+    parser.add_argument("--max-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    if args.players % 4:
+        parser.error("--players must be a multiple of 4 so every queued player gets a game")
+
+    offsets = arrival_offsets(args.profile, args.players, args.duration, random.Random(args.seed))
+    # Leave the worker processes time to start before the first arrival.
+    start = time.time() + 1.0
+    shards = [[] for _ in range(args.processes)]
+    for instance, offset in enumerate(offsets):
+        shards[instance % args.processes].append((instance, start + offset))
+
+    if args.processes == 1:
+        results = run_shard(args.url, args.strategy, shards[0], args.seed)
+    else:
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            futures = [
+                pool.submit(run_shard, args.url, args.strategy, shard, args.seed) for shard in shards
+            ]
+            results = [result for future in futures for result in future.result()]
+
+    report = summarize(results, start, args.window)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**report, "args": vars(args), "results": [asdict(r) for r in results]}, f)
+
+    if report["failed"] > args.max_error_rate * report["players"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
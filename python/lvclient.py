@@ -0,0 +1,704 @@
+"""Browser-free bot client for the Phoenix LiveView websocket protocol.
+
+`tbot.py` drives a headless Chrome per bot. This speaks the protocol the
+page's LiveSocket speaks instead: it fetches a page over HTTP for the
+session cookie, CSRF token and signed LiveView session, joins the view's
+channel on `/live/websocket`, keeps the rendered tree up to date from the
+diffs the server pushes, and pushes the same events as the page's buttons
+and hooks. A bot is a coroutine and a few kilobytes of state, so hundreds
+of them fit in one process:
+
+    python lvclient.py --url http://localhost:4000/play --bots 200
+"""
+
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+import os
+import random
+import time
+from html.parser import HTMLParser
+from typing import Callable, Optional
+from urllib.parse import urlencode, urljoin, urlsplit
+
+import requests
+from websockets.asyncio.client import ClientConnection, connect
+
+from card import Suit, Card
+from gameview import GameView, card_value, parse_game_view
+from rules import HAND_SIZE
+from sim import play_card
+from tournament import make_strategy
+
+LV_VSN = "2.0.0"
+HEARTBEAT_INTERVAL = 30
+ACTION_TIMEOUT = 20
+MATCH_TIMEOUT = 180
+PHASE_TIMEOUT = 180
+GAME_TIMEOUT = 900
+# Seconds a search strategy may think per decision, well inside ACTION_TIMEOUT.
+SEARCH_BUDGET = float(os.getenv("TBOT_SEARCH_BUDGET", "1.0"))
+
+# Keys of the rendered diff format (see LiveView's rendered.js).
+STATIC = "s"
+DYNAMICS = "d"
+KEYED = "k"
+KEYED_COUNT = "kc"
+COMPONENTS = "c"
+TEMPLATES = "p"
+STREAM = "stream"
+EVENTS = "e"
+TITLE = "t"
+
+
+# ── Rendered tree ───────────────────────────────────────────────────
+
+
+def _resolve_templates(node, templates: dict) -> None:
+    """Replaces `"s": <int>` references to shared templates with the statics
+    themselves, so merging and rendering never need the templates again."""
+    if isinstance(node, list):
+        for item in node:
+            _resolve_templates(item, templates)
+        return
+    if not isinstance(node, dict):
+        return
+    if TEMPLATES in node:
+        templates = {**templates, **node.pop(TEMPLATES)}
+    if isinstance(node.get(STATIC), int):
+        node[STATIC] = templates[str(node[STATIC])]
+    for key, value in node.items():
+        if key not in (STATIC, STREAM):
+            _resolve_templates(value, templates)
+
+
+class Rendered:
+    """The client-side copy of a view's rendered tree. Statics arrive once;
+    later diffs only carry the dynamics that changed."""
+
+    def __init__(self, rendered: dict) -> None:
+        self.tree: dict = {}
+        self.components: dict[str, dict] = {}
+        # Stream items by stream ref and DOM id, already rendered. Like the
+        # DOM, they persist across diffs that don't touch the stream.
+        self.streams: dict[str, dict[str, str]] = {}
+        self.merge(rendered)
+
+    def merge(self, diff: dict) -> None:
+        diff.pop(EVENTS, None)
+        diff.pop(TITLE, None)
+        components = diff.pop(COMPONENTS, None)
+        if components:
+            self._merge_components(components)
+        _resolve_templates(diff, {})
+        self._merge(self.tree, diff)
+
+    def _merge(self, target: dict, source: dict) -> None:
+        for key, value in source.items():
+            current = target.get(key)
+            if isinstance(value, dict) and isinstance(current, dict) and STATIC not in value:
+                if KEYED in value:
+                    target[key] = self._merge_keyed(current, value)
+                else:
+                    self._merge(current, value)
+                if STREAM in value:
+                    self._apply_stream(target[key], value[STREAM])
+            else:
+                target[key] = value
+                self._find_streams(value)
+
+    def _find_streams(self, node) -> None:
+        """Applies the stream operations in a newly assigned subtree."""
+        if not isinstance(node, dict):
+            return
+        if STREAM in node:
+            self._apply_stream(node, node[STREAM])
+        for key, value in node.items():
+            if key not in (STATIC, STREAM):
+                self._find_streams(value)
+
+    def _merge_keyed(self, target: dict, source: dict) -> dict:
+        old, entries = target[KEYED], source[KEYED]
+        count = entries[KEYED_COUNT]
+        merged = {KEYED_COUNT: count}
+        for i in map(str, range(count)):
+            entry = entries.get(i)
+            if entry is None:
+                merged[i] = old[i]
+            elif isinstance(entry, int):
+                # Moved from another position, unchanged.
+                merged[i] = old[str(entry)]
+            elif isinstance(entry, list):
+                # Moved from another position and changed.
+                old_i, entry_diff = entry
+                merged[i] = copy.deepcopy(old[str(old_i)])
+                self._merge(merged[i], entry_diff)
+            else:
+                merged[i] = copy.deepcopy(old[i]) if i in old else {}
+                self._merge(merged[i], entry)
+        result = {**target, **source}
+        result[KEYED] = merged
+        return result
+
+    def _merge_components(self, diffs: dict) -> None:
+        resolved: dict[str, dict] = {}
+
+        def find(cid: str) -> dict:
+            if cid in resolved:
+                return resolved[cid]
+            cdiff = diffs[cid]
+            shared = cdiff.get(STATIC)
+            if isinstance(shared, int):
+                # Statics shared with another component: a positive cid is
+                # in this diff, a negative one is from an earlier render.
+                base = find(str(shared)) if shared > 0 else self.components[str(-shared)]
+                cdiff = {k: v for k, v in cdiff.items() if k != STATIC}
+                _resolve_templates(cdiff, {})
+                node = copy.deepcopy(base)
+                self._merge(node, cdiff)
+                node[STATIC] = base[STATIC]
+            else:
+                _resolve_templates(cdiff, {})
+                if STATIC in cdiff or cid not in self.components:
+                    node = cdiff
+                else:
+                    node = copy.deepcopy(self.components[cid])
+                    self._merge(node, cdiff)
+            resolved[cid] = node
+            return node
+
+        for cid in diffs:
+            find(cid)
+        self.components.update(resolved)
+
+    def _apply_stream(self, node: dict, stream: list) -> None:
+        ref, inserts, deletes = stream[0], stream[1], stream[2]
+        reset = len(stream) > 3 and stream[3]
+        items = self.streams.setdefault(ref, {})
+        if reset:
+            items.clear()
+        for dom_id in deletes:
+            items.pop(dom_id, None)
+        for insert, html in zip(inserts, self._render_rows(node)):
+            dom_id, at = insert[0], insert[1]
+            if at == 0:
+                items.pop(dom_id, None)
+                self.streams[ref] = items = {dom_id: html, **items}
+            else:
+                items[dom_id] = html
+
+    # ── Rendering ───────────────────────────────────────────────────
+
+    def to_html(self) -> str:
+        out: list[str] = []
+        self._render(self.tree, out)
+        return "".join(out)
+
+    def _render(self, node: dict, out: list[str]) -> None:
+        if STREAM in node:
+            out.extend(self.streams.get(node[STREAM][0], {}).values())
+        elif KEYED in node or DYNAMICS in node:
+            out.extend(self._render_rows(node))
+        else:
+            self._render_parts(node[STATIC], node, out)
+
+    def _render_rows(self, node: dict) -> list[str]:
+        statics = node[STATIC]
+        if KEYED in node:
+            keyed = node[KEYED]
+            rows = (keyed[str(i)] for i in range(keyed[KEYED_COUNT]))
+        else:
+            rows = (dict(zip(map(str, range(len(row))), row)) for row in node[DYNAMICS])
+        html = []
+        for row in rows:
+            out: list[str] = []
+            self._render_parts(statics, row, out)
+            html.append("".join(out))
+        return html
+
+    def _render_parts(self, statics: list[str], values: dict, out: list[str]) -> None:
+        out.append(statics[0])
+        for i in range(1, len(statics)):
+            value = values.get(str(i - 1))
+            if isinstance(value, dict):
+                self._render(value, out)
+            elif isinstance(value, int):
+                self._render(self.components[str(value)], out)
+            elif value is not None:
+                out.append(value)
+            out.append(statics[i])
+
+
+# ── Page bootstrap ──────────────────────────────────────────────────
+
+
+class _PageParser(HTMLParser):
+    """Finds the CSRF token and the main LiveView's id, session and static
+    tokens in a dead (HTTP) render."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.csrf_token = None
+        self.main = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "meta" and attrs.get("name") == "csrf-token":
+            self.csrf_token = attrs.get("content")
+        elif "data-phx-main" in attrs and self.main is None:
+            self.main = attrs
+
+
+# ── Client ──────────────────────────────────────────────────────────
+
+
+class LiveViewClient:
+    """One browser tab's worth of LiveView: an HTTP session holding the
+    cookie and a websocket with one joined view at a time."""
+
+    def __init__(self, log: Callable[[str], None] = print) -> None:
+        self.log = log
+        self.http = requests.Session()
+        self.ws: Optional[ClientConnection] = None
+        self.url: Optional[str] = None
+        self.topic: Optional[str] = None
+        self.join_ref: Optional[str] = None
+        self.refs = itertools.count(1)
+        self.replies: dict[str, asyncio.Future] = {}
+        self.rendered: Optional[Rendered] = None
+        # Set when the server navigates us away; the owner decides when to
+        # follow it.
+        self.redirect: Optional[str] = None
+        self.tasks: list[asyncio.Task] = []
+        self.closed = False
+        self._changed = asyncio.Event()
+        self._version = 0
+        self._view = GameView()
+        self._view_version = 0
+
+    @property
+    def view(self) -> GameView:
+        """The current page state, parsed at most once per applied diff."""
+        if self._view_version != self._version:
+            self._view = parse_game_view(self.rendered.to_html()) if self.rendered else GameView()
+            self._view_version = self._version
+        return self._view
+
+    async def open(self, url: str) -> None:
+        """Loads `url` and joins its LiveView, leaving the current one."""
+        response = await asyncio.to_thread(self.http.get, url, timeout=ACTION_TIMEOUT)
+        response.raise_for_status()
+        page = _PageParser()
+        page.feed(response.text)
+        if page.main is None or page.csrf_token is None:
+            raise RuntimeError(f"{response.url} is not a LiveView page")
+
+        if self.ws is None:
+            await self._connect(response.url, page.csrf_token)
+        if self.topic is not None:
+            old_topic, self.topic = self.topic, None
+            await self.send(old_topic, "phx_leave", {})
+
+        self.url = response.url
+        self.redirect = None
+        self.rendered = None
+        self.join_ref = str(next(self.refs))
+        topic = f"lv:{page.main['id']}"
+        reply = await self.call(topic, "phx_join", {
+            "url": self.url,
+            "params": {
+                "_csrf_token": page.csrf_token,
+                "_track_static": [],
+                "_mounts": 0,
+                "_mount_attempts": 0,
+            },
+            "session": page.main.get("data-phx-session"),
+            "static": page.main.get("data-phx-static"),
+            "sticky": False,
+        }, join_ref=self.join_ref)
+
+        body = reply.get("response") or {}
+        target = body.get("live_redirect") or body.get("redirect")
+        if target:
+            self.redirect = target["to"]
+        elif reply.get("status") == "ok":
+            self.topic = topic
+            self.rendered = Rendered(body["rendered"])
+            self._version += 1
+            self._notify()
+        else:
+            raise RuntimeError(f"Join of {self.url} failed: {body}")
+
+    async def follow_redirect(self) -> None:
+        await self.open(urljoin(self.url, self.redirect))
+
+    async def _connect(self, url: str, csrf_token: str) -> None:
+        parts = urlsplit(url)
+        scheme = "wss" if parts.scheme == "https" else "ws"
+        query = urlencode({"_csrf_token": csrf_token, "vsn": LV_VSN})
+        cookie = "; ".join(f"{name}={value}" for name, value in self.http.cookies.items())
+        self.ws = await connect(
+            f"{scheme}://{parts.netloc}/live/websocket?{query}",
+            origin=f"{parts.scheme}://{parts.netloc}",
+            additional_headers={"Cookie": cookie},
+            max_size=None,
+        )
+        self.tasks = [asyncio.create_task(self._read()), asyncio.create_task(self._heartbeat())]
+
+    async def close(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        if self.ws is not None:
+            await self.ws.close()
+            self.ws = None
+
+    # ── Messages ────────────────────────────────────────────────────
+
+    async def send(
+        self, topic: str, event: str, payload: dict, join_ref: Optional[str] = None
+    ) -> str:
+        """Sends a message without waiting for the reply; returns its ref."""
+        ref = str(next(self.refs))
+        await self.ws.send(json.dumps([join_ref or self.join_ref, ref, topic, event, payload]))
+        return ref
+
+    async def call(self, topic: str, event: str, payload: dict, join_ref: Optional[str] = None) -> dict:
+        """Sends a message and waits for its `phx_reply` payload."""
+        ref = str(next(self.refs))
+        future = asyncio.get_running_loop().create_future()
+        self.replies[ref] = future
+        try:
+            await self.ws.send(json.dumps([join_ref or self.join_ref, ref, topic, event, payload]))
+            return await asyncio.wait_for(future, ACTION_TIMEOUT)
+        finally:
+            self.replies.pop(ref, None)
+
+    async def push(self, kind: str, event: str, value) -> dict:
+        return await self.call(self.topic, "event", {"type": kind, "event": event, "value": value})
+
+    async def click(self, event: str, values: Optional[dict] = None) -> dict:
+        """A `phx-click`; `values` are the element's `phx-value-*` attributes."""
+        return await self.push("click", event, values or {})
+
+    async def submit(self, event: str, form: str = "") -> dict:
+        """A `phx-submit` with the url-encoded form data."""
+        return await self.push("form", event, form)
+
+    async def hook(self, event: str, payload: dict) -> dict:
+        """A `pushEvent` from a JS hook."""
+        return await self.push("hook", event, payload)
+
+    async def _read(self) -> None:
+        try:
+            async for raw in self.ws:
+                _, ref, topic, event, payload = json.loads(raw)
+                self._handle(ref, topic, event, payload)
+        finally:
+            self.closed = True
+            for future in self.replies.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("LiveView socket closed"))
+            self._notify()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            await self.send("phoenix", "heartbeat", {})
+
+    def _handle(self, ref: Optional[str], topic: str, event: str, payload: dict) -> None:
+        current = topic == self.topic
+        if event == "phx_reply":
+            body = payload.get("response") or {}
+            if current and "diff" in body:
+                self._apply(body["diff"])
+            target = body.get("live_redirect") or body.get("redirect")
+            if current and target:
+                self.redirect = target["to"]
+                self._notify()
+            future = self.replies.get(ref)
+            if future is not None and not future.done():
+                future.set_result(payload)
+        elif not current:
+            return
+        elif event == "diff":
+            self._apply(payload)
+        elif event in ("live_redirect", "redirect"):
+            self.redirect = payload["to"]
+            self._notify()
+        elif event in ("phx_error", "phx_close"):
+            # The view process died or was shut down; the browser would
+            # rejoin, so reload the same page.
+            self.log(f"View {topic} closed ({event}); rejoining.")
+            self.topic = None
+            self.redirect = self.url
+            self._notify()
+
+    def _apply(self, diff: dict) -> None:
+        self.rendered.merge(diff)
+        self._version += 1
+        self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_until(self, predicate: Callable[[], bool], timeout: float, description: str) -> None:
+        """Waits for `predicate` to hold, re-checking it after every change
+        the server pushes instead of polling."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not predicate():
+            remaining = deadline - loop.time()
+            if remaining <= 0 or self.closed:
+                raise TimeoutError(f"Timed out: {description}")
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except TimeoutError:
+                raise TimeoutError(f"Timed out: {description}") from None
+
+    async def wait_for_change(self, timeout: float, description: str) -> None:
+        version = self._version
+        await self.wait_until(
+            lambda: self._version != version or self.redirect is not None, timeout, description
+        )
+
+
+# ── Bot ─────────────────────────────────────────────────────────────
+
+
+class LiveBot:
+    """Plays one game through a `LiveViewClient` with the decisions of a
+    `sim`-style strategy (`bid`/`discard`/`play`)."""
+
+    def __init__(self, url: str, strategy, instance: str = "0", quiet: bool = False) -> None:
+        self.url = url
+        self.strategy = strategy
+        self.instance = instance
+        self.quiet = quiet
+        self.client = LiveViewClient(log=self.log)
+        # The cards of this round's tricks as last seen on the table, by
+        # trick number, and the cards we played this round.
+        self.tricks: dict[int, list[Card]] = {}
+        self.played: set[int] = set()
+        # (action, wall-clock start, seconds until the server accepted it)
+        self.samples: list[tuple[str, float, float]] = []
+
+    def log(self, msg: str) -> None:
+        if not self.quiet:
+            print(f"[lvbot {self.instance}] {msg}", flush=True)
+
+    def record(self, action: str, started: float) -> None:
+        self.samples.append((action, started, time.time() - started))
+
+    async def run(self) -> None:
+        try:
+            await self.join_queue()
+            await self.play_game()
+        finally:
+            await self.client.close()
+
+    # ── Join queue and wait for game ────────────────────────────────
+
+    async def join_queue(self) -> None:
+        client = self.client
+        start = time.time()
+        await client.open(self.url)
+        await client.wait_until(lambda: client.view.queue_ready, ACTION_TIMEOUT, "queue page")
+
+        await client.submit("join")
+        await client.wait_until(
+            lambda: client.redirect is not None or client.view.in_queue,
+            ACTION_TIMEOUT,
+            "queue join acknowledgement",
+        )
+        self.record("queue_join", start)
+
+        joined = time.time()
+        await client.wait_until(lambda: client.redirect is not None, MATCH_TIMEOUT, "matchmaking redirect")
+        await client.follow_redirect()
+        await client.wait_until(lambda: client.view.in_game, ACTION_TIMEOUT, "game page load")
+        self.record("match", joined)
+        self.log(f"Redirected to {client.url}")
+
+    # ── Game loop ───────────────────────────────────────────────────
+
+    async def play_game(self) -> None:
+        client = self.client
+        start = time.time()
+        deadline = start + GAME_TIMEOUT
+
+        while time.time() < deadline:
+            if client.redirect is not None:
+                if "/game/" not in client.redirect:
+                    raise RuntimeError(f"Sent away from the game to {client.redirect}")
+                await client.follow_redirect()
+                continue
+
+            view = client.view
+            if view.phase == "Final Scoring":
+                self.record("game", start)
+                self.log("Final Scoring detected. Exiting the game.")
+                return
+
+            if not await self.act(view):
+                await client.wait_for_change(PHASE_TIMEOUT, f"state change in phase {view.phase!r}")
+
+        raise TimeoutError("Total runtime timeout exceeded.")
+
+    async def act(self, view: GameView) -> bool:
+        """Takes the action `view` calls for, if any, and waits for the
+        server to accept it. Returns whether it acted."""
+        client = self.client
+
+        if view.auto_playing:
+            await client.click("resume_control")
+            await client.wait_until(
+                lambda: not client.view.auto_playing, ACTION_TIMEOUT, "manual control resume"
+            )
+            self.log("Resumed manual control.")
+            return True
+
+        if view.phase == "Bidding":
+            self.tricks.clear()
+            self.played.clear()
+            if not view.my_turn:
+                return False
+            bid, suit = self.strategy.bid(view.hand, view.current_bid, view.bagged)
+            start = time.time()
+            await self.place_bid(bid, suit)
+            await client.wait_until(
+                lambda: client.view.phase != "Bidding" or not client.view.my_turn,
+                ACTION_TIMEOUT,
+                "bid acceptance",
+            )
+            self.record("bid", start)
+            return True
+
+        if view.phase == "Discard":
+            if view.confirm_discard_clicked:
+                return False
+            keep = self.strategy.discard(view.hand, view.trump)
+            self.log(f"Keeping cards: {keep}")
+            start = time.time()
+            await client.hook("confirm_discard", {"cards": [card_value(card) for card in keep]})
+            self.record("discard", start)
+            # Wait for the phase to end rather than for the confirmation flag,
+            # which a concurrent update can briefly reset.
+            await client.wait_until(
+                lambda: client.view.phase != "Discard" or client.redirect is not None,
+                PHASE_TIMEOUT,
+                "discard phase to end",
+            )
+            return True
+
+        if view.phase == "Playing":
+            self.observe_table(view)
+            if not view.my_turn:
+                return False
+            if not view.playable:
+                raise RuntimeError("No legal cards available on my turn.")
+            if view.trump is None:
+                raise RuntimeError("Trump suit is missing during playing phase.")
+
+            card = play_card(
+                self.strategy, view.suit_led, view.playable, view.table, view.trump,
+                view.hand, self.earlier_cards(view),
+            )
+            self.played.add(card.index)
+            start = time.time()
+            await client.hook("play-card", {"cards": [card_value(card)]})
+            await client.wait_until(
+                lambda: client.view.phase != "Playing" or not client.view.my_turn,
+                ACTION_TIMEOUT,
+                "played card acceptance",
+            )
+            self.record("play", start)
+            return True
+
+        return False
+
+    def observe_table(self, view: GameView) -> None:
+        """Remembers the cards on the table under their trick's number, as
+        `tbot.PhxWeb.observe_table` does. Several pushed diffs can arrive
+        between wakes, so a trick may be seen only in part or not at all."""
+        if not view.table:
+            return
+        ours_down = any(card.index in self.played for card in view.table)
+        trick = HAND_SIZE - len(view.hand) - ours_down
+        if len(view.table) >= len(self.tricks.get(trick, ())):
+            self.tricks[trick] = list(view.table)
+
+    def earlier_cards(self, view: GameView) -> list[Card]:
+        """The cards of the finished tricks in play order, from the first
+        whole trick after the last one not seen in full."""
+        finished = HAND_SIZE - len(view.hand)
+        first = finished
+        while first > 0 and len(self.tricks.get(first - 1, ())) == 4:
+            first -= 1
+        if first > 0:
+            self.log(f"Missed the end of trick {first} of {finished}; "
+                     f"searching with tricks {first + 1}-{finished} only.")
+        return [card for trick in range(first, finished) for card in self.tricks[trick]]
+
+    async def place_bid(self, bid: int, suit: Suit) -> None:
+        if bid == 0 or suit == Suit.PASS:
+            await self.client.click("set_bid_pass", {"bid-number": "0", "bid-suit": "pass"})
+            self.log("Passed the bid.")
+            return
+        await self.client.click("set_bid_number", {"bid-number": str(bid)})
+        await self.client.click("set_bid_suit", {"bid-suit": suit.long_name()})
+        await self.client.click("confirm_bid")
+        self.log(f"Placed bid {bid} {suit.long_name()}.")
+
+
+async def run_bots(
+    url: str, bots: int, strategy: str, seed: Optional[int], stagger: float, time_budget: float
+) -> list:
+    """Runs `bots` bots concurrently; returns each bot's samples or error."""
+    rng = random.Random(seed)
+
+    async def run_one(i: int):
+        await asyncio.sleep(i * stagger)
+        bot_strategy = make_strategy(strategy, random.Random(rng.getrandbits(64)), time_budget)
+        bot = LiveBot(url, bot_strategy, str(i))
+        try:
+            await bot.run()
+        except Exception as error:
+            bot.log(f"Run failed: {error!r}")
+            raise
+        return bot.samples
+
+    return await asyncio.gather(*(run_one(i) for i in range(bots)), return_exceptions=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run browser-free 45s bots over the LiveView protocol.")
+    parser.add_argument("--url", default=os.getenv("APP_BASE_URL", "http://localhost:4000/play"))
+    parser.add_argument("--bots", type=int, default=4)
+    parser.add_argument("--strategy", default="tbot", help="a tournament.py strategy name or module:attribute")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--stagger", type=float, default=0.05, help="seconds between bot starts")
+    parser.add_argument("--time-budget", type=float, default=SEARCH_BUDGET,
+                        help="seconds a search strategy may think per decision")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = asyncio.run(
+        run_bots(args.url, args.bots, args.strategy, args.seed, args.stagger, args.time_budget)
+    )
+    elapsed = time.perf_counter() - start
+
+    finished = [r for r in results if isinstance(r, list)]
+    print(f"{len(finished)}/{args.bots} bots finished a game in {elapsed:.1f}s")
+    for name in ("queue_join", "match", "bid", "discard", "play", "game"):
+        values = [seconds for samples in finished for action, _, seconds in samples if action == name]
+        if values:
+            print(f"  {name}: mean {sum(values) / len(values):.3f}s, max {max(values):.3f}s")
+    if len(finished) < args.bots:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
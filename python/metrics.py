@@ -0,0 +1,139 @@
+"""In-process latency histograms with JSON and Prometheus textfile export.
+
+A bot run feeds `Metrics.observe` (or the `Metrics.time` context manager)
+with the duration of each stage. At exit the histograms are written as
+JSON and in the Prometheus text exposition format, for node_exporter's
+textfile collector or for diffing runs:
+
+    tbot_stage_seconds_bucket{instance="1",stage="bid",le="0.25"} 7
+"""
+
+import json
+import math
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+# Seconds. Wide enough for a click round trip and for a matchmaking wait.
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """`(le, count)` pairs as Prometheus exposes them, ending with +Inf."""
+        pairs, total = [], 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            pairs.append(("+Inf" if bound == math.inf else repr(bound), total))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (capped at max)."""
+        if self.count == 0:
+            return 0.0
+        rank, total = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class Metrics:
+    def __init__(self, prefix: str = "tbot", labels: Optional[dict[str, str]] = None) -> None:
+        self.prefix = prefix
+        self.labels = labels or {}
+        self.stages: dict[str, Histogram] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            histogram = self.stages[stage] = Histogram()
+        histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, stage: str):
+        """Observes the duration of the `with` block, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    # ── Export ──────────────────────────────────────────────────────
+
+    def to_json(self) -> dict:
+        return {
+            "labels": self.labels,
+            "stages": {stage: h.to_dict() for stage, h in sorted(self.stages.items())},
+        }
+
+    def to_prometheus(self) -> str:
+        name = f"{self.prefix}_stage_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each bot stage.",
+            f"# TYPE {name} histogram",
+        ]
+        for stage, histogram in sorted(self.stages.items()):
+            labels = {**self.labels, "stage": stage}
+            for le, count in histogram.cumulative():
+                lines.append(f"{name}_bucket{_labels({**labels, 'le': le})} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory: Path, stem: str) -> tuple[Path, Path]:
+        """Writes `<stem>.json` and `<stem>.prom`. The .prom file is written
+        to a temporary name first, as the textfile collector requires."""
+        directory.mkdir(parents=True, exist_ok=True)
+        json_path = directory / f"{stem}.json"
+        prom_path = directory / f"{stem}.prom"
+        json_path.write_text(json.dumps(self.to_json(), indent=2), encoding="utf-8")
+        tmp = directory / f"{stem}.prom.tmp"
+        tmp.write_text(self.to_prometheus(), encoding="utf-8")
+        tmp.replace(prom_path)
+        return json_path, prom_path
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
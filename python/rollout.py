@@ -0,0 +1,222 @@
+"""Monte Carlo rollout play for the Playing phase.
+
+Instead of judging only the current trick like `evaluate_hand_play`, this
+samples the unseen cards into the other hands, plays every legal card out to
+the end of the hand with the tbot heuristic for all four players, and picks
+the card whose team won the most points on average, the best-card bonus
+included. All candidates are scored on the same sampled deals so their
+differences are not drowned out by deal luck.
+
+The search stops at a wall-clock budget or a rollout count, whichever comes
+first, and can be spread over worker processes so a decision fits inside
+the server's idle timeout. Offline only the rollout count applies, so
+seeded games replay the same on any machine; live bots add the budget.
+"""
+
+import math
+import os
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional, Sequence
+
+from card import DECK, Suit, Card
+from rules import TRICK_POINTS, earlier_winners, legal_moves, trick_winner
+from sim import TbotStrategy
+from strategy import evaluate_hand_play
+
+# Seconds per decision for live bots.
+LIVE_TIME_BUDGET = float(os.getenv("TBOT_ROLLOUT_BUDGET", "1.0"))
+DEFAULT_MAX_ROLLOUTS = 64
+
+
+def play_out(
+    card: Card,
+    hands: list[list[Card]],
+    current_cards: list[Card],
+    trump: Suit,
+    winners: list[tuple[Card, int]],
+) -> int:
+    """Plays `card` and the rest of the hand; returns our team's points from
+    the tricks still to finish and the best-card bonus.
+
+    `hands` are in play order starting with ours (without `card`) and are
+    consumed. Players at even offsets from us are on our team. `winners`
+    holds the `(winning card, team)` of the round's finished tricks, with
+    our team as 0, and is extended.
+    """
+    cards = current_cards + [card]
+    offsets = [i - len(current_cards) for i in range(len(cards))]
+    suit_led = cards[0].suit
+    for offset in range(1, 4 - len(current_cards)):
+        hand = hands[offset]
+        choice = evaluate_hand_play(suit_led, legal_moves(hand, cards[0], trump), cards, trump)
+        hand.remove(choice)
+        cards.append(choice)
+        offsets.append(offset)
+
+    best = trick_winner(cards, suit_led, trump)
+    leader = offsets[best] % 4
+    points = TRICK_POINTS if leader % 2 == 0 else 0
+    winners.append((cards[best], leader % 2))
+
+    while hands[leader]:
+        cards.clear()
+        suit_led = None
+        for turn in range(4):
+            hand = hands[(leader + turn) % 4]
+            legal = legal_moves(hand, cards[0], trump) if cards else hand
+            choice = evaluate_hand_play(suit_led, legal, cards, trump)
+            hand.remove(choice)
+            cards.append(choice)
+            if turn == 0:
+                suit_led = choice.suit
+        best = trick_winner(cards, suit_led, trump)
+        leader = (leader + best) % 4
+        if leader % 2 == 0:
+            points += TRICK_POINTS
+        winners.append((cards[best], leader % 2))
+
+    # The best of the round's trick-winning cards, by the last suit led.
+    best = trick_winner([won for won, _ in winners], suit_led, trump)
+    if winners[best][1] == 0:
+        points += TRICK_POINTS
+    return points
+
+
+def run_rollouts(
+    hand: list[int],
+    legal: list[int],
+    current_cards: list[int],
+    seen: list[int],
+    trump: Suit,
+    time_budget: float,
+    max_rollouts: Optional[int],
+    seed: Optional[int],
+) -> tuple[list[int], int]:
+    """Scores each legal card over sampled deals. Takes and returns card
+    indices so it is cheap to ship to a worker process.
+
+    Returns the summed points per legal card and the number of deals.
+    """
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_budget
+    my_hand = [DECK[i] for i in hand]
+    candidates = [DECK[i] for i in legal]
+    table = [DECK[i] for i in current_cards]
+    known = set(hand) | set(current_cards) | set(seen)
+    unseen = [card for card in DECK if card.index not in known]
+    earlier = [DECK[i] for i in seen if i not in current_cards]
+    winners = [
+        (won, seat % 2) for won, seat in earlier_winners(earlier, -len(table) % 4, trump)
+    ]
+
+    # Players after us in this trick still hold as many cards as we do,
+    # the ones who already played hold one fewer.
+    after = 3 - len(table)
+    sizes = [len(my_hand)] * after + [len(my_hand) - 1] * len(table)
+
+    totals = [0] * len(candidates)
+    deals = 0
+    while max_rollouts is None or deals < max_rollouts:
+        if deals and time.perf_counter() >= deadline:
+            break
+        rng.shuffle(unseen)
+        others, start = [], 0
+        for size in sizes:
+            others.append(unseen[start:start + size])
+            start += size
+
+        for i, card in enumerate(candidates):
+            hands = [[c for c in my_hand if c is not card]] + [list(h) for h in others]
+            totals[i] += play_out(card, hands, table, trump, list(winners))
+        deals += 1
+    return totals, deals
+
+
+def choose_card(
+    hand: list[Card],
+    legal: list[Card],
+    current_cards: list[Card],
+    trump: Suit,
+    seen: Sequence[Card] = (),
+    time_budget: float = math.inf,
+    max_rollouts: Optional[int] = DEFAULT_MAX_ROLLOUTS,
+    rng: Optional[random.Random] = None,
+    pool: Optional[Executor] = None,
+    workers: int = 1,
+) -> Card:
+    """Returns the legal card with the best expected points.
+
+    `hand` is the full hand, `seen` the cards played in earlier tricks of
+    this round in play order (cards of the current trick are ignored).
+    Raises ValueError if `seen` has a partial earlier trick. With
+    `workers` > 1 the rollouts run in `pool` (or a pool created for this
+    call, which adds process startup to the budget).
+    """
+    if math.isinf(time_budget) and max_rollouts is None:
+        raise ValueError("An unlimited time budget needs max_rollouts")
+    if len(legal) == 1:
+        return legal[0]
+
+    rng = rng or random.Random()
+    args = (
+        [c.index for c in hand],
+        [c.index for c in legal],
+        [c.index for c in current_cards],
+        [c.index for c in seen],
+        trump,
+        time_budget,
+    )
+
+    if workers <= 1:
+        totals, _ = run_rollouts(*args, max_rollouts, rng.getrandbits(64))
+    else:
+        share = None if max_rollouts is None else -(-max_rollouts // workers)
+        owned = pool is None
+        pool = pool or ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [
+                pool.submit(run_rollouts, *args, share, rng.getrandbits(64))
+                for _ in range(workers)
+            ]
+            totals = [0] * len(legal)
+            for future in futures:
+                for i, total in enumerate(future.result()[0]):
+                    totals[i] += total
+        finally:
+            if owned:
+                pool.shutdown()
+
+    return legal[max(range(len(legal)), key=totals.__getitem__)]
+
+
+class RolloutStrategy:
+    """Bids and discards like tbot but plays cards by Monte Carlo rollouts."""
+
+    name = "rollout"
+
+    def __init__(
+        self,
+        rng: Optional[random.Random] = None,
+        time_budget: float = math.inf,
+        max_rollouts: Optional[int] = DEFAULT_MAX_ROLLOUTS,
+    ) -> None:
+        self.rng = rng or random.Random()
+        self.time_budget = time_budget
+        self.max_rollouts = max_rollouts
+        self.fallback = TbotStrategy()
+
+    def bid(self, hand, max_bid, bagged):
+        return self.fallback.bid(hand, max_bid, bagged)
+
+    def discard(self, hand, trump):
+        return self.fallback.discard(hand, trump)
+
+    def play(self, suit_led, legal, current_cards, trump, hand=None, seen=()) -> Card:
+        if hand is None:
+            return self.fallback.play(suit_led, legal, current_cards, trump)
+        return choose_card(
+            hand, legal, current_cards, trump, seen,
+            time_budget=self.time_budget, max_rollouts=self.max_rollouts, rng=self.rng,
+        )
@@ -0,0 +1,96 @@
+"""Pure 45s rules mirroring `Website45sV3.Game.Rules` on the server.
+
+Used by the offline tooling so it plays exactly the game the Phoenix app
+runs: legal moves (including reneging), trick winners and round scoring.
+"""
+
+from typing import Optional
+
+from card import Suit, Card, is_ace_of_hearts, less_than, rank_table
+from hand import Hand
+
+BID_VALUES = (15, 20, 25, 30)
+WINNING_SCORE = 120
+TRICK_POINTS = 5
+HAND_SIZE = 5
+KITTY_SIZE = 3
+
+
+def valid_bid(bid: int, suit: Suit, highest_bid: int, bagged: bool) -> bool:
+    """Whether a bid is allowed; a bagged dealer may not pass."""
+    if bid == 0 and suit == Suit.PASS:
+        return not bagged
+    return bid in BID_VALUES and suit != Suit.PASS and bid > highest_bid
+
+
+def renegable(card: Card, trump: Suit, card_led: Card, suit_led: Suit) -> bool:
+    """The 5 and jack of trump and the ace of hearts need not follow a lower trump."""
+    if not (is_ace_of_hearts(card) or (card.suit == trump and card.value in (5, 11))):
+        return False
+    return not less_than(card, card_led, suit_led, trump)
+
+
+def legal_moves(hand: list[Card], card_led: Optional[Card], trump: Suit) -> list[Card]:
+    """Cards from `hand` that may be played after `card_led` led the trick."""
+    if not hand or card_led is None:
+        return hand
+    mask = Hand.of(hand)
+    legal = mask.legal(card_led, trump)
+    if legal == mask:
+        return hand
+    return [c for c in hand if legal >> c.index & 1]
+
+
+def trick_winner(cards: list[Card], suit_led: Suit, trump: Suit) -> int:
+    """Index of the winning card in `cards`, given in play order.
+
+    Ties can only happen between cards that cannot win; like the server the
+    earliest of them is returned.
+    """
+    ranks = rank_table(suit_led, trump)
+    return max(range(len(cards)), key=lambda i: ranks[cards[i].index])
+
+
+def earlier_winners(earlier: list[Card], leader: int, trump: Suit) -> list[tuple[Card, int]]:
+    """`(winning card, winning seat)` of each finished trick in `earlier`,
+    whose cards are in play order. `leader` is the seat that leads the
+    trick after them, which is the last trick's winner; the seats of the
+    earlier tricks follow from there.
+
+    Raises ValueError unless `earlier` holds only whole tricks.
+    """
+    if len(earlier) % 4:
+        raise ValueError(f"{len(earlier)} earlier cards are not whole tricks")
+    winners = []
+    for start in range(len(earlier) - 4, -1, -4):
+        trick = earlier[start:start + 4]
+        best = trick_winner(trick, trick[0].suit, trump)
+        winners.append((trick[best], leader))
+        leader = (leader - best) % 4
+    winners.reverse()
+    return winners
+
+
+def team_for(seat: int) -> int:
+    """Seats 0 and 2 form team 0, seats 1 and 3 form team 1."""
+    return seat % 2
+
+
+def score_round(
+    round_scores: list[int], team_scores: list[int], bid_amount: int, bid_seat: int
+) -> tuple[list[int], Optional[int]]:
+    """Returns the new team totals and the winning team, if any."""
+    bid_team = team_for(bid_seat)
+    new_scores = list(team_scores)
+    for team in (0, 1):
+        points = round_scores[team]
+        if team == bid_team and points < bid_amount:
+            points = -bid_amount
+        new_scores[team] += points
+
+    winning_team = None
+    if new_scores[0] >= WINNING_SCORE:
+        winning_team = 0
+    elif new_scores[1] >= WINNING_SCORE:
+        winning_team = 1
+    return new_scores, winning_team
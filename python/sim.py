@@ -0,0 +1,263 @@
+"""Headless in-process simulator for full 45s games.
+
+Plays the same game as `GameController` on the server (deal, bidding with
+bagging, discard and redraw, tricks with reneging, scoring to 120) but with
+no browser or server involved, so strategy changes can be evaluated offline:
+
+    python sim.py --games 10000 --seed 1
+
+It calls the strategies once per decision, so any strategy object can sit
+at the table, at about a thousand games per second per core. For bulk
+self-play of the tbot rules, `batch.py` plays the same game as array
+operations at about ten thousand games per second per core.
+"""
+
+import argparse
+import inspect
+import random
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Sequence
+
+from card import DECK, Suit, Card, rank_map
+from hand import Hand
+from rules import (
+    HAND_SIZE,
+    KITTY_SIZE,
+    TRICK_POINTS,
+    score_round,
+    team_for,
+    trick_winner,
+    valid_bid,
+)
+from strategy import choose_bid, choose_discard, evaluate_hand_play
+
+
+class TbotStrategy:
+    """The decision rules tbot.py plays with on the live site."""
+
+    name = "tbot"
+
+    def bid(self, hand: list[Card], max_bid: int, bagged: bool) -> tuple[int, Suit]:
+        return choose_bid(hand, max_bid, bagged)
+
+    def discard(self, hand: list[Card], trump: Suit) -> list[Card]:
+        return choose_discard(hand, trump)
+
+    def play(
+        self,
+        suit_led: Optional[Suit],
+        legal: list[Card],
+        current_cards: list[Card],
+        trump: Suit,
+        hand: Optional[list[Card]] = None,
+        seen: Sequence[Card] = (),
+    ) -> Card:
+        """`hand` is the full hand and `seen` the cards of earlier tricks this
+        round, for strategies that look further ahead than the current trick."""
+        return evaluate_hand_play(suit_led, legal, current_cards, trump)
+
+
+@lru_cache(maxsize=None)
+def sees_round(cls: type) -> bool:
+    """Whether `cls.play` takes the `hand` and `seen` keywords. Strategies
+    written to the plain `play(suit_led, legal, current_cards, trump)` are
+    called without them."""
+    parameters = inspect.signature(cls.play).parameters
+    return ("hand" in parameters and "seen" in parameters) or any(
+        p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()
+    )
+
+
+def play_card(
+    strategy,
+    suit_led: Optional[Suit],
+    legal: list[Card],
+    current_cards: list[Card],
+    trump: Suit,
+    hand: Optional[list[Card]] = None,
+    seen: Sequence[Card] = (),
+) -> Card:
+    """`strategy.play`, with `hand` and `seen` if it takes them."""
+    if sees_round(type(strategy)):
+        return strategy.play(suit_led, legal, current_cards, trump, hand=hand, seen=seen)
+    return strategy.play(suit_led, legal, current_cards, trump)
+
+
+@dataclass
+class RoundResult:
+    dealer: int
+    bid_seat: int
+    bid: int
+    trump: Suit
+    points: list[int]
+
+    @property
+    def made(self) -> bool:
+        return self.points[team_for(self.bid_seat)] >= self.bid
+
+
+@dataclass
+class GameResult:
+    winner: int
+    scores: list[int]
+    rounds: list[RoundResult] = field(default_factory=list)
+
+
+# (position, bits) for each swap of a Fisher-Yates shuffle of the deck.
+_SHUFFLE_STEPS = [(i, (i + 1).bit_length()) for i in range(len(DECK) - 1, 0, -1)]
+
+
+def shuffled_deck(rng: random.Random) -> list[Card]:
+    """`rng.shuffle(list(DECK))`, with `random.Random`'s draws inlined: the
+    same deck from the same state, in half the time."""
+    deck = list(DECK)
+    if type(rng) is not random.Random:
+        rng.shuffle(deck)
+        return deck
+    getrandbits = rng.getrandbits
+    for i, bits in _SHUFFLE_STEPS:
+        j = getrandbits(bits)
+        while j > i:
+            j = getrandbits(bits)
+        deck[i], deck[j] = deck[j], deck[i]
+    return deck
+
+
+def play_round(strategies: list, dealer: int, rng: random.Random) -> RoundResult:
+    deck = shuffled_deck(rng)
+    hands = [[deck.pop() for _ in range(HAND_SIZE)] for _ in range(4)]
+
+    # ── Bidding ─────────────────────────────────────────────────────
+    max_bid, bid_seat, trump = 0, None, None
+    for turn in range(4):
+        seat = (dealer + 1 + turn) % 4
+        bagged = turn == 3 and max_bid == 0
+        bid, suit = strategies[seat].bid(hands[seat], max_bid, bagged)
+        if not valid_bid(bid, suit, max_bid, bagged):
+            raise ValueError(f"Seat {seat} made an invalid bid: {bid} {suit}")
+        if bid > max_bid:
+            max_bid, bid_seat, trump = bid, seat, suit
+
+    points = finish_round(strategies, hands, deck, bid_seat, trump)
+    return RoundResult(dealer, bid_seat, max_bid, trump, points)
+
+
+def finish_round(
+    strategies: list,
+    hands: list[list[Card]],
+    deck: list[Card],
+    bid_seat: int,
+    trump: Suit,
+) -> list[int]:
+    """Plays a round from the end of bidding: the bidder takes the kitty,
+    everyone discards and redraws from `deck`, and the five tricks are
+    played. `hands` and `deck` are consumed. Returns the points per team."""
+    # ── Discard and redraw ──────────────────────────────────────────
+    hands[bid_seat].extend(deck.pop() for _ in range(KITTY_SIZE))
+    for seat in range(4):
+        hand = hands[seat]
+        keep = strategies[seat].discard(hand, trump)
+        if not 1 <= len(keep) <= HAND_SIZE or any(c not in hand for c in keep):
+            raise ValueError(f"Seat {seat} made an invalid discard: {keep}")
+        hands[seat] = [c for c in hand if c in keep]
+    for hand in hands:
+        hand.extend(deck.pop() for _ in range(HAND_SIZE - len(hand)))
+
+    # ── Tricks ──────────────────────────────────────────────────────
+    # play_card's dispatch, resolved once per round rather than per card.
+    # TbotStrategy.play only forwards to evaluate_hand_play, so skip it.
+    plays = [
+        (evaluate_hand_play, False) if type(s).play is TbotStrategy.play
+        else (s.play, sees_round(type(s)))
+        for s in strategies
+    ]
+    # rules.legal_moves, on bitset hands kept up to date as cards are played.
+    masks = [Hand.of(hand) for hand in hands]
+    points = [0, 0]
+    leader = bid_seat
+    winning_cards, winning_seats = [], []
+    seen = []
+    rank = None
+    for _ in range(HAND_SIZE):
+        cards = []
+        suit_led = None
+        for turn in range(4):
+            seat = (leader + turn) % 4
+            hand = hands[seat]
+            legal = hand
+            if cards:
+                legal_bits = masks[seat].legal(cards[0], trump)
+                if legal_bits != masks[seat]:
+                    legal = [c for c in hand if legal_bits >> c.index & 1]
+            play, sees = plays[seat]
+            if sees:
+                card = play(suit_led, legal, cards, trump, hand=hand, seen=seen)
+            else:
+                card = play(suit_led, legal, cards, trump)
+            if card not in legal:
+                raise ValueError(f"Seat {seat} played an illegal card: {card}")
+            hand.remove(card)
+            masks[seat] = masks[seat].remove(card)
+            cards.append(card)
+            if turn == 0:
+                suit_led = card.suit
+                rank = rank_map(suit_led, trump).__getitem__
+
+        # trick_winner: the first of the highest ranked cards.
+        winner = cards.index(max(cards, key=rank))
+        leader = (leader + winner) % 4
+        points[leader % 2] += TRICK_POINTS
+        winning_cards.append(cards[winner])
+        winning_seats.append(leader)
+        seen.extend(cards)
+
+    # The best of the five trick-winning cards earns its team a bonus.
+    best = trick_winner(winning_cards, suit_led, trump)
+    points[team_for(winning_seats[best])] += TRICK_POINTS
+
+    return points
+
+
+def play_game(strategies: list, rng: random.Random) -> GameResult:
+    scores = [0, 0]
+    rounds = []
+    dealer = rng.randrange(4)
+    while True:
+        result = play_round(strategies, dealer, rng)
+        rounds.append(result)
+        scores, winner = score_round(result.points, scores, result.bid, result.bid_seat)
+        if winner is not None:
+            return GameResult(winner, scores, rounds)
+        dealer = (dealer + 1) % 4
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Simulate 45s games offline.",
+        epilog="For bulk tbot self-play, batch.py is about ten times faster.",
+    )
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    strategies = [TbotStrategy() for _ in range(4)]
+    wins = [0, 0]
+    rounds = 0
+
+    start = time.perf_counter()
+    for _ in range(args.games):
+        result = play_game(strategies, rng)
+        wins[result.winner] += 1
+        rounds += len(result.rounds)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.games} games, {rounds} rounds in {elapsed:.2f}s "
+          f"({args.games / elapsed:,.0f} games/s)")
+    print(f"team 0 wins: {wins[0]}  team 1 wins: {wins[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1059 @@
+"""Local stand-in for the Phoenix app: no Docker, no Postgres, no Elixir.
+
+Serves `/play` and `/game/<id>` with the element ids and `data-*`
+attributes that `QueueLive` and `GameLive` render. It speaks enough of the
+LiveView channel protocol on `/live/websocket` for `lvclient.py` and
+`loadtest.py`: join with a rendered tree, click/form/hook events, pushed
+diffs and live redirects. Pages load a small script that plays the part
+of the LiveSocket and the card-selection hooks, so `tbot.py` and
+`wait_play.py` drive it through Chrome as they would the real site.
+
+Queued players are paired four at a time into games that run the rules
+from `rules.py` in-process. Seats can be filled with bots: the queue
+page's "Fill with Bots", or `--fill-after` seconds of waiting.
+
+    python standin.py --port 4000 --fill-after 2
+    APP_BASE_URL=http://localhost:4000/play python tbot.py
+
+Not modelled: accounts, private games, auto-play on idle, and presence.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import re
+from html import escape
+from http.cookies import SimpleCookie
+from typing import Optional
+from urllib.parse import urlsplit
+
+from websockets.asyncio.server import ServerConnection, serve
+from websockets.datastructures import Headers
+from websockets.exceptions import ConnectionClosed
+from websockets.http11 import Request, Response
+
+from card import DECK, SUITS, Suit, Card
+from gameview import card_value, parse_card
+from rules import (
+    BID_VALUES,
+    HAND_SIZE,
+    KITTY_SIZE,
+    TRICK_POINTS,
+    legal_moves,
+    score_round,
+    team_for,
+    trick_winner,
+    valid_bid,
+)
+from sim import play_card
+from tournament import make_strategy
+
+PLAYER_COOKIE = "_standin_player"
+# Not checked: any page's token is accepted.
+CSRF_TOKEN = "standin"
+BOT_DELAY = 0.05
+TRICK_SECONDS = 2
+SCORING_SECONDS = 6
+FINAL_SECONDS = 60
+SUIT_NAMES = {suit.long_name(): suit for suit in SUITS}
+
+
+# ── Game ────────────────────────────────────────────────────────────
+
+
+class Game:
+    """One game's state, advanced by the seated players' actions. Seats
+    are indices into `players`; seats 0 and 2 are team 0."""
+
+    def __init__(self, game_id: str, players: list[str], names: dict[str, str], rng: random.Random) -> None:
+        self.id = game_id
+        self.players = players
+        self.names = names
+        self.rng = rng
+        # Seat -> strategy, for bot players and seats their player left.
+        self.bots: dict[int, object] = {}
+        self.scores = [0, 0]
+        self.history: tuple[list[int], list[int]] = ([], [])
+        self.winner: Optional[int] = None
+        self.dealer = rng.randrange(4)
+        self.start_round()
+
+    def seat_of(self, player: str) -> Optional[int]:
+        return self.players.index(player) if player in self.players else None
+
+    def start_round(self) -> None:
+        deck = list(DECK)
+        self.rng.shuffle(deck)
+        self.hands = [[deck.pop() for _ in range(HAND_SIZE)] for _ in range(4)]
+        self.deck = deck
+        self.phase = "Bidding"
+        self.current: Optional[int] = (self.dealer + 1) % 4
+        self.bids = 0
+        self.max_bid, self.bid_seat, self.trump = 0, None, None
+        self.actions: list[str] = []
+        self.received: set[int] = set()
+        self.table: list[tuple[int, Card]] = []
+        self.winning: list[tuple[Card, int]] = []
+        self.seen: list[Card] = []
+        self.last_led: Optional[Suit] = None
+        self.leader: Optional[int] = None
+        self.points = [0, 0]
+
+    @property
+    def bagged(self) -> bool:
+        return self.phase == "Bidding" and self.current == self.dealer and self.max_bid == 0
+
+    @property
+    def suit_led(self) -> Optional[Suit]:
+        return self.table[0][1].suit if self.table else None
+
+    def legal(self, seat: int) -> list[Card]:
+        hand = self.hands[seat]
+        if self.phase != "Playing" or not self.table:
+            return hand
+        return legal_moves(hand, self.table[0][1], self.trump)
+
+    def bid(self, seat: int, bid: int, suit: Suit) -> bool:
+        if self.phase != "Bidding" or seat != self.current:
+            return False
+        if not valid_bid(bid, suit, self.max_bid, self.bagged):
+            return False
+        name = self.names[self.players[seat]]
+        if bid:
+            self.max_bid, self.bid_seat, self.trump = bid, seat, suit
+            self.actions.append(f"{name} bid {bid}")
+        else:
+            self.actions.append(f"{name} passed")
+        self.bids += 1
+        if self.bids < 4:
+            self.current = (self.current + 1) % 4
+            return True
+        self.hands[self.bid_seat].extend(self.deck.pop() for _ in range(KITTY_SIZE))
+        self.phase, self.current = "Discard", None
+        return True
+
+    def discard(self, seat: int, keep: list[Card]) -> bool:
+        hand = self.hands[seat]
+        if self.phase != "Discard" or seat in self.received:
+            return False
+        if not 1 <= len(keep) <= HAND_SIZE or any(card not in hand for card in keep):
+            return False
+        self.hands[seat] = [card for card in hand if card in keep]
+        self.received.add(seat)
+        if len(self.received) < 4:
+            return True
+        for hand in self.hands:
+            hand.extend(self.deck.pop() for _ in range(HAND_SIZE - len(hand)))
+        self.phase, self.current = "Playing", self.bid_seat
+        return True
+
+    def play(self, seat: int, card: Card) -> bool:
+        if self.phase != "Playing" or seat != self.current or card not in self.legal(seat):
+            return False
+        self.hands[seat].remove(card)
+        self.table.append((seat, card))
+        if len(self.table) < 4:
+            self.current = (seat + 1) % 4
+            return True
+
+        # Like the server, the finished trick stays on the table with no
+        # one to move until `finish_trick` clears it.
+        cards = [c for _, c in self.table]
+        self.last_led = cards[0].suit
+        index = trick_winner(cards, self.last_led, self.trump)
+        winner = self.table[index][0]
+        self.points[team_for(winner)] += TRICK_POINTS
+        self.winning.append((cards[index], winner))
+        self.seen.extend(cards)
+        self.current, self.leader = None, winner
+        self.actions.append(f"{self.names[self.players[winner]]} won trick {len(self.winning)}")
+        if len(self.winning) < HAND_SIZE:
+            return True
+
+        best = trick_winner([c for c, _ in self.winning], self.last_led, self.trump)
+        self.points[team_for(self.winning[best][1])] += TRICK_POINTS
+        self.scores, self.winner = score_round(self.points, self.scores, self.max_bid, self.bid_seat)
+        for team in (0, 1):
+            self.history[team].append(self.scores[team])
+        if self.winner is not None:
+            names = ", ".join(self.names[self.players[s]] for s in (self.winner, self.winner + 2))
+            self.actions = [f"{names} won the game!"]
+        return True
+
+    @property
+    def trick_over(self) -> bool:
+        return self.phase == "Playing" and len(self.table) == 4
+
+    def finish_trick(self) -> None:
+        self.table = []
+        if self.hands[self.leader]:
+            self.current = self.leader
+        else:
+            self.phase = "Final Scoring" if self.winner is not None else "Scoring"
+
+    def next_round(self) -> None:
+        self.dealer = (self.dealer + 1) % 4
+        self.start_round()
+
+    @property
+    def bots_to_act(self) -> bool:
+        if self.phase == "Discard":
+            return any(seat not in self.received for seat in self.bots)
+        return self.phase in ("Bidding", "Playing") and self.current in self.bots
+
+    def bot_turn(self) -> None:
+        """Takes the bots' pending actions. An invalid choice falls back
+        to the simplest legal one rather than stalling the table."""
+        if self.phase == "Bidding":
+            seat = self.current
+            bid, suit = self.bots[seat].bid(list(self.hands[seat]), self.max_bid, self.bagged)
+            if not self.bid(seat, bid, suit):
+                self.bid(seat, *((BID_VALUES[0], SUITS[0]) if self.bagged else (0, Suit.PASS)))
+        elif self.phase == "Discard":
+            for seat, strategy in self.bots.items():
+                if seat not in self.received:
+                    hand = self.hands[seat]
+                    if not self.discard(seat, strategy.discard(list(hand), self.trump)):
+                        self.discard(seat, hand[:HAND_SIZE])
+        elif self.phase == "Playing":
+            seat = self.current
+            legal = self.legal(seat)
+            card = play_card(
+                self.bots[seat], self.suit_led, legal, [c for _, c in self.table], self.trump,
+                list(self.hands[seat]), list(self.seen),
+            )
+            if not self.play(seat, card):
+                self.play(seat, legal[0])
+
+
+# ── Rendering ───────────────────────────────────────────────────────
+
+
+def _attrs(**attrs) -> str:
+    parts = []
+    for name, value in attrs.items():
+        name = name.rstrip("_").replace("_", "-")
+        if value is True:
+            parts.append(f" {name}")
+        elif value is not None and value is not False:
+            parts.append(f' {name}="{escape(str(value))}"')
+    return "".join(parts)
+
+
+def _suit_name(suit: Optional[Suit]) -> str:
+    return suit.long_name() if suit is not None else ""
+
+
+def _card_img(card: Card, **attrs) -> str:
+    return f'<img src="/images/cards/{card_value(card)}.png"{_attrs(**attrs)}/>'
+
+
+def _parse_cards(value: dict) -> Optional[list[Card]]:
+    """The `cards` of a hook payload, or None if it is malformed."""
+    cards = value.get("cards")
+    if not isinstance(cards, list) or not all(isinstance(c, str) for c in cards):
+        return None
+    try:
+        return [parse_card(c) for c in cards]
+    except (KeyError, ValueError):
+        return None
+
+
+def render_queue(queued: list[str], names: dict[str, str], player: str) -> str:
+    players = "".join(
+        f'<div class="player-card"><p>{escape(names[p])}</p></div>' for p in queued
+    )
+    if player in queued:
+        controls = (
+            '<p>You are in the queue</p>'
+            '<form phx-submit="leave"><button id="leave-queue-button" type="submit" class="red-button">'
+            "Leave Queue</button></form>"
+            '<button id="fill-bots-button" phx-click="fill_bots" class="fill-bots-button">'
+            "Fill with Bots</button>"
+        )
+    else:
+        controls = (
+            '<form phx-submit="join"><button id="join-queue-button" type="submit" class="green-button">'
+            "Join Queue</button></form>"
+            '<button id="play-vs-bots-button" phx-click="fill_bots" class="fill-bots-button">'
+            "Play vs Bots</button>"
+        )
+    return (
+        '<div id="queue-root" style="text-align: center; margin-top:10px;">'
+        "<h1>Queue</h1><p>4-players, teams</p>"
+        f'<div class="queue-cards">{players}</div>{controls}</div>'
+    )
+
+
+class SeatView:
+    """One player's view of a game: what `GameLive` keeps in its socket
+    assigns besides the game itself, and the render of its template."""
+
+    def __init__(self, game: Game, player: str) -> None:
+        self.game = game
+        self.player = player
+        self.seat = game.seat_of(player)
+        self.selected_bid: Optional[str] = None
+        self.selected_suit: Optional[str] = None
+        self.overlay = False
+
+    def render(self) -> str:
+        game, seat = self.game, self.seat
+        my_turn = game.current == seat
+        confirm_clicked = game.phase == "Discard" and seat in game.received
+        body = []
+        if game.phase != "Playing":
+            body.append(f'<h1 class="game-state-style">{game.phase}</h1>')
+        if game.phase == "Playing":
+            body.append(
+                f"<p>Trump: {_suit_name(game.trump).capitalize()}</p>"
+                '<button class="score-button" phx-click="toggle_score_overlay">View Scores</button>'
+            )
+        body.append(f'<div class="actions-list">{escape(", ".join(game.actions))}</div>')
+        if game.phase == "Bidding":
+            body.append(self._render_bidding(my_turn))
+        elif game.phase == "Discard":
+            message = "Waiting for other players..." if confirm_clicked else "Select the cards you want to keep"
+            body.append(
+                f'<div><p class="discard-message">{message}</p>'
+                f'<button id="confirm-discard-button" class="blue-button" phx-hook="ConfirmDiscardButton"'
+                f'{_attrs(disabled=confirm_clicked)}>Confirm Keep</button></div>'
+            )
+        elif game.phase == "Playing":
+            body.append(self._render_table(my_turn))
+        else:
+            body.append(self._render_scoring())
+        body.append(self._render_hand(my_turn, confirm_clicked))
+        overlay = ""
+        if self.overlay and game.phase not in ("Scoring", "Final Scoring"):
+            overlay = f'<div class="score-overlay" phx-click="toggle_score_overlay">{self._render_scoring()}</div>'
+
+        container = _attrs(
+            id="game-container",
+            class_="game",
+            data_phase=game.phase,
+            data_current_turn=str(my_turn).lower(),
+            data_bagged=str(game.bagged).lower(),
+            data_current_bid=game.max_bid,
+            data_trump=_suit_name(game.trump),
+            data_suit_led=_suit_name(game.suit_led),
+            data_auto_playing="false",
+            data_confirm_discard_clicked=str(confirm_clicked).lower(),
+        )
+        return f'<div{container}><div style="text-align: center;">{"".join(body)}</div></div>{overlay}'
+
+    def _render_bidding(self, my_turn: bool) -> str:
+        game = self.game
+        bagged = game.bagged and my_turn
+        selected_bid = "15" if bagged else self.selected_bid
+        numbers = "".join(
+            f'<button class="blue-button{" active" if selected_bid == str(bid) else ""}" '
+            f'phx-click="set_bid_number" phx-value-bid-number="{bid}"'
+            f'{_attrs(disabled=(bagged and bid != 15) or bid <= game.max_bid or not my_turn)}>{bid}</button>'
+            for bid in BID_VALUES
+        )
+        suits = "".join(
+            f'<button class="blue-button{" active" if self.selected_suit == name else ""}" '
+            f'phx-click="set_bid_suit" phx-value-bid-suit="{name}"{_attrs(disabled=not my_turn)}>{name}</button>'
+            for name in SUIT_NAMES
+        )
+        confirm_disabled = not my_turn or selected_bid is None or self.selected_suit is None
+        turn = "It is your turn" if my_turn else f"It is {escape(game.names[game.players[game.current]])}'s turn"
+        if bagged:
+            turn = "You are bagged"
+        return (
+            f"<div><p>{turn}</p>"
+            f'<div class="bid-options"><div class="bid-numbers">{numbers}</div>'
+            f'<div class="bid-suits">{suits}</div></div>'
+            '<div class="confirm-bid">'
+            '<button id="pass-bid-button" class="blue-button pass-button" phx-click="set_bid_pass" '
+            f'phx-value-bid-number="0" phx-value-bid-suit="pass"{_attrs(disabled=not my_turn or bagged)}>Pass</button>'
+            f'<button id="confirm-bid-button" class="blue-button" phx-click="confirm_bid"'
+            f"{_attrs(disabled=confirm_disabled)}>Confirm Bid</button></div></div>"
+        )
+
+    def _render_table(self, my_turn: bool) -> str:
+        game = self.game
+        if game.current is None:
+            turn = ""
+        elif my_turn:
+            turn = "Your turn"
+        else:
+            turn = f"{escape(game.names[game.players[game.current]])}'s turn"
+        slots = "".join(
+            f'<div id="{card_value(card)}_{escape(game.players[seat])}" '
+            f'class="player-slot player-{(seat - self.seat) % 4}">'
+            f'<p class="player-name">{escape(game.names[game.players[seat]])}</p>'
+            f'{_card_img(card, class_="card", phx_value_card=card_value(card))}</div>'
+            for seat, card in game.table
+        )
+        return (
+            f'<div class="played-cards"><p class="turn-text">{turn}</p>'
+            f'<div id="table" class="table" phx-update="stream">{slots}</div>'
+            f'<button id="play-card-button" class="blue-button" phx-hook="PlayCardButton"'
+            f"{_attrs(disabled=not my_turn)}>Play Card</button>"
+            f'<div id="card-led-suit" style="display: none;">{_suit_name(game.suit_led)}</div></div>'
+        )
+
+    def _render_hand(self, my_turn: bool, confirm_clicked: bool) -> str:
+        game = self.game
+        hand = game.hands[self.seat]
+        legal = game.legal(self.seat) if my_turn else []
+        playing = game.phase == "Playing"
+        version = "|".join([
+            game.phase,
+            game.players[game.current] if game.current is not None else "none",
+            ",".join(card_value(card) for card in hand),
+            str(confirm_clicked).lower(),
+            "false",
+        ])
+        cards = "".join(
+            _card_img(
+                card,
+                class_="card grayed-out" if confirm_clicked or (playing and card not in legal) else "card",
+                data_card_value=card_value(card),
+            )
+            for card in hand
+        )
+        attrs = _attrs(
+            id="player-hand",
+            class_="player-hand",
+            phx_hook="CardSelection",
+            data_phase=game.phase,
+            data_auto_playing="false",
+            data_selection_version=version,
+        )
+        return f"<div{attrs}>{cards}</div>"
+
+    def _render_scoring(self) -> str:
+        game = self.game
+        teams = [", ".join(escape(game.names[game.players[s]]) for s in (t, t + 2)) for t in (0, 1)]
+        rows = "".join(
+            f"<tr><td>{t1}</td><td>{t2}</td></tr>" for t1, t2 in zip(*game.history)
+        )
+        exit_button = ""
+        if game.phase == "Final Scoring":
+            exit_button = '<button class="blue-button" phx-click="exit_game" style="margin-top: 1rem;">Exit</button>'
+        return (
+            f"<div><table><thead><tr><th>{teams[0]}</th><th>{teams[1]}</th></tr></thead>"
+            f"<tbody>{rows}</tbody></table>{exit_button}</div>"
+        )
+
+    # ── Events ──────────────────────────────────────────────────────
+
+    def handle(self, event: str, value) -> bool:
+        """Applies a client event; returns whether the game changed."""
+        game, seat = self.game, self.seat
+        if event == "set_bid_number" and value.get("bid-number") in {str(b) for b in BID_VALUES}:
+            self.selected_bid = value["bid-number"]
+        elif event == "set_bid_suit" and value.get("bid-suit") in SUIT_NAMES:
+            self.selected_suit = value["bid-suit"]
+        elif event == "set_bid_pass":
+            self.selected_bid, self.selected_suit = None, None
+            return game.bid(seat, 0, Suit.PASS)
+        elif event == "confirm_bid":
+            bid = "15" if game.bagged else self.selected_bid
+            if bid is None or self.selected_suit is None:
+                return False
+            suit = SUIT_NAMES[self.selected_suit]
+            self.selected_bid, self.selected_suit = None, None
+            return game.bid(seat, int(bid), suit)
+        elif event == "confirm_discard":
+            keep = _parse_cards(value)
+            return keep is not None and game.discard(seat, keep)
+        elif event == "play-card":
+            cards = _parse_cards(value)
+            return cards is not None and len(cards) == 1 and game.play(seat, cards[0])
+        elif event == "toggle_score_overlay":
+            self.overlay = not self.overlay
+        return False
+
+
+# ── Pages ───────────────────────────────────────────────────────────
+
+STYLE = """
+body { font-family: sans-serif; background: #0b5d1e; color: #fff; }
+button { margin: 2px; padding: 6px 12px; }
+.active { outline: 3px solid #ffd84d; }
+.card { width: 72px; margin: 2px; cursor: pointer; }
+.grayed-out { opacity: 0.4; cursor: default; }
+.selected-card { transform: translateY(-12px); }
+.player-slot { display: inline-block; margin: 4px; }
+.score-overlay { position: fixed; inset: 10%; background: #222c; padding: 1rem; }
+"""
+
+
+def render_page(title: str, main_id: str, player: str, inner: str) -> str:
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"/>'
+        f'<meta name="csrf-token" content="{CSRF_TOKEN}"/><title>{escape(title)}</title>'
+        f'<style>{STYLE}</style><script defer src="/assets/standin.js"></script></head>'
+        f'<body><div id="{main_id}" data-phx-main data-phx-session="{escape(player)}" '
+        f'data-phx-static="">{inner}</div></body></html>'
+    )
+
+
+def card_svg(name: str) -> str:
+    """A plain card face for `/images/cards/<value>_<suit>.png`."""
+    card = parse_card(name)
+    label = {1: "A", 11: "J", 12: "Q", 13: "K"}.get(card.value, str(card.value))
+    symbol = {"H": "&#9829;", "D": "&#9830;", "C": "&#9827;", "S": "&#9824;"}[card.suit.value]
+    color = "#c00" if card.suit in (Suit.HEARTS, Suit.DIAMONDS) else "#000"
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="100" height="140" viewBox="0 0 100 140">'
+        '<rect x="1" y="1" width="98" height="138" rx="8" fill="#fff" stroke="#333"/>'
+        f'<text x="50" y="78" font-size="44" text-anchor="middle" fill="{color}">{label}{symbol}</text></svg>'
+    )
+
+
+# Stands in for LiveSocket and the hooks in assets/js/app.js: connects to
+# /live/websocket, patches in each rendered diff, forwards phx-click and
+# phx-submit, and keeps the same CardSelection state on #player-hand.
+CLIENT_JS = r"""
+(() => {
+  const csrfToken = document.querySelector("meta[name='csrf-token']").getAttribute("content");
+  const main = document.querySelector("[data-phx-main]");
+  const topic = "lv:" + main.id;
+  const selection = {key: null, cards: [], locked: true};
+  let ws = null, joined = false, ref = 0, joinRef = null;
+
+  function send(event, payload) {
+    ws.send(JSON.stringify([joinRef, String(++ref), topic, event, payload]));
+  }
+
+  function push(type, event, value) {
+    if (joined) send("event", {type, event, value});
+  }
+
+  function showSelection(hand) {
+    hand.querySelectorAll("img[data-card-value]").forEach(img => {
+      img.classList.toggle("selected-card", selection.cards.includes(img.dataset.cardValue));
+    });
+    hand.dataset.selectedCards = JSON.stringify(selection.cards);
+  }
+
+  // Patches the page in place, as morphdom does for LiveView, so elements
+  // a test driver already holds stay attached across updates.
+  function morph(current, next) {
+    if (current.nodeName !== next.nodeName || (current.id || "") !== (next.id || "")) {
+      current.replaceWith(next);
+    } else if (current.nodeType !== Node.ELEMENT_NODE) {
+      if (current.nodeValue !== next.nodeValue) current.nodeValue = next.nodeValue;
+    } else {
+      for (const {name} of Array.from(current.attributes)) {
+        if (!next.hasAttribute(name)) current.removeAttribute(name);
+      }
+      for (const {name, value} of Array.from(next.attributes)) {
+        if (current.getAttribute(name) !== value) current.setAttribute(name, value);
+      }
+      morphChildren(current, next);
+    }
+  }
+
+  function morphChildren(current, next) {
+    const children = Array.from(next.childNodes);
+    children.forEach((child, i) => {
+      const existing = current.childNodes[i];
+      if (existing) morph(existing, child);
+      else current.appendChild(child);
+    });
+    while (current.childNodes.length > children.length) current.lastChild.remove();
+  }
+
+  function apply(diff) {
+    if (!diff || diff["0"] === undefined) return;
+    const next = document.createElement("div");
+    next.innerHTML = diff["0"];
+    morphChildren(main, next);
+    const hand = document.getElementById("player-hand");
+    if (!hand) return;
+    const key = [hand.dataset.phase, hand.dataset.selectionVersion, hand.dataset.autoPlaying].join("/");
+    if (key !== selection.key) {
+      selection.key = key;
+      selection.cards = [];
+    }
+    selection.locked = hand.dataset.autoPlaying === "true" || !["Discard", "Playing"].includes(hand.dataset.phase);
+    showSelection(hand);
+  }
+
+  function selectCard(hand, card) {
+    const value = card.dataset.cardValue;
+    const index = selection.cards.indexOf(value);
+    if (hand.dataset.phase === "Discard") {
+      if (index >= 0) selection.cards.splice(index, 1);
+      else {
+        if (selection.cards.length >= 5) selection.cards.shift();
+        selection.cards.push(value);
+      }
+    } else if (hand.dataset.phase === "Playing") {
+      selection.cards = index >= 0 ? [] : [value];
+    }
+    showSelection(hand);
+  }
+
+  document.addEventListener("click", event => {
+    const hand = document.getElementById("player-hand");
+    const card = event.target.closest("#player-hand img[data-card-value]");
+    if (card) {
+      if (!selection.locked && !card.classList.contains("grayed-out")) selectCard(hand, card);
+      return;
+    }
+    const button = event.target.closest("button");
+    if (button && button.id === "play-card-button") {
+      if (hand && selection.cards.length === 1) push("hook", "play-card", {cards: selection.cards.slice()});
+      return;
+    }
+    if (button && button.id === "confirm-discard-button") {
+      if (hand && selection.cards.length > 0 && selection.cards.length <= 5) {
+        push("hook", "confirm_discard", {cards: selection.cards.slice()});
+        selection.locked = true;
+        selection.cards = [];
+        showSelection(hand);
+      }
+      return;
+    }
+    const target = event.target.closest("[phx-click]");
+    if (!target) return;
+    const values = {};
+    for (const name of target.getAttributeNames()) {
+      if (name.startsWith("phx-value-")) values[name.slice(10)] = target.getAttribute(name);
+    }
+    push("click", target.getAttribute("phx-click"), values);
+  });
+
+  document.addEventListener("submit", event => {
+    const form = event.target.closest("form[phx-submit]");
+    if (!form) return;
+    event.preventDefault();
+    push("form", form.getAttribute("phx-submit"), new URLSearchParams(new FormData(form)).toString());
+  });
+
+  function connect() {
+    const scheme = location.protocol === "https:" ? "wss" : "ws";
+    ws = new WebSocket(`${scheme}://${location.host}/live/websocket?_csrf_token=${encodeURIComponent(csrfToken)}&vsn=2.0.0`);
+    ws.onopen = () => {
+      joinRef = String(++ref);
+      ws.send(JSON.stringify([joinRef, joinRef, topic, "phx_join", {
+        url: location.href,
+        params: {_csrf_token: csrfToken},
+        session: main.dataset.phxSession,
+        static: main.dataset.phxStatic,
+      }]));
+    };
+    ws.onmessage = message => {
+      const [, messageRef, , event, payload] = JSON.parse(message.data);
+      if (event === "phx_reply") {
+        const response = payload.response || {};
+        const target = response.live_redirect || response.redirect;
+        if (target) {
+          location.href = target.to;
+        } else if (messageRef === joinRef && payload.status === "ok") {
+          joined = true;
+          main.classList.add("phx-connected");
+          apply(response.rendered);
+        } else {
+          apply(response.diff);
+        }
+      } else if (event === "diff") {
+        apply(payload);
+      } else if (event === "live_redirect" || event === "redirect") {
+        location.href = payload.to;
+      }
+    };
+    ws.onclose = () => {
+      joined = false;
+      main.classList.remove("phx-connected");
+      setTimeout(connect, 1000);
+    };
+  }
+
+  window.liveSocket = {isConnected: () => joined && ws.readyState === WebSocket.OPEN};
+  connect();
+})();
+"""
+
+def _response(status: int, reason: str, body: str = "", content_type: str = "text/html; charset=utf-8",
+              headers: Optional[list[tuple[str, str]]] = None) -> Response:
+    data = body.encode()
+    all_headers = Headers([
+        ("Content-Type", content_type),
+        ("Content-Length", str(len(data))),
+        ("Cache-Control", "no-store"),
+        ("Connection", "close"),
+    ])
+    for name, value in headers or ():
+        all_headers[name] = value
+    return Response(status, reason, all_headers, data)
+
+
+# ── Server ──────────────────────────────────────────────────────────
+
+
+class LiveView:
+    """A joined LiveView: the queue page, or a game page with its
+    `SeatView`. Keeps the last HTML sent so only changes are pushed."""
+
+    def __init__(self, client: "Client", topic: str, join_ref: str, player: str,
+                 seat_view: Optional[SeatView] = None) -> None:
+        self.client = client
+        self.topic = topic
+        self.join_ref = join_ref
+        self.player = player
+        self.seat_view = seat_view
+        self.html: Optional[str] = None
+
+    def push(self, event: str, payload: dict) -> None:
+        self.client.send([self.join_ref, None, self.topic, event, payload])
+
+
+class Client:
+    """One websocket. Replies and pushes go through one outbox so they
+    reach the client in the order they were made."""
+
+    def __init__(self, ws: ServerConnection) -> None:
+        self.ws = ws
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        self.views: dict[str, LiveView] = {}
+
+    def send(self, message: list) -> None:
+        self.outbox.put_nowait(json.dumps(message))
+
+    def reply(self, join_ref, ref, topic: str, status: str, response: dict) -> None:
+        self.send([join_ref, ref, topic, "phx_reply", {"status": status, "response": response}])
+
+    async def write(self) -> None:
+        while True:
+            await self.ws.send(await self.outbox.get())
+
+
+class StandinServer:
+    def __init__(
+        self,
+        strategy: str = "tbot",
+        fill_after: Optional[float] = None,
+        bot_delay: float = BOT_DELAY,
+        trick_seconds: float = TRICK_SECONDS,
+        scoring_seconds: float = SCORING_SECONDS,
+        final_seconds: float = FINAL_SECONDS,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.strategy = strategy
+        self.fill_after = fill_after
+        self.bot_delay = bot_delay
+        self.trick_seconds = trick_seconds
+        self.scoring_seconds = scoring_seconds
+        self.final_seconds = final_seconds
+        self.rng = random.Random(seed)
+        self.ids = itertools.count(1)
+        self.names: dict[str, str] = {}
+        self.bot_players: set[str] = set()
+        self.queue: list[str] = []
+        self.queued_at: dict[str, float] = {}
+        self.games: dict[str, Game] = {}
+        # Human player -> the game they are seated in.
+        self.active: dict[str, Game] = {}
+        self.views: set[LiveView] = set()
+        self.timers: dict[str, asyncio.TimerHandle] = {}
+        # Games (by id) and the queue (None) whose views need a refresh.
+        self.dirty: set[Optional[str]] = set()
+
+    def new_player(self, bot: bool = False) -> str:
+        number = next(self.ids)
+        player = f"{'bot' if bot else 'player'}{number}{self.rng.getrandbits(32):08x}"
+        self.names[player] = f"Bot {number}" if bot else f"Player {number}"
+        if bot:
+            self.bot_players.add(player)
+        return player
+
+    def new_bot(self):
+        return make_strategy(self.strategy, random.Random(self.rng.getrandbits(64)))
+
+    # ── HTTP ────────────────────────────────────────────────────────
+
+    def process_request(self, connection: ServerConnection, request: Request) -> Optional[Response]:
+        path = urlsplit(request.path).path
+        if path == "/live/websocket":
+            return None
+        if path == "/assets/standin.js":
+            return _response(200, "OK", CLIENT_JS, "text/javascript")
+        if path.startswith("/images/cards/"):
+            try:
+                return _response(200, "OK", card_svg(path.rsplit("/", 1)[1].removesuffix(".png")), "image/svg+xml")
+            except (KeyError, ValueError):
+                return _response(404, "Not Found", "Not Found", "text/plain")
+
+        cookie = SimpleCookie(request.headers.get("Cookie", ""))
+        player = cookie[PLAYER_COOKIE].value if PLAYER_COOKIE in cookie else None
+        headers = []
+        if player not in self.names:
+            player = self.new_player()
+            headers.append(("Set-Cookie", f"{PLAYER_COOKIE}={player}; Path=/; HttpOnly; SameSite=Lax"))
+
+        main_id = f"phx-{next(self.ids)}"
+        match = re.fullmatch(r"/game/(\w+)", path)
+        if path == "/play":
+            body = render_page("Queue", main_id, player, render_queue(self.queue, self.names, player))
+        elif match and self.games.get(match[1]) is self.active.get(player) is not None:
+            view = SeatView(self.games[match[1]], player)
+            body = render_page("Game", main_id, player, view.render())
+        elif path == "/" or match:
+            return _response(302, "Found", headers=headers + [("Location", "/play")])
+        else:
+            return _response(404, "Not Found", "Not Found", "text/plain")
+        return _response(200, "OK", body, headers=headers)
+
+    # ── Channel ─────────────────────────────────────────────────────
+
+    async def handler(self, ws: ServerConnection) -> None:
+        client = Client(ws)
+        writer = asyncio.create_task(client.write())
+        try:
+            async for raw in ws:
+                try:
+                    join_ref, ref, topic, event, payload = json.loads(raw)
+                except (TypeError, ValueError):
+                    continue
+                self.dispatch(client, join_ref, ref, topic, event, payload)
+        except ConnectionClosed:
+            pass
+        finally:
+            for view in list(client.views.values()):
+                self.leave(view)
+            writer.cancel()
+
+    def dispatch(self, client: Client, join_ref, ref, topic: str, event: str, payload) -> None:
+        if topic == "phoenix":
+            client.reply(None, ref, topic, "ok", {})
+        elif event == "phx_join":
+            self.join(client, join_ref, ref, topic, payload if isinstance(payload, dict) else {})
+        elif event == "phx_leave":
+            if topic in client.views:
+                self.leave(client.views[topic])
+            client.reply(join_ref, ref, topic, "ok", {})
+        elif event == "event" and topic in client.views and isinstance(payload, dict):
+            view = client.views[topic]
+            response = self.handle_event(view, payload.get("event"), payload.get("value"))
+            client.reply(join_ref, ref, topic, "ok", response)
+            self.refresh()
+        else:
+            client.reply(join_ref, ref, topic, "error", {"reason": "unmatched topic"})
+
+    def join(self, client: Client, join_ref, ref, topic: str, payload: dict) -> None:
+        player = payload.get("session")
+        path = urlsplit(str(payload.get("url", ""))).path
+        match = re.fullmatch(r"/game/(\w+)", path)
+        if player not in self.names:
+            client.reply(join_ref, ref, topic, "error", {"redirect": {"to": "/play"}})
+            return
+        if match and self.games.get(match[1]) is self.active.get(player) is not None:
+            view = LiveView(client, topic, join_ref, player, SeatView(self.games[match[1]], player))
+        elif path == "/play":
+            view = LiveView(client, topic, join_ref, player)
+        else:
+            client.reply(join_ref, ref, topic, "error", {"live_redirect": {"to": "/play", "kind": "push"}})
+            return
+        if topic in client.views:
+            self.leave(client.views[topic])
+        client.views[topic] = view
+        self.views.add(view)
+        view.html = self.render(view)
+        client.reply(join_ref, ref, topic, "ok", {"rendered": {"0": view.html, "s": ["", ""]}})
+
+    def leave(self, view: LiveView) -> None:
+        self.views.discard(view)
+        view.client.views.pop(view.topic, None)
+        if view.seat_view is None and not any(
+            v.player == view.player and v.seat_view is None for v in self.views
+        ):
+            self.dequeue(view.player)
+        self.refresh()
+
+    def render(self, view: LiveView) -> str:
+        if view.seat_view is not None:
+            return view.seat_view.render()
+        return render_queue(self.queue, self.names, view.player)
+
+    def diff(self, view: LiveView) -> dict:
+        html = self.render(view)
+        if html == view.html:
+            return {}
+        view.html = html
+        return {"0": html}
+
+    def refresh(self) -> None:
+        """Pushes a diff to every view of a changed game or of the queue."""
+        dirty, self.dirty = self.dirty, set()
+        for view in list(self.views):
+            key = view.seat_view.game.id if view.seat_view is not None else None
+            if key not in dirty or (key is not None and key not in self.games):
+                continue
+            diff = self.diff(view)
+            if diff:
+                view.push("diff", diff)
+
+    def redirect(self, player: str, to: str, in_game: bool) -> None:
+        for view in list(self.views):
+            if view.player == player and (view.seat_view is not None) == in_game:
+                view.push("live_redirect", {"to": to, "kind": "push"})
+
+    def handle_event(self, view: LiveView, event, value) -> dict:
+        """Applies an event and returns the reply: the view's own diff, or
+        a redirect."""
+        player = view.player
+        if view.seat_view is None:
+            if event == "join":
+                self.enqueue(player)
+            elif event == "leave":
+                self.dequeue(player)
+            elif event == "fill_bots":
+                self.enqueue(player)
+                self.fill_queue()
+            return {"diff": self.diff(view)}
+
+        seat_view = view.seat_view
+        game = seat_view.game
+        if game.id not in self.games:
+            return {"live_redirect": {"to": "/play", "kind": "push"}}
+        if event == "exit_game":
+            self.abandon(game, seat_view.seat)
+            return {"live_redirect": {"to": "/play", "kind": "push"}}
+        if seat_view.handle(event, value if isinstance(value, dict) else {}):
+            self.advance(game)
+        return {"diff": self.diff(view)}
+
+    # ── Queue ───────────────────────────────────────────────────────
+
+    def enqueue(self, player: str) -> None:
+        if player in self.queue or player in self.active:
+            return
+        self.queue.append(player)
+        self.queued_at[player] = asyncio.get_running_loop().time()
+        self.dirty.add(None)
+        self.match()
+
+    def dequeue(self, player: str) -> None:
+        if player in self.queue:
+            self.queue.remove(player)
+            self.queued_at.pop(player, None)
+            self.dirty.add(None)
+
+    def fill_queue(self) -> None:
+        """Seats bots beside whoever is waiting, up to a full table."""
+        while self.queue and len(self.queue) % 4:
+            self.queue.append(self.new_player(bot=True))
+        self.dirty.add(None)
+        self.match()
+
+    def match(self) -> None:
+        while len(self.queue) >= 4:
+            players, self.queue = self.queue[:4], self.queue[4:]
+            self.dirty.add(None)
+            game = Game(f"{next(self.ids)}{self.rng.getrandbits(32):08x}", players, self.names, self.rng)
+            for seat, player in enumerate(players):
+                self.queued_at.pop(player, None)
+                if player in self.bot_players:
+                    game.bots[seat] = self.new_bot()
+                else:
+                    self.active[player] = game
+            self.games[game.id] = game
+            for player in players:
+                self.redirect(player, f"/game/{game.id}", in_game=False)
+            self.advance(game)
+
+    async def fill_waiting(self) -> None:
+        """Fills the queue with bots once someone has waited `fill_after`."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(0.25)
+            if self.queue and loop.time() - min(self.queued_at.values()) >= self.fill_after:
+                self.fill_queue()
+                self.refresh()
+
+    # ── Games ───────────────────────────────────────────────────────
+
+    def abandon(self, game: Game, seat: int) -> None:
+        """The seat's player left; a bot finishes their game."""
+        player = game.players[seat]
+        self.active.pop(player, None)
+        game.bots.setdefault(seat, self.new_bot())
+        if len(game.bots) == 4:
+            self.end_game(game)
+        else:
+            self.advance(game)
+
+    def advance(self, game: Game) -> None:
+        """Schedules what the game waits for next: bots, or the end of a
+        scoring phase."""
+        self.dirty.add(game.id)
+        if game.id in self.timers or game.id not in self.games:
+            return
+        loop = asyncio.get_running_loop()
+        if game.phase == "Scoring":
+            self.timers[game.id] = loop.call_later(self.scoring_seconds, self.on_timer, game, game.next_round)
+        elif game.phase == "Final Scoring":
+            self.timers[game.id] = loop.call_later(self.final_seconds, self.end_game, game)
+        elif game.trick_over:
+            self.timers[game.id] = loop.call_later(self.trick_seconds, self.on_timer, game, game.finish_trick)
+        elif game.bots_to_act:
+            self.timers[game.id] = loop.call_later(self.bot_delay, self.on_timer, game, game.bot_turn)
+
+    def on_timer(self, game: Game, action) -> None:
+        del self.timers[game.id]
+        action()
+        self.advance(game)
+        self.refresh()
+
+    def end_game(self, game: Game) -> None:
+        timer = self.timers.pop(game.id, None)
+        if timer is not None:
+            timer.cancel()
+        self.games.pop(game.id, None)
+        for player in game.players:
+            if self.active.get(player) is game:
+                del self.active[player]
+                self.redirect(player, "/play", in_game=True)
+
+    async def serve(self, host: str, port: int) -> None:
+        tasks = [asyncio.create_task(self.fill_waiting())] if self.fill_after is not None else []
+        async with serve(self.handler, host, port, process_request=self.process_request, max_size=None):
+            print(f"Stand-in server on http://{host}:{port}/play")
+            try:
+                await asyncio.Future()
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the 45s game server.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--strategy", default="tbot", help="Strategy for bot seats (see tournament.py)")
+    parser.add_argument("--fill-after", type=float, default=None,
+                        help="Seconds a player waits in the queue before bots fill the table")
+    parser.add_argument("--bot-delay", type=float, default=BOT_DELAY)
+    parser.add_argument("--trick-seconds", type=float, default=TRICK_SECONDS)
+    parser.add_argument("--scoring-seconds", type=float, default=SCORING_SECONDS)
+    parser.add_argument("--final-seconds", type=float, default=FINAL_SECONDS)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = StandinServer(
+        strategy=args.strategy,
+        fill_after=args.fill_after,
+        bot_delay=args.bot_delay,
+        trick_seconds=args.trick_seconds,
+        scoring_seconds=args.scoring_seconds,
+        final_seconds=args.final_seconds,
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+from typing import Optional
+
+from card import SUITS, SUIT_INDEX, Suit, Card, rank_map
+
+FACE_CARD_POINTS = {5: 12, 11: 6, 1: 4, 13: 3, 12: 2}
+ACE_OF_HEARTS = Card("1", Suit.HEARTS)
+
+
+def evaluate_hand_bid(player_hand: list[Card]) -> tuple[int, Suit]:
+    # Per suit, in SUITS order; the ace of hearts counts for every suit.
+    small_cards = [0, 0, 0, 0]
+    sure_points = [0, 0, 0, 0]
+    ace_of_hearts = 0
+
+    for card in player_hand:
+        if card is ACE_OF_HEARTS:
+            ace_of_hearts = 5
+        elif card.value in FACE_CARD_POINTS:
+            sure_points[SUIT_INDEX[card.suit]] += FACE_CARD_POINTS[card.value]
+        else:
+            small_cards[SUIT_INDEX[card.suit]] += 1
+
+    best = max(range(4), key=sure_points.__getitem__)
+    estimated_value = small_cards[best] * 3 + sure_points[best] + ace_of_hearts
+
+    if estimated_value >= 15:
+        return int(estimated_value // 5) * 5, SUITS[best]
+    else:
+        return 0, SUITS[best]
+
+
+def get_max_card(cards: list[Card], suit_led: Suit, trump: Suit) -> Optional[Card]:
+    if len(cards) == 0:
+        return None
+    return max(cards, key=rank_map(suit_led, trump).__getitem__)
+
+
+def get_min_card(cards: list[Card], suit_led: Suit, trump: Suit) -> Optional[Card]:
+    if len(cards) == 0:
+        return None
+    # less_than breaks ties between losing cards towards the later card.
+    return min(reversed(cards), key=rank_map(suit_led, trump).__getitem__)
+
+
+def evaluate_hand_play(
+    suit_led: Suit,
+    player_hand: list[Card],
+    current_cards: list[Card],
+    trump: Suit,
+) -> Card:
+    # Works on the ranks directly: less_than(a, b) is ranks[a] < ranks[b],
+    # or both ranks 0 (see card.RANK_TABLES).
+    rank = rank_map(suit_led, trump).__getitem__
+    players_max_card = max(player_hand, key=rank)
+    if not current_cards:
+        return players_max_card
+
+    players_max = rank(players_max_card)
+    if players_max and players_max >= max(map(rank, current_cards)):
+        return players_max_card
+
+    # The fallbacks are only needed when we cannot win the trick.
+    if suit_led == trump:
+        players_worst_trump = get_min_card(
+            [card for card in player_hand if card.suit == trump], suit_led, trump
+        )
+        if players_worst_trump:
+            return players_worst_trump
+
+    players_lowest_offsuite = get_min_card(
+        [card for card in player_hand if card.suit != suit_led and card.suit != trump],
+        suit_led,
+        trump,
+    )
+    if players_lowest_offsuite:
+        return players_lowest_offsuite
+
+    return player_hand[0]
+
+
+def choose_bid(player_hand: list[Card], max_bid: int, bagged: bool) -> tuple[int, Suit]:
+    value, suit = evaluate_hand_bid(player_hand)
+
+    if bagged:
+        return 15, suit
+    if value > max_bid:
+        return value, suit
+    return 0, Suit.PASS
+
+
+def choose_discard(player_hand: list[Card], trump: Suit) -> list[Card]:
+    keep = [c for c in player_hand if c.suit == trump or c.value == 13]
+    if not keep:
+        keep = player_hand[:5]
+    return keep[:5]
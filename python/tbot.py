@@ -1,18 +1,24 @@
 import json
 import os
+import re
+import threading
 import time
 from pathlib import Path
-from typing import Optional
-
-from bs4 import BeautifulSoup
-from card import Suit, Card, less_than, is_ace_of_hearts
-from selenium import webdriver
+from typing import Callable, Optional
+
+from browserpool import BrowserPool, get_driver
+from card import Suit, Card
+from rules import HAND_SIZE, WINNING_SCORE
+from flightrecorder import DEFAULT_CAPACITY, FlightRecorder
+from gameview import GameView, card_value, game_view_from_json
+from metrics import Metrics
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
+from strategy import choose_bid, choose_discard, evaluate_hand_play
+from tracing import DEFAULT_MAX_EVENTS, Tracer, write_trace
+from transcript import Transcript, append_transcript
 
 ACTION_TIMEOUT = 20
 JOIN_TIMEOUT = 120
@@ -20,169 +26,158 @@ MATCH_TIMEOUT = 180
 PHASE_TIMEOUT = 180
 POLL_INTERVAL = 0.5
 TOTAL_RUNTIME_TIMEOUT = 900
-
-
-def get_driver() -> webdriver.Chrome:
-    chrome_options = Options()
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--headless=new")
-
-    chromedriver_path = "/usr/local/bin/chromedriver"
-    if os.path.exists(chromedriver_path):
-        service = Service(executable_path=chromedriver_path)
-        return webdriver.Chrome(service=service, options=chrome_options)
-
-    return webdriver.Chrome(options=chrome_options)
-
-
-def evaluate_hand_bid(player_hand: list[Card]) -> tuple[int, Suit]:
-    small_cards = {Suit.HEARTS: 0, Suit.DIAMONDS: 0, Suit.CLUBS: 0, Suit.SPADES: 0}
-    sure_points = {Suit.HEARTS: 0, Suit.DIAMONDS: 0, Suit.CLUBS: 0, Suit.SPADES: 0}
-    face_card_points = {5: 12, 11: 6, 1: 4, 13: 3, 12: 2}
-
-    for card in player_hand:
-        if is_ace_of_hearts(card):
-            for key in sure_points:
-                sure_points[key] += 5
-        elif card.value in face_card_points:
-            sure_points[card.suit] += face_card_points[card.value]
-        else:
-            small_cards[card.suit] += 1
-
-    max_sure_suit = max(sure_points, key=sure_points.get)
-    estimated_value = small_cards[max_sure_suit] * 3 + sure_points[max_sure_suit]
-
-    if estimated_value >= 15:
-        return int(estimated_value // 5) * 5, max_sure_suit
-    else:
-        return 0, max_sure_suit
-
-
-def get_max_card(cards: list[Card], suit_led: Suit, trump: Suit) -> Optional[Card]:
-    if len(cards) == 0:
-        return None
-    max_card = cards[0]
-    for card in cards[1:]:
-        if not less_than(card, max_card, suit_led, trump):
-            max_card = card
-    return max_card
-
-
-def get_min_card(cards: list[Card], suit_led: Suit, trump: Suit) -> Optional[Card]:
-    if len(cards) == 0:
-        return None
-    min_card = cards[0]
-    for card in cards[1:]:
-        if less_than(card, min_card, suit_led, trump):
-            min_card = card
-    return min_card
-
-
-def evaluate_hand_play(
-    suit_led: Suit,
-    player_hand: list[Card],
-    current_cards: list[Card],
-    trump: Suit,
-) -> Card:
-    if not current_cards:
-        max_card = None
-    else:
-        max_card = get_max_card(current_cards, suit_led, trump)
-
-    players_max_card = get_max_card(player_hand, suit_led, trump)
-    players_lowest_offsuite = get_min_card(
-        [card for card in player_hand if card.suit != suit_led and card.suit != trump],
-        suit_led,
-        trump,
-    )
-    players_worst_trump = (
-        get_min_card(
-            [card for card in player_hand if card.suit == trump], suit_led, trump
-        )
-        if any(card.suit == trump for card in player_hand)
-        else None
-    )
-
-    if not max_card:
-        return players_max_card
-
-    if not less_than(players_max_card, max_card, suit_led, trump):
-        return players_max_card
-    elif suit_led == trump and players_worst_trump:
-        return players_worst_trump
-    elif players_lowest_offsuite:
-        return players_lowest_offsuite
-
-    return player_hand[0]
+# "greedy" plays evaluate_hand_play, "rollout" uses rollout.choose_card and
+# "ismcts" searches with ismcts.ISMCTS.
+PLAY_MODE = os.getenv("TBOT_PLAY_MODE", "greedy")
+# "greedy" keeps strategy.choose_discard's cards, "search" uses
+# discard.DiscardOptimizer and "ismcts" ismcts.ISMCTS.
+DISCARD_MODE = os.getenv("TBOT_DISCARD_MODE", "greedy")
+# Transcript source, naming the rules that made the recorded decisions.
+TRANSCRIPT_SOURCE = f"tbot:{PLAY_MODE}/{DISCARD_MODE}"
+# An entry of the actions line during bidding: "ann bid 20", "bob passed".
+BID_ACTION = re.compile(r"(.+) (?:bid (\d+)|passed)")
+# "event" blocks on a MutationObserver until the page changes, "poll" sleeps
+# POLL_INTERVAL between checks.
+WAIT_MODE = os.getenv("TBOT_WAIT_MODE", "event")
+# Games each bot plays back to back on one warm driver.
+SESSION_GAMES = int(os.getenv("TBOT_GAMES", "1"))
+# Events the flight recorder keeps for the failure timeline.
+FLIGHT_EVENTS = int(os.getenv("TBOT_FLIGHT_EVENTS", str(DEFAULT_CAPACITY)))
+# "1" records the trace-event timeline (tracing.py), keeping the last
+# TRACE_EVENTS events.
+TRACE = os.getenv("TBOT_TRACE", "0") == "1"
+TRACE_EVENTS = int(os.getenv("TBOT_TRACE_EVENTS", str(DEFAULT_MAX_EVENTS)))
+
+# Everything the bot reads from the page, extracted in the browser in one
+# round trip and returned as JSON for gameview.game_view_from_json.
+GAME_VIEW_JS = """
+const dataAttrs = (el) => el && Object.fromEntries(
+  el.getAttributeNames().filter((name) => name.startsWith("data-"))
+    .map((name) => [name, el.getAttribute(name)])
+);
+const main = document.querySelector("[data-phx-main]");
+return JSON.stringify({
+  url: location.href,
+  connected: Boolean(main && main.classList.contains("phx-connected")),
+  queueRoot: Boolean(document.getElementById("queue-root")),
+  container: dataAttrs(document.getElementById("game-container")),
+  hand: dataAttrs(document.getElementById("player-hand")),
+  handCards: Array.from(
+    document.querySelectorAll("#player-hand img.card"),
+    (el) => [el.getAttribute("data-card-value"), el.classList.contains("grayed-out")]
+  ),
+  table: Array.from(document.querySelectorAll("#table img"), (el) => el.getAttribute("phx-value-card")),
+  actions: document.querySelector("#game-container .actions-list")?.textContent ?? "",
+  scoreRows: Array.from(
+    document.querySelectorAll("#game-container tbody tr"),
+    (row) => Array.from(row.cells, (cell) => cell.textContent.trim().replace(/\s+/g, " "))
+  ),
+  buttons: Array.from(document.querySelectorAll("button[id]"), (el) => [el.id, !el.disabled]),
+});
+"""
+
+# Page size after each game; growth over a session points at a leak.
+PAGE_STATS_JS = """
+return {
+  heapBytes: performance.memory ? performance.memory.usedJSHeapSize : null,
+  domNodes: document.getElementsByTagName("*").length,
+};
+"""
+
+# Resolves with the game view JSON as soon as it differs from arguments[0],
+# or after arguments[1] milliseconds.
+WAIT_FOR_CHANGE_JS = f"""
+const [known, timeoutMs, done] = arguments;
+const read = () => {{ {GAME_VIEW_JS} }};
+let finished = false;
+const finish = (state) => {{
+  if (finished) return;
+  finished = true;
+  observer.disconnect();
+  clearTimeout(timer);
+  done(state);
+}};
+const check = () => {{
+  const state = read();
+  if (state !== known) finish(state);
+}};
+const observer = new MutationObserver(check);
+const timer = setTimeout(() => finish(read()), timeoutMs);
+observer.observe(document.documentElement, {{subtree: true, childList: true, attributes: true}});
+check();
+"""
 
 
 class PhxWeb:
-    def __init__(self, url: str) -> None:
+    def __init__(self, url: str, driver=None, instance: Optional[str] = None) -> None:
+        """`driver` is a `browserpool.PooledDriver` to run in a shared
+        Chrome; without one the bot launches its own."""
         self.url = url
-        self.driver = get_driver()
-        self.instance = os.getenv("TBOT_INSTANCE", str(os.getpid()))
+        self.game_url: Optional[str] = None
+        self.instance = instance or os.getenv("TBOT_INSTANCE", str(os.getpid()))
+        self.metrics = Metrics(labels={"instance": self.instance})
+        if driver is None:
+            with self.metrics.time("driver_startup"):
+                driver = get_driver()
+        self.driver = driver
+        # A blocking wait would stall every other tab in a shared browser.
+        self.wait_mode = "poll" if getattr(driver, "shared", False) else WAIT_MODE
+        # The cards of this round's tricks as last seen on the table, by
+        # trick number, and the cards we played this round.
+        self.tricks: dict[int, list[Card]] = {}
+        self.played: set[int] = set()
+        # Search engines for the non-greedy modes, built on first use.
+        self._ismcts = None
+        self._discarder = None
+        # Game view JSON as of the last wait_for_change.
+        self.watched_state: Optional[str] = None
+        self.reconnects = 0
+        # One timing record per finished game of the session.
+        self.games: list[dict] = []
+        # This bot's decisions in the current game, for transcript.py replay,
+        # with the bids seen this round and the team totals so far.
+        self.transcript = Transcript(TRANSCRIPT_SOURCE)
+        self.bids: list[list] = []
+        self.scores: Optional[list[int]] = None
+        self.rounds_scored = 0
+        # The last states, clicks, waits and log lines, dumped on failure.
+        self.recorder = FlightRecorder(FLIGHT_EVENTS)
+        self.tracer = Tracer(self.instance, enabled=TRACE, max_events=TRACE_EVENTS)
+        self.driver.set_script_timeout(PHASE_TIMEOUT + ACTION_TIMEOUT)
+
+    @property
+    def ismcts(self):
+        """Keeps its search tree between our plays in a hand."""
+        if self._ismcts is None:
+            from ismcts import ISMCTS, LIVE_TIME_BUDGET
+            self._ismcts = ISMCTS(time_budget=LIVE_TIME_BUDGET, max_iterations=None)
+        return self._ismcts
+
+    @property
+    def discarder(self):
+        if self._discarder is None:
+            from discard import DiscardOptimizer
+            self._discarder = DiscardOptimizer()
+        return self._discarder
 
     def log(self, msg: str) -> None:
+        self.recorder.log(msg)
+        self.tracer.instant(msg, "log")
         print(f"[tbot {self.instance}] {msg}", flush=True)
 
-    def snapshot(self) -> BeautifulSoup:
-        return BeautifulSoup(self.driver.page_source, "html.parser")
-
-    def get_phase(self, soup: BeautifulSoup) -> str:
-        container = soup.find(id="game-container")
-        if container:
-            return container.get("data-phase", "")
-        return ""
-
-    def is_my_turn(self, soup: BeautifulSoup) -> bool:
-        container = soup.find(id="game-container")
-        if container:
-            return container.get("data-current-turn") == "true"
-        return False
-
-    def is_auto_playing(self, soup: BeautifulSoup) -> bool:
-        container = soup.find(id="game-container")
-        if container:
-            return container.get("data-auto-playing") == "true"
-        return False
-
-    def is_bagged(self, soup: BeautifulSoup) -> bool:
-        container = soup.find(id="game-container")
-        if container:
-            return container.get("data-bagged") == "true"
-        return False
-
-    def get_max_bid(self, soup: BeautifulSoup) -> int:
-        container = soup.find(id="game-container")
-        if container:
-            return int(container.get("data-current-bid", "0"))
-        return 0
-
-    def get_trump(self, soup: BeautifulSoup) -> Optional[Suit]:
-        container = soup.find(id="game-container")
-        if container:
-            raw = (container.get("data-trump") or "").strip()
-            if raw and raw not in ("", "nil", "none"):
-                return Suit[raw.upper()]
-        return None
-
-    def get_suit_led(self, soup: BeautifulSoup) -> Optional[Suit]:
-        container = soup.find(id="game-container")
-        if container:
-            raw = (container.get("data-suit-led") or "").strip()
-            if raw and raw not in ("", "nil", "none"):
-                return Suit[raw.upper()]
-        return None
-
-    def has_confirmed_discard(self, soup: BeautifulSoup) -> bool:
-        container = soup.find(id="game-container")
-        if container:
-            return container.get("data-confirm-discard-clicked") == "true"
-        return False
+    def snapshot(self) -> GameView:
+        with self.tracer.span("snapshot", "browser"):
+            raw = self.driver.execute_script(GAME_VIEW_JS)
+        self.recorder.state(raw)
+        return game_view_from_json(raw)
+
+    def click(self, locator: tuple[str, str]) -> None:
+        """Clicks the element at `locator` once it is clickable."""
+        self.recorder.action(f"click {locator[1]}")
+        with self.tracer.span("click", "browser", target=locator[1]):
+            WebDriverWait(self.driver, ACTION_TIMEOUT).until(
+                EC.element_to_be_clickable(locator)
+            ).click()
 
     def live_socket_connected(self) -> bool:
         return bool(
@@ -197,198 +192,226 @@ class PhxWeb:
             )
         )
 
-    def wait_until(self, predicate, timeout: int, description: str) -> None:
-        deadline = time.time() + timeout
-        last_exc = None
-        while time.time() < deadline:
+    def wait_for_change(self, deadline: float) -> None:
+        """Blocks until the watched page state differs from the one seen by
+        the previous call, or until `deadline`.
+
+        The state compared against is always at least as old as any
+        snapshot taken since, so a change can't slip in between a check
+        and the wait; at worst the wait returns at once and the caller
+        checks again.
+        """
+        if self.wait_mode != "event":
+            with self.tracer.span("poll_sleep", "wait"):
+                time.sleep(POLL_INTERVAL)
+            return
+
+        timeout = min(max(deadline - time.time(), 0), PHASE_TIMEOUT)
+        with self.tracer.span("wait_for_change", "wait"):
             try:
-                if predicate():
-                    return
-            except Exception as exc:
-                last_exc = exc
-            time.sleep(POLL_INTERVAL)
-        msg = f"Timed out: {description}"
-        if last_exc is not None:
-            msg += f" (last error: {type(last_exc).__name__}: {last_exc})"
-        raise TimeoutException(msg)
+                self.watched_state = self.driver.execute_async_script(
+                    WAIT_FOR_CHANGE_JS, self.watched_state, int(timeout * 1000)
+                )
+                self.recorder.state(self.watched_state)
+            except WebDriverException:
+                # A full navigation unloads the page under the script. Count it
+                # as a change, at polling pace in case the script keeps failing.
+                self.watched_state = None
+                time.sleep(POLL_INTERVAL)
+
+    def wait_until(
+        self, predicate, timeout: int, description: str, stage: Optional[str] = None
+    ) -> None:
+        """Waits for `predicate`; with `stage`, the time the wait took is
+        recorded in that stage's histogram."""
+        with self.tracer.span("wait_until", "wait", description=description):
+            start = time.perf_counter()
+            deadline = time.time() + timeout
+            last_exc = None
+            while time.time() < deadline:
+                try:
+                    if predicate():
+                        elapsed = time.perf_counter() - start
+                        self.recorder.wait(description, elapsed, True)
+                        if stage:
+                            self.metrics.observe(stage, elapsed)
+                        return
+                except Exception as exc:
+                    last_exc = exc
+                self.wait_for_change(deadline)
+            self.recorder.wait(description, time.perf_counter() - start, False)
+            msg = f"Timed out: {description}"
+            if last_exc is not None:
+                msg += f" (last error: {type(last_exc).__name__}: {last_exc})"
+            # Inside the span, so the trace marks the wait as failed.
+            raise TimeoutException(msg)
+
+    def wait_for_view(
+        self,
+        predicate: Callable[[GameView], bool],
+        timeout: int,
+        description: str,
+        stage: Optional[str] = None,
+    ) -> None:
+        """`wait_until` on one fresh snapshot per check."""
+        self.wait_until(lambda: predicate(self.snapshot()), timeout, description, stage)
 
     # ── Join queue and wait for game ────────────────────────────────
 
-    def click_join_queue(self) -> None:
-        self.driver.get(self.url)
-        WebDriverWait(self.driver, JOIN_TIMEOUT).until(
-            EC.presence_of_element_located((By.ID, "queue-root"))
-        )
-        self.wait_until(self.live_socket_connected, ACTION_TIMEOUT, "LiveView connection")
-        self.log("Queue LiveView is connected.")
+    def load_queue_page(self) -> None:
+        with self.metrics.time("page_load"):
+            self.driver.get(self.url)
+            WebDriverWait(self.driver, JOIN_TIMEOUT).until(
+                EC.presence_of_element_located((By.ID, "queue-root"))
+            )
 
-        WebDriverWait(self.driver, ACTION_TIMEOUT).until(
-            EC.element_to_be_clickable((By.ID, "join-queue-button"))
-        ).click()
+    def ensure_connected(self) -> None:
+        """Waits for the LiveView socket; if it stays down, the socket is
+        stale and the queue page is reloaded to get a fresh one."""
+        try:
+            self.wait_until(
+                self.live_socket_connected, ACTION_TIMEOUT, "LiveView connection", "liveview_connect"
+            )
+            return
+        except TimeoutException:
+            self.log("LiveView socket is stale. Reloading the queue page.")
+        self.reconnects += 1
+        with self.metrics.time("reconnect"):
+            self.load_queue_page()
+            self.wait_until(self.live_socket_connected, ACTION_TIMEOUT, "LiveView reconnection")
 
-        self.wait_until(
-            lambda: "/game/" in self.driver.current_url
-            or len(self.driver.find_elements(By.ID, "leave-queue-button")) == 1,
-            ACTION_TIMEOUT,
-            "queue join acknowledgement",
-        )
-        self.wait_until(
-            lambda: "/game/" in self.driver.current_url,
-            MATCH_TIMEOUT,
-            "matchmaking redirect",
-        )
-        self.wait_until(
-            lambda: len(self.driver.find_elements(By.ID, "game-container")) == 1,
-            ACTION_TIMEOUT,
-            "game page load",
-        )
+    def click_join_queue(self) -> None:
+        # Later games of a session start on the queue page already.
+        if not self.snapshot().queue_ready:
+            self.load_queue_page()
+        self.ensure_connected()
+        self.log("Queue LiveView is connected.")
 
-        self.url = self.driver.current_url
-        self.log(f"Redirected to {self.url}")
+        with self.metrics.time("queue_join"):
+            self.click((By.ID, "join-queue-button"))
 
-    # ── Snapshot-based hand extraction ──────────────────────────────
+            self.wait_for_view(
+                lambda view: "/game/" in view.url or view.in_queue,
+                ACTION_TIMEOUT,
+                "queue join acknowledgement",
+            )
+        with self.metrics.time("match_wait"):
+            self.wait_for_view(
+                lambda view: "/game/" in view.url,
+                MATCH_TIMEOUT,
+                "matchmaking redirect",
+            )
+            self.wait_for_view(
+                lambda view: view.in_game,
+                ACTION_TIMEOUT,
+                "game page load",
+            )
 
-    def extract_hand(self, soup: BeautifulSoup, playable_only: bool = False) -> list[Card]:
-        hand = []
-        player_hand_div = soup.find(id="player-hand")
-        if not player_hand_div:
-            return hand
-        for img in player_hand_div.find_all("img", class_="card"):
-            if playable_only and "grayed-out" in (img.get("class") or []):
-                continue
-            card_value = img.get("data-card-value")
-            if card_value:
-                value, suit = card_value.split("_")
-                hand.append(Card(value, Suit[suit.upper()]))
-        return hand
-
-    def extract_played_cards(self, soup: BeautifulSoup) -> list[Card]:
-        cards = []
-        table = soup.find(id="table")
-        if not table:
-            return cards
-        for img in table.find_all("img"):
-            card_value = img.get("phx-value-card")
-            if card_value:
-                value, suit = card_value.split("_")
-                cards.append(Card(value, Suit[suit.upper()]))
-        return cards
+        self.game_url = self.driver.current_url
+        self.log(f"Redirected to {self.game_url}")
 
     # ── Auto-play recovery ──────────────────────────────────────────
 
-    def resume_control_if_needed(self, soup: BeautifulSoup) -> bool:
+    def resume_control_if_needed(self, view: GameView) -> bool:
         """If auto-playing, click resume and wait. Returns True if we resumed."""
-        if not self.is_auto_playing(soup):
+        if not view.auto_playing:
             return False
 
-        buttons = self.driver.find_elements(By.ID, "resume-control-button")
-        if not buttons:
+        if "resume-control-button" not in view.buttons:
             raise RuntimeError("Auto-play is on but resume button is missing.")
 
-        WebDriverWait(self.driver, ACTION_TIMEOUT).until(
-            EC.element_to_be_clickable((By.ID, "resume-control-button"))
-        ).click()
+        self.click((By.ID, "resume-control-button"))
 
-        self.wait_until(
-            lambda: not self.is_auto_playing(self.snapshot()),
+        self.wait_for_view(
+            lambda view: not view.auto_playing,
             ACTION_TIMEOUT,
             "manual control resume",
+            "resume_acceptance",
         )
         self.log("Resumed manual control.")
         return True
 
     # ── Card selection via Selenium click ───────────────────────────
 
-    def selected_cards(self) -> list[str]:
-        hand = self.driver.find_element(By.ID, "player-hand")
-        raw = hand.get_attribute("data-selected-cards") or "[]"
-        return json.loads(raw)
-
-    def select_card(self, card: Card) -> None:
-        card_value = f"{card.value}_{card.suit.long_name()}"
-        if card_value in self.selected_cards():
+    def select_card(self, card: Card, view: GameView) -> None:
+        value = card_value(card)
+        if value in view.selected:
             return
 
-        selector = f"img[data-card-value='{card_value}']"
-        WebDriverWait(self.driver, ACTION_TIMEOUT).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-        ).click()
+        selector = f"img[data-card-value='{value}']"
+        self.click((By.CSS_SELECTOR, selector))
 
-        self.wait_until(
-            lambda: card_value in self.selected_cards(),
+        self.wait_for_view(
+            lambda view: value in view.selected,
             ACTION_TIMEOUT,
-            f"{card_value} selection",
+            f"{value} selection",
+            "card_selection",
         )
-        self.log(f"Selected card {card_value}.")
+        self.log(f"Selected card {value}.")
 
     # ── Phase: Bidding ──────────────────────────────────────────────
 
     def bidding_phase(self) -> None:
         deadline = time.time() + PHASE_TIMEOUT
+        self.tricks.clear()
+        self.played.clear()
 
         while time.time() < deadline:
-            soup = self.snapshot()
-            phase = self.get_phase(soup)
-            if phase != "Bidding":
+            view = self.snapshot()
+            if view.phase != "Bidding":
                 return
+            self.observe_bids(view)
 
-            if self.resume_control_if_needed(soup):
+            if self.resume_control_if_needed(view):
                 continue
 
-            if not self.is_my_turn(soup):
-                time.sleep(POLL_INTERVAL)
+            if not view.my_turn:
+                self.wait_for_change(deadline)
                 continue
 
-            hand = self.extract_hand(soup)
-            max_bid = self.get_max_bid(soup)
-            bagged = self.is_bagged(soup)
+            hand = view.hand
+            max_bid = view.current_bid
+            bagged = view.bagged
             self.log(f"Extracted hand: {hand}")
             self.log(f"It's my turn to bid. Current max bid: {max_bid}")
 
-            value, suit = evaluate_hand_bid(hand)
-
-            if bagged:
-                self.place_bid(15, suit)
-            elif value > max_bid:
-                self.place_bid(value, suit)
-            else:
-                self.place_bid(0, Suit.PASS)
+            with self.tracer.span("choose_bid", "think"):
+                decision = choose_bid(hand, max_bid, bagged)
+            self.transcript.bid(None, hand, max_bid, bagged, decision)
+            with self.metrics.time("bid"):
+                self.place_bid(*decision)
 
-            self.wait_until(
-                lambda: self.get_phase(self.snapshot()) != "Bidding"
-                or not self.is_my_turn(self.snapshot()),
+            self.wait_for_view(
+                lambda view: view.phase != "Bidding" or not view.my_turn,
                 ACTION_TIMEOUT,
                 "bid acceptance",
+                "bid_acceptance",
             )
 
         raise TimeoutException("Bidding phase timed out.")
 
+    def observe_bids(self, view: GameView) -> None:
+        """Remembers the round's bids so far as `[player, bid]`. The actions
+        line only grows during bidding, so the latest look is the fullest."""
+        bids = [
+            [match[1], int(match[2] or 0)]
+            for match in map(BID_ACTION.fullmatch, view.actions) if match
+        ]
+        if len(bids) >= len(self.bids):
+            self.bids = bids
+
     def place_bid(self, bid_value: int, bid_suit: Suit) -> None:
         if bid_value == 0 or bid_suit == Suit.PASS:
-            WebDriverWait(self.driver, ACTION_TIMEOUT).until(
-                EC.element_to_be_clickable((By.ID, "pass-bid-button"))
-            ).click()
+            self.click((By.ID, "pass-bid-button"))
             self.log("Passed the bid.")
             return
 
-        WebDriverWait(self.driver, ACTION_TIMEOUT).until(
-            EC.element_to_be_clickable((
-                By.CSS_SELECTOR,
-                f"button[phx-value-bid-number='{bid_value}']:not([disabled])",
-            ))
-        ).click()
-        WebDriverWait(self.driver, ACTION_TIMEOUT).until(
-            EC.element_to_be_clickable((
-                By.CSS_SELECTOR,
-                f"button[phx-value-bid-suit='{bid_suit.long_name()}']:not([disabled])",
-            ))
-        ).click()
-        WebDriverWait(self.driver, ACTION_TIMEOUT).until(
-            EC.element_to_be_clickable((
-                By.CSS_SELECTOR,
-                "#confirm-bid-button:not([disabled])",
-            ))
-        ).click()
+        self.click((By.CSS_SELECTOR, f"button[phx-value-bid-number='{bid_value}']:not([disabled])"))
+        self.click((
+            By.CSS_SELECTOR,
+            f"button[phx-value-bid-suit='{bid_suit.long_name()}']:not([disabled])",
+        ))
+        self.click((By.CSS_SELECTOR, "#confirm-bid-button:not([disabled])"))
         self.log(f"Placed bid {bid_value} {bid_suit.long_name()}.")
 
     # ── Phase: Discard ──────────────────────────────────────────────
@@ -397,44 +420,48 @@ class PhxWeb:
         deadline = time.time() + PHASE_TIMEOUT
 
         while time.time() < deadline:
-            soup = self.snapshot()
-            phase = self.get_phase(soup)
-            if phase != "Discard":
+            view = self.snapshot()
+            if view.phase != "Discard":
                 return
 
-            if self.resume_control_if_needed(soup):
+            if self.resume_control_if_needed(view):
                 continue
 
-            if self.has_confirmed_discard(soup):
-                time.sleep(POLL_INTERVAL)
+            if view.confirm_discard_clicked:
+                self.wait_for_change(deadline)
                 continue
 
-            trump = self.get_trump(soup)
-            hand = self.extract_hand(soup)
+            trump = view.trump
+            hand = view.hand
             self.log(f"Extracted hand: {hand}")
             self.log(f"Player hand before discarding: {hand}")
 
-            keep = [c for c in hand if c.suit == trump or c.value == 13]
-            if not keep:
-                keep = hand[:5]
-            keep = keep[:5]
+            with self.tracer.span("choose_discard", "think", mode=DISCARD_MODE):
+                if DISCARD_MODE == "search":
+                    keep = self.discarder.choose(hand, trump)
+                elif DISCARD_MODE == "ismcts":
+                    keep = self.ismcts.choose_keep(hand, trump)
+                else:
+                    keep = choose_discard(hand, trump)
+            self.transcript.discard(None, hand, trump, keep)
 
             self.log(f"Keeping cards: {keep}")
-            for card in keep:
-                self.select_card(card)
+            with self.metrics.time("discard_selection"):
+                for card in keep:
+                    self.select_card(card, view)
 
-            WebDriverWait(self.driver, ACTION_TIMEOUT).until(
-                EC.element_to_be_clickable((By.ID, "confirm-discard-button"))
-            ).click()
+            with self.metrics.time("discard_confirm"):
+                self.click((By.ID, "confirm-discard-button"))
             self.log("Confirmed discard.")
 
             # Block until we leave the Discard phase entirely.
             # This prevents re-entering the discard logic if the server
             # briefly resets confirm_discard_clicked between rounds.
-            self.wait_until(
-                lambda: self.get_phase(self.snapshot()) != "Discard",
+            self.wait_for_view(
+                lambda view: view.phase != "Discard",
                 PHASE_TIMEOUT,
                 "discard phase to end",
+                "discard_wait",
             )
             return
 
@@ -442,26 +469,51 @@ class PhxWeb:
 
     # ── Phase: Playing ──────────────────────────────────────────────
 
+    def observe_table(self, view: GameView) -> None:
+        """Remembers the cards on the table under their trick's number. The
+        table only grows within a trick, so the latest look is the fullest."""
+        if not view.table:
+            return
+        ours_down = any(card.index in self.played for card in view.table)
+        trick = HAND_SIZE - len(view.hand) - ours_down
+        if len(view.table) >= len(self.tricks.get(trick, ())):
+            self.tricks[trick] = list(view.table)
+
+    def earlier_cards(self, view: GameView) -> list[Card]:
+        """The cards of the tricks finished before the current one, in play
+        order, for the search engines. If the table was not seen at the end
+        of some trick, only the whole tricks after the last gap are given:
+        the seats of the tricks before it can't be worked out."""
+        finished = HAND_SIZE - len(view.hand)
+        first = finished
+        while first > 0 and len(self.tricks.get(first - 1, ())) == 4:
+            first -= 1
+        if first > 0:
+            self.log(f"Missed the end of trick {first} of {finished}; "
+                     f"searching with tricks {first + 1}-{finished} only.")
+        return [card for trick in range(first, finished) for card in self.tricks[trick]]
+
     def playing_phase(self) -> None:
         deadline = time.time() + PHASE_TIMEOUT
 
         while time.time() < deadline:
-            soup = self.snapshot()
-            phase = self.get_phase(soup)
-            if phase != "Playing":
+            view = self.snapshot()
+            if view.phase != "Playing":
                 return
 
-            if self.resume_control_if_needed(soup):
+            if self.resume_control_if_needed(view):
                 continue
 
-            if not self.is_my_turn(soup):
-                time.sleep(POLL_INTERVAL)
+            played_cards = view.table
+            self.observe_table(view)
+
+            if not view.my_turn:
+                self.wait_for_change(deadline)
                 continue
 
-            hand = self.extract_hand(soup, playable_only=True)
-            played_cards = self.extract_played_cards(soup)
-            trump = self.get_trump(soup)
-            suit_led = self.get_suit_led(soup)
+            hand = view.playable
+            trump = view.trump
+            suit_led = view.suit_led
 
             if not hand:
                 raise RuntimeError("No legal cards available on my turn.")
@@ -471,28 +523,53 @@ class PhxWeb:
             self.log(f"Extracted playable hand: {hand}")
             self.log(f"Current played cards: {played_cards}")
             self.log(f"It's my turn to play. Trump: {trump}, suit led: {suit_led}")
-
-            card_to_play = evaluate_hand_play(
-                suit_led=suit_led,
-                player_hand=hand,
-                current_cards=played_cards,
-                trump=trump,
+            earlier = self.earlier_cards(view)
+
+            with self.tracer.span("choose_card", "think", mode=PLAY_MODE):
+                decide_start = time.perf_counter()
+                if PLAY_MODE == "rollout":
+                    from rollout import LIVE_TIME_BUDGET, choose_card
+                    card_to_play = choose_card(
+                        hand=view.hand,
+                        legal=hand,
+                        current_cards=played_cards,
+                        trump=trump,
+                        seen=earlier,
+                        time_budget=LIVE_TIME_BUDGET,
+                        max_rollouts=None,
+                    )
+                elif PLAY_MODE == "ismcts":
+                    card_to_play = self.ismcts.choose_card(
+                        hand=view.hand,
+                        legal=hand,
+                        current_cards=played_cards,
+                        trump=trump,
+                        seen=earlier,
+                    )
+                else:
+                    card_to_play = evaluate_hand_play(
+                        suit_led=suit_led,
+                        player_hand=hand,
+                        current_cards=played_cards,
+                        trump=trump,
+                    )
+                self.metrics.observe("play_decision", time.perf_counter() - decide_start)
+            self.transcript.play(
+                None, suit_led, hand, played_cards, trump, view.hand, earlier, card_to_play,
             )
-            self.select_card(card_to_play)
+            self.played.add(card_to_play.index)
 
-            WebDriverWait(self.driver, ACTION_TIMEOUT).until(
-                EC.element_to_be_clickable((
-                    By.CSS_SELECTOR,
-                    "#play-card-button:not([disabled])",
-                ))
-            ).click()
+            with self.metrics.time("card_play"):
+                self.select_card(card_to_play, view)
+
+                self.click((By.CSS_SELECTOR, "#play-card-button:not([disabled])"))
             self.log("Played selected card.")
 
-            self.wait_until(
-                lambda: self.get_phase(self.snapshot()) != "Playing"
-                or not self.is_my_turn(self.snapshot()),
+            self.wait_for_view(
+                lambda view: view.phase != "Playing" or not view.my_turn,
                 ACTION_TIMEOUT,
                 "played card acceptance",
+                "play_acceptance",
             )
 
         raise TimeoutException("Playing phase timed out.")
@@ -504,8 +581,10 @@ class PhxWeb:
         deadline = time.time() + PHASE_TIMEOUT
 
         while time.time() < deadline:
-            soup = self.snapshot()
-            phase = self.get_phase(soup)
+            view = self.snapshot()
+            phase = view.phase
+            if phase in ("Scoring", "Final Scoring"):
+                self.observe_scores(view)
 
             if phase == "Final Scoring":
                 self.log("Final Scoring detected. Exiting the game.")
@@ -515,19 +594,59 @@ class PhxWeb:
                 self.log("Scoring phase complete.")
                 return phase
 
-            time.sleep(POLL_INTERVAL)
+            self.wait_for_change(deadline)
 
         raise TimeoutException("Scoring phase timed out.")
 
+    def observe_scores(self, view: GameView) -> None:
+        """Records the round the score table has just added. Scores are in
+        the server's seat order, team 0 first; the page does not say which
+        seat is ours, nor the dealer, bidder or round points."""
+        scores = view.scores
+        if len(scores) <= self.rounds_scored:
+            return
+        self.rounds_scored = len(scores)
+        self.scores = scores[-1]
+        tricks = [
+            self.tricks[trick] if len(self.tricks.get(trick, ())) == 4 else None
+            for trick in range(HAND_SIZE)
+        ]
+        self.transcript.end_round(
+            None, None, view.current_bid, view.trump, None, self.scores, self.bids, tricks
+        )
+
+    def exit_game(self) -> None:
+        """Leaves the final scoring screen for the queue page. The server
+        frees the seat before navigating, so the bot can queue again."""
+        with self.metrics.time("exit_game"):
+            view = self.snapshot()
+            if view.phase == "Final Scoring":
+                self.click((By.CSS_SELECTOR, "button[phx-click='exit_game']"))
+            elif not view.queue_ready:
+                self.load_queue_page()
+            self.wait_for_view(
+                lambda view: view.queue_ready and "/game/" not in view.url,
+                ACTION_TIMEOUT,
+                "return to the queue page",
+            )
+
     # ── Failure artifacts ───────────────────────────────────────────
 
     def capture_failure_artifacts(self) -> None:
-        if self.driver is None:
-            return
-
         artifact_dir = Path(os.getenv("TBOT_ARTIFACT_DIR", "artifacts"))
         artifact_dir.mkdir(parents=True, exist_ok=True)
 
+        # The timeline first: it needs no browser, so it survives a dead one.
+        timeline_path = artifact_dir / f"tbot_{self.instance}_flight.jsonl.gz"
+        try:
+            self.recorder.dump(timeline_path)
+            self.log(f"Saved flight recorder timeline to {timeline_path}.")
+        except Exception as error:  # never lose the screenshot to a bad event
+            self.log(f"Failed to save flight recorder timeline: {error!r}")
+
+        if self.driver is None:
+            return
+
         screenshot_path = artifact_dir / f"tbot_{self.instance}_failure.png"
         html_path = artifact_dir / f"tbot_{self.instance}_failure.html"
 
@@ -538,6 +657,54 @@ class PhxWeb:
         except WebDriverException as error:
             self.log(f"Failed to save debug artifacts: {error!r}")
 
+    def save_transcript(self) -> None:
+        """Appends this game's transcript, if it recorded anything, to
+        tbot_<instance>_transcripts.jsonl and starts a new one."""
+        path = Path(os.getenv("TBOT_ARTIFACT_DIR", "artifacts")) / (
+            f"tbot_{self.instance}_transcripts.jsonl"
+        )
+        winner = None
+        if self.scores is not None:
+            winner = next((team for team in (0, 1) if self.scores[team] >= WINNING_SCORE), None)
+        if self.transcript.decisions or self.transcript.rounds:
+            try:
+                append_transcript(path, self.transcript.to_dict(winner, self.scores))
+            except OSError as error:
+                self.log(f"Failed to save transcript: {error!r}")
+        self.transcript = Transcript(TRANSCRIPT_SOURCE)
+        self.bids = []
+        self.scores = None
+        self.rounds_scored = 0
+
+    def export_metrics(self, trace: bool = True) -> None:
+        """Writes the metrics, session timings and, with `trace`, this
+        bot's trace. Pooled runs merge the traces instead."""
+        metrics_dir = Path(
+            os.getenv("TBOT_METRICS_DIR", os.getenv("TBOT_ARTIFACT_DIR", "artifacts"))
+        )
+        try:
+            json_path, prom_path = self.metrics.export(
+                metrics_dir, f"tbot_{self.instance}_metrics"
+            )
+            self.log(f"Saved metrics to {json_path} and {prom_path}.")
+        except OSError as error:
+            self.log(f"Failed to save metrics: {error!r}")
+        if len(self.games) > 1:
+            session_path = metrics_dir / f"tbot_{self.instance}_session.json"
+            try:
+                session_path.write_text(
+                    json.dumps({"summary": self.session_summary(), "games": self.games}, indent=2),
+                    encoding="utf-8",
+                )
+            except OSError as error:
+                self.log(f"Failed to save session timings: {error!r}")
+        if trace and self.tracer.enabled:
+            try:
+                trace_path = self.tracer.export(metrics_dir / f"tbot_{self.instance}_trace.json")
+                self.log(f"Saved trace to {trace_path}.")
+            except OSError as error:
+                self.log(f"Failed to save trace: {error!r}")
+
     def close_driver(self) -> None:
         if self.driver is None:
             return
@@ -547,39 +714,160 @@ class PhxWeb:
 
     # ── Main loop ───────────────────────────────────────────────────
 
-    def run(self) -> None:
-        self.click_join_queue()
+    def run(self) -> dict:
+        """Queues up and plays one game. Returns the game's timings."""
+        queue_start = time.perf_counter()
+        with self.tracer.span("join_queue", "phase"):
+            self.click_join_queue()
         start_time = time.time()
+        game_start = time.perf_counter()
 
         while time.time() - start_time < TOTAL_RUNTIME_TIMEOUT:
-            soup = self.snapshot()
-            phase = self.get_phase(soup)
+            phase = self.snapshot().phase
 
             if phase == "Bidding":
-                self.bidding_phase()
+                with self.tracer.span("bidding_phase", "phase"):
+                    self.bidding_phase()
             elif phase == "Discard":
-                self.discard_phase()
+                with self.tracer.span("discard_phase", "phase"):
+                    self.discard_phase()
             elif phase == "Playing":
-                self.playing_phase()
+                with self.tracer.span("playing_phase", "phase"):
+                    self.playing_phase()
             elif phase in ("Scoring", "Final Scoring"):
-                result = self.scoring_phase()
+                with self.tracer.span("scoring_phase", "phase"):
+                    result = self.scoring_phase()
                 if result == "Final Scoring":
-                    return
+                    game_seconds = time.perf_counter() - game_start
+                    self.metrics.observe("game", game_seconds)
+                    return {
+                        "url": self.game_url,
+                        "queue_seconds": game_start - queue_start,
+                        "game_seconds": game_seconds,
+                        **self.driver.execute_script(PAGE_STATS_JS),
+                    }
             else:
                 raise RuntimeError(f"Unexpected game phase: {phase!r}")
 
         raise TimeoutException("Total runtime timeout exceeded.")
 
+    def run_session(self, games: int) -> None:
+        """Plays `games` games back to back on this driver, re-queueing
+        after each Final Scoring."""
+        for number in range(1, games + 1):
+            if number > 1:
+                with self.tracer.span("exit_game", "phase"):
+                    self.exit_game()
+            # Only per-game state; the driver, socket and metrics carry over.
+            self.tricks.clear()
+            self.played.clear()
+            self.watched_state = None
+            self.game_url = None
+            reconnects = self.reconnects
+
+            try:
+                record = {"game": number, **self.run()}
+            finally:
+                # A failed game's transcript is kept too, up to the failure.
+                self.save_transcript()
+            record["reconnects"] = self.reconnects - reconnects
+            self.games.append(record)
+            self.log(
+                f"Game {number}/{games} done: queue {record['queue_seconds']:.1f}s, "
+                f"game {record['game_seconds']:.1f}s, {record['domNodes']} DOM nodes."
+            )
+
+        if games > 1:
+            summary = self.session_summary()
+            self.log(
+                f"Session: {summary['games']} games in {summary['total_seconds']:.1f}s, "
+                f"game mean {summary['game_seconds']['mean']:.1f}s, "
+                f"{summary['reconnects']} reconnects, "
+                f"heap growth {summary['heap_growth_bytes']} bytes."
+            )
+
+    def session_summary(self) -> dict:
+        def stats(key: str) -> dict:
+            values = [game[key] for game in self.games]
+            return {"mean": sum(values) / len(values), "min": min(values), "max": max(values)}
+
+        heaps = [game["heapBytes"] for game in self.games if game["heapBytes"] is not None]
+        return {
+            "games": len(self.games),
+            "total_seconds": sum(g["queue_seconds"] + g["game_seconds"] for g in self.games),
+            "queue_seconds": stats("queue_seconds"),
+            "game_seconds": stats("game_seconds"),
+            "reconnects": self.reconnects,
+            # Same page (the game page) at the same point in each game.
+            "heap_growth_bytes": heaps[-1] - heaps[0] if heaps else None,
+            "dom_node_growth": self.games[-1]["domNodes"] - self.games[0]["domNodes"],
+        }
+
+
+def run_pooled(url: str, bots: int, browsers: int) -> int:
+    """Plays a session per bot, in threads sharing `browsers` Chromes.
+    Returns the number of bots that failed. The bots' traces are written
+    once, merged into one timeline, tbot_trace.json."""
+    pool = BrowserPool(browsers)
+    failures = []
+    tracers = []
+
+    def play(instance: int) -> None:
+        phx_web = None
+        try:
+            phx_web = PhxWeb(url, driver=pool.open_tab(), instance=str(instance))
+            tracers.append(phx_web.tracer)
+            phx_web.run_session(SESSION_GAMES)
+        except Exception as error:
+            failures.append(instance)
+            if phx_web is None:
+                print(f"[tbot {instance}] Run failed: {error!r}", flush=True)
+            else:
+                phx_web.log(f"Run failed: {error!r}")
+                phx_web.capture_failure_artifacts()
+        finally:
+            if phx_web is not None:
+                phx_web.export_metrics(trace=False)
+                phx_web.close_driver()
+
+    threads = [threading.Thread(target=play, args=(i,)) for i in range(bots)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        pool.close()
+    if TRACE and tracers:
+        metrics_dir = Path(os.getenv("TBOT_METRICS_DIR", os.getenv("TBOT_ARTIFACT_DIR", "artifacts")))
+        events = [event for tracer in tracers for event in tracer.trace_events()]
+        try:
+            path = write_trace(metrics_dir / "tbot_trace.json", events)
+            print(f"Saved merged trace of {len(tracers)} bots to {path}.", flush=True)
+        except OSError as error:
+            print(f"Failed to save merged trace: {error!r}", flush=True)
+    return len(failures)
+
 
 def main() -> None:
-    phx_web = PhxWeb(os.getenv("APP_BASE_URL", "http://localhost:4000/play"))
+    url = os.getenv("APP_BASE_URL", "http://localhost:4000/play")
+    bots = int(os.getenv("TBOT_BOTS", "1"))
+    if bots > 1:
+        failed = run_pooled(url, bots, int(os.getenv("TBOT_BROWSERS", "1")))
+        print(f"{bots - failed}/{bots} bots finished.", flush=True)
+        if failed:
+            raise SystemExit(1)
+        return
+
+    phx_web = PhxWeb(url)
     try:
-        phx_web.run()
+        phx_web.run_session(SESSION_GAMES)
     except Exception as error:
         phx_web.log(f"Run failed: {error!r}")
         phx_web.capture_failure_artifacts()
         raise
     finally:
+        phx_web.export_metrics()
         phx_web.close_driver()
 
 
@@ -0,0 +1,21 @@
+from card import Suit, Card
+from discard import candidate_keeps, keep_key
+
+
+def cards(*names):
+    return [Card(name[:-1], Suit(name[-1])) for name in names]
+
+
+def test_keeps_of_different_suits_are_scored_apart():
+    hand = cards("KC", "KS", "3C", "2D", "4D")
+    keep_clubs, keep_spades = cards("KC"), cards("KS")
+    assert keep_key(keep_clubs, hand, Suit.DIAMONDS) != keep_key(keep_spades, hand, Suit.DIAMONDS)
+
+
+def test_mirrored_keeps_of_a_symmetric_hand_are_merged():
+    hand = cards("KC", "KS", "3C", "3S", "4D")
+    assert keep_key(cards("KC"), hand, Suit.DIAMONDS) == keep_key(cards("KS"), hand, Suit.DIAMONDS)
+    # Swapping the suits would change trump.
+    assert keep_key(cards("KC"), hand, Suit.CLUBS) != keep_key(cards("KS"), hand, Suit.CLUBS)
+    keys = {keep_key(keep, hand, Suit.DIAMONDS) for keep in candidate_keeps(hand, Suit.DIAMONDS)}
+    assert len(keys) < len(candidate_keeps(hand, Suit.DIAMONDS))
@@ -0,0 +1,73 @@
+import random
+
+from card import DECK, SUITS
+from double_dummy import DoubleDummySolver, heuristic_points, solve
+from rules import TRICK_POINTS, legal_moves, team_for, trick_winner
+
+
+def minimax(hands, trump, leader, cards, winners):
+    """Team 0's points from here by plain exhaustive search."""
+    seat = (leader + len(cards)) % 4
+    if len(cards) == 4:
+        best = trick_winner(cards, cards[0].suit, trump)
+        winner = (leader + best) % 4
+        winners = winners + [(cards[best], winner)]
+        points = TRICK_POINTS if team_for(winner) == 0 else 0
+        if not hands[winner]:
+            top = trick_winner([card for card, _ in winners], cards[0].suit, trump)
+            return points + (TRICK_POINTS if team_for(winners[top][1]) == 0 else 0)
+        return points + minimax(hands, trump, winner, [], winners)
+    values = []
+    hand = hands[seat]
+    for card in legal_moves(hand, cards[0] if cards else None, trump):
+        rest = hands[:seat] + [[c for c in hand if c is not card]] + hands[seat + 1:]
+        values.append(minimax(rest, trump, leader, cards + [card], winners))
+    return max(values) if team_for(seat) == 0 else min(values)
+
+
+def random_ending(rng, size):
+    deck = list(DECK)
+    rng.shuffle(deck)
+    hands = [deck[i * size:(i + 1) * size] for i in range(4)]
+    return hands, rng.choice(SUITS), rng.randrange(4)
+
+
+def test_solver_matches_exhaustive_search():
+    rng = random.Random(2)
+    for _ in range(150):
+        hands, trump, leader = random_ending(rng, rng.randint(1, 3))
+        total = TRICK_POINTS * (len(hands[0]) + 1)
+        expected = minimax(hands, trump, leader, [], [])
+        assert solve(hands, trump, leader) == [expected, total - expected]
+
+
+def test_solver_counts_earlier_winners_for_the_bonus():
+    rng = random.Random(4)
+    for _ in range(50):
+        hands, trump, leader = random_ending(rng, 3)
+        # A trick already played, won by some seat with its first card.
+        played = [hand.pop() for hand in hands]
+        winners = [(played[0], rng.randrange(4))]
+        expected = minimax(hands, trump, leader, [], winners)
+        team0, _ = DoubleDummySolver(trump).solve(hands, leader, winners=winners)
+        assert team0 == expected
+
+
+def test_card_values_agree_with_solve():
+    rng = random.Random(6)
+    for _ in range(30):
+        hands, trump, leader = random_ending(rng, 3)
+        solver = DoubleDummySolver(trump)
+        values = solver.card_values(hands, leader)
+        best = max(values.values())
+        team = team_for(leader)
+        assert solver.solve(hands, leader)[team] == best
+
+
+def test_heuristic_points_score_the_whole_ending():
+    rng = random.Random(8)
+    for _ in range(30):
+        hands, trump, leader = random_ending(rng, 3)
+        solved = solve(hands, trump, leader)
+        heuristic = heuristic_points([list(hand) for hand in hands], trump, leader)
+        assert sum(heuristic) == sum(solved)
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from gamelog import (
+    FLAG_BAGGED,
+    HEADER,
+    MAGIC,
+    ROUND,
+    VERSION,
+    analyze,
+    map_rounds,
+    open_log,
+    read_rounds,
+    record,
+    record_games,
+)
+from rules import HAND_SIZE, TRICK_POINTS, score_round
+from sim import TbotStrategy
+
+
+@pytest.fixture
+def log(tmp_path):
+    path = tmp_path / "games.bin"
+    open_log(path)
+    rounds = record_games([TbotStrategy() for _ in range(4)], random.Random(1), 20)
+    with path.open("ab") as f:
+        f.write(rounds.tobytes())
+    return path, rounds
+
+
+def test_round_trip(log):
+    path, rounds = log
+    assert path.read_bytes()[:HEADER.size] == HEADER.pack(MAGIC, VERSION, ROUND.itemsize, 0)
+    mapped = map_rounds(path)
+    assert mapped.dtype == ROUND
+    assert mapped.tobytes() == rounds.tobytes()
+    assert sum(len(chunk) for chunk in read_rounds(path, chunk=7)) == len(rounds)
+    assert open_log(path) == (len(rounds), 20)
+
+
+def test_records_are_consistent(log):
+    _, rounds = log
+    scores = [0, 0]
+    for row in rounds:
+        if row["round"] == 0:
+            scores = [0, 0]
+        assert row["points"].sum() == (HAND_SIZE + 1) * TRICK_POINTS
+        # Every card of the redrawn hands is played once, by its holder.
+        played = sorted(row["tricks"].ravel().tolist())
+        assert played == sorted(row["hands"].ravel().tolist())
+        for trick, leader in zip(row["tricks"], row["leaders"]):
+            for turn, card in enumerate(trick):
+                assert card in row["hands"][(leader + turn) % 4]
+        # Kept cards come first after the redraw.
+        for seat in range(4):
+            kept = row["hands"][seat][:row["kept"][seat]]
+            dealt = set(row["deal"][seat].tolist())
+            if seat == row["bid_seat"]:
+                dealt |= set(row["kitty"].tolist())
+            assert set(kept.tolist()) <= dealt
+        scores, winner = score_round(
+            row["points"].tolist(), scores, int(row["bid"]), int(row["bid_seat"])
+        )
+        assert row["scores"].tolist() == scores
+        assert row["winner"] == (-1 if winner is None else winner)
+        # Only a dealer facing three passes is bagged.
+        bagged = bool(row["flags"] & FLAG_BAGGED)
+        passes_before_dealer = all(
+            row["bids"][(row["dealer"] + 1 + turn) % 4] == 0 for turn in range(3)
+        )
+        assert bagged == passes_before_dealer
+
+
+def test_analyze(log):
+    path, rounds = log
+    report = analyze([path], chunk=16)
+    assert report["rounds"] == len(rounds)
+    assert report["games"] == 20
+
+
+def test_bagged_counts_only_forced_bids(log):
+    path, rounds = log
+    report = analyze([path])
+    forced = sum(
+        all(row["bids"][(row["dealer"] + 1 + turn) % 4] == 0 for turn in range(3)) for row in rounds
+    )
+    assert 0 < report["predictor"]["bagged"] == forced
+
+
+def test_record_is_reproducible(tmp_path):
+    logs = []
+    for workers in (1, 3):
+        path = tmp_path / f"games_{workers}.bin"
+        record(path, ["tbot"] * 4, games=12, seed=5, shard_size=2, workers=workers)
+        logs.append(path.read_bytes())
+    assert logs[0] == logs[1]
+    assert (np.diff(map_rounds(tmp_path / "games_3.bin")["game"].astype(int)) >= 0).all()
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from card import DECK, SUITS, Suit, Card, is_ace_of_hearts, less_than
+from hand import Hand, cards_of, legal_mask, mask_of
+from rules import legal_moves
+
+
+def list_legal_moves(hand, card_led, trump):
+    """`rules.legal_moves` as it was before the bitset masks."""
+    if not hand or card_led is None:
+        return hand
+    suit_led = trump if is_ace_of_hearts(card_led) else card_led.suit
+    legal = [c for c in hand if c.suit == suit_led or c.suit == trump or is_ace_of_hearts(c)]
+    if not legal:
+        return hand
+    if suit_led != trump and all(c.suit == trump for c in legal):
+        return hand
+
+    def renegable(card):
+        if not (is_ace_of_hearts(card) or (card.suit == trump and card.value in (5, 11))):
+            return False
+        return not less_than(card, card_led, suit_led, trump)
+
+    if all(renegable(c) for c in legal):
+        return hand
+    return legal
+
+
+def legal_by_mask(hand, card_led, trump):
+    return cards_of(legal_mask(mask_of(hand), card_led, trump))
+
+
+def cards(*names):
+    return [Card(name[:-1], Suit(name[-1])) for name in names]
+
+
+@pytest.mark.parametrize("trump", SUITS)
+def test_legal_mask_matches_list_logic(trump):
+    rng = random.Random(trump.value)
+    for _ in range(5000):
+        hand = rng.sample(DECK, rng.randint(1, 8))
+        card_led = rng.choice([c for c in DECK if c not in hand])
+        expected = sorted(c.index for c in list_legal_moves(hand, card_led, trump))
+        assert [c.index for c in legal_by_mask(hand, card_led, trump)] == expected
+        assert sorted(c.index for c in legal_moves(hand, card_led, trump)) == expected
+
+
+@pytest.mark.parametrize("hand, led, trump, legal", [
+    # The ace of hearts leads trump.
+    (["3D", "7C"], "AH", Suit.DIAMONDS, ["3D"]),
+    # The jack of trump outranks the ace of hearts, so it may renege...
+    (["JD", "7C"], "AH", Suit.DIAMONDS, ["JD", "7C"]),
+    # ...but not against the 5 of trump.
+    (["JD", "7C"], "5D", Suit.DIAMONDS, ["JD"]),
+    (["5D", "9S"], "4D", Suit.DIAMONDS, ["5D", "9S"]),
+    # The ace of hearts counts as trump, and may renege a lower lead.
+    (["AH", "9S"], "7C", Suit.DIAMONDS, ["AH", "9S"]),
+    (["AH", "2C", "9S"], "7C", Suit.DIAMONDS, ["AH", "2C"]),
+    (["AH", "2H", "9S"], "KH", Suit.CLUBS, ["AH", "2H"]),
+    # With none of the suit led, trumping in is optional.
+    (["3D", "9S"], "7C", Suit.DIAMONDS, ["3D", "9S"]),
+    (["3S", "9S"], "7C", Suit.DIAMONDS, ["3S", "9S"]),
+])
+def test_legal_mask_edge_cases(hand, led, trump, legal):
+    hand, (card_led,) = cards(*hand), cards(led)
+    expected = sorted(c.index for c in cards(*legal))
+    assert sorted(c.index for c in list_legal_moves(hand, card_led, trump)) == expected
+    assert [c.index for c in legal_by_mask(hand, card_led, trump)] == expected
+
+
+def test_card_rejects_values_out_of_range():
+    for value in ("0", "14", "-1"):
+        with pytest.raises(ValueError):
+            Card(value, Suit.HEARTS)
+
+
+def test_card_interning_stays_bounded():
+    assert Card("05", Suit.CLUBS) is Card("5", Suit.CLUBS) is Card(" 5", Suit.CLUBS)
+    assert ("05", Suit.CLUBS) not in Card._interned
+    assert Card("K", Suit.SPADES) is Card("13", Suit.SPADES)
+
+
+def test_hand_is_an_immutable_bitset():
+    held = cards("AH", "5C", "JC", "KD", "2S")
+    hand = Hand.of(held)
+    assert hand == mask_of(held) and len(hand) == 5
+    assert sorted(hand, key=lambda c: c.index) == sorted(held, key=lambda c: c.index)
+    assert list(hand.suit(Suit.CLUBS)) == cards("5C", "JC")
+    assert sorted(c.index for c in hand.trumps(Suit.CLUBS)) == sorted(
+        c.index for c in cards("AH", "5C", "JC")
+    )
+    assert hand.has_ace_of_hearts() and not hand.remove(held[0]).has_ace_of_hearts()
+    assert held[0] in hand and held[0] not in hand.remove(held[0])
+    assert hand.remove(held[0]).add(held[0]) == hand
+    assert isinstance(hand.legal(held[3], Suit.CLUBS), Hand)
+    assert hand.legal(None, Suit.CLUBS) == hand
+    with pytest.raises(AttributeError):
+        hand.extra = 1
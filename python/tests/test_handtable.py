@@ -0,0 +1,55 @@
+import random
+from math import comb
+
+import pytest
+
+from card import DECK, SUITS, Suit
+from handtable import HANDS, HEADER, MAGIC, SCALE, VERSION, HandTable, hand_rank, hand_unrank
+
+
+def test_rank_round_trip():
+    rng = random.Random(1)
+    for _ in range(2000):
+        indices = sorted(rng.sample(range(len(DECK)), 5))
+        assert hand_unrank(hand_rank(indices)) == indices
+
+
+def test_ranks_are_dense():
+    assert hand_rank([0, 1, 2, 3, 4]) == 0
+    assert hand_rank([47, 48, 49, 50, 51]) == HANDS - 1 == comb(52, 5) - 1
+    assert [hand_rank(hand_unrank(rank)) for rank in range(1000)] == list(range(1000))
+    assert hand_rank([4, 3, 2, 1, 0]) == 0
+
+
+@pytest.fixture
+def table_path(tmp_path):
+    """A table whose byte for each hand is its rank mod 251 plus the trump."""
+    body = bytearray(len(SUITS) * HANDS)
+    for trump in range(len(SUITS)):
+        for rank in range(0, HANDS, 9973):
+            body[trump * HANDS + rank] = (rank % 251 + trump) % 256
+    path = tmp_path / "table.bin"
+    path.write_bytes(HEADER.pack(MAGIC, VERSION, SCALE, 16, HANDS) + bytes(body))
+    return path
+
+
+def test_table_lookup(table_path):
+    with HandTable(table_path) as table:
+        hand = [DECK[i] for i in hand_unrank(9973 * 7)]
+        assert table.points(hand, Suit.HEARTS) == (9973 * 7 % 251) / SCALE
+        assert table.points(hand, Suit.SPADES) == (9973 * 7 % 251 + 3) / SCALE
+        assert table.best_trump(hand) == (Suit.SPADES, (9973 * 7 % 251 + 3) / SCALE)
+
+
+def test_table_rejects_other_files(tmp_path):
+    path = tmp_path / "table.bin"
+    path.write_bytes(HEADER.pack(b"NOTATABL", VERSION, SCALE, 16, HANDS) + bytes(64))
+    with pytest.raises(ValueError):
+        HandTable(path)
+    path.write_bytes(HEADER.pack(MAGIC, VERSION, SCALE, 16, HANDS) + bytes(64))
+    with pytest.raises(ValueError):
+        HandTable(path)
+    for size in (0, HEADER.size - 1):
+        path.write_bytes(bytes(size))
+        with pytest.raises(ValueError):
+            HandTable(path)
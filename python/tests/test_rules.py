@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from card import DECK, SUITS, Suit, Card
+from rules import (
+    BID_VALUES,
+    WINNING_SCORE,
+    earlier_winners,
+    legal_moves,
+    score_round,
+    trick_winner,
+    valid_bid,
+)
+
+
+def cards(*names):
+    return [Card(name[:-1], Suit(name[-1])) for name in names]
+
+
+def test_valid_bid():
+    assert valid_bid(0, Suit.PASS, 20, bagged=False)
+    assert not valid_bid(0, Suit.PASS, 0, bagged=True)
+    assert valid_bid(25, Suit.CLUBS, 20, bagged=False)
+    assert not valid_bid(20, Suit.CLUBS, 20, bagged=False)
+    assert not valid_bid(25, Suit.PASS, 20, bagged=False)
+    assert not any(valid_bid(bid, Suit.HEARTS, 0, False) for bid in (0, 10, 35))
+    assert all(valid_bid(bid, Suit.HEARTS, 0, True) for bid in BID_VALUES)
+
+
+def test_trick_winner():
+    # The 5 of trump is the highest card, then the jack, then the ace of hearts.
+    assert trick_winner(cards("KD", "5D", "JD", "AH"), Suit.DIAMONDS, Suit.DIAMONDS) == 1
+    assert trick_winner(cards("KD", "AH", "JD", "2D"), Suit.DIAMONDS, Suit.DIAMONDS) == 2
+    assert trick_winner(cards("KC", "AH", "QD", "2D"), Suit.CLUBS, Suit.DIAMONDS) == 1
+    # Off suits never win, and in black suits the low cards are high.
+    assert trick_winner(cards("2S", "10S", "KH", "QC"), Suit.SPADES, Suit.DIAMONDS) == 0
+    assert trick_winner(cards("2H", "10H", "KS", "QC"), Suit.HEARTS, Suit.DIAMONDS) == 1
+
+
+def test_legal_moves_must_follow_or_trump():
+    hand = cards("3C", "9S", "4D")
+    assert legal_moves(hand, Card("7", Suit.CLUBS), Suit.DIAMONDS) == cards("3C", "4D")
+    assert legal_moves(hand, None, Suit.DIAMONDS) is hand
+
+
+def play_random_tricks(rng, trump, tricks):
+    """Plays `tricks` tricks of random legal cards; returns the cards in
+    play order with their seats and the seat leading next."""
+    deck = list(DECK)
+    rng.shuffle(deck)
+    hands = [deck[i * 5:(i + 1) * 5] for i in range(4)]
+    leader = rng.randrange(4)
+    played = []
+    for _ in range(tricks):
+        trick = []
+        for turn in range(4):
+            hand = hands[(leader + turn) % 4]
+            card = rng.choice(legal_moves(hand, trick[0] if trick else None, trump))
+            hand.remove(card)
+            trick.append(card)
+        best = trick_winner(trick, trick[0].suit, trump)
+        played.append((trick, trick[best], (leader + best) % 4))
+        leader = (leader + best) % 4
+    return played, leader
+
+
+def test_earlier_winners_recovers_seats():
+    rng = random.Random(1)
+    for _ in range(500):
+        trump = rng.choice(SUITS)
+        played, leader = play_random_tricks(rng, trump, rng.randint(0, 5))
+        earlier = [card for trick, _, _ in played for card in trick]
+        assert earlier_winners(earlier, leader, trump) == [(card, seat) for _, card, seat in played]
+
+
+def test_earlier_winners_rejects_partial_tricks():
+    with pytest.raises(ValueError):
+        earlier_winners(list(DECK[:6]), 0, Suit.HEARTS)
+
+
+def test_score_round():
+    # The bidding team went set; the other team keeps its points.
+    assert score_round([15, 15], [40, 50], 20, 0) == ([20, 65], None)
+    assert score_round([25, 5], [100, 50], 25, 2) == ([125, 55], 0)
+    assert score_round([0, 30], [110, 100], 30, 1) == ([110, 130], 1)
+    # Team 0 is checked first when both pass the line.
+    scores, winner = score_round([15, 15], [WINNING_SCORE - 5, WINNING_SCORE - 5], 15, 1)
+    assert scores == [WINNING_SCORE + 10, WINNING_SCORE + 10] and winner == 0
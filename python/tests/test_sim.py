@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from card import DECK, Suit
+from rules import HAND_SIZE, TRICK_POINTS, WINNING_SCORE
+from sim import TbotStrategy, play_game, play_round, shuffled_deck
+from tournament import RandomStrategy
+
+
+class PlainStrategy(TbotStrategy):
+    """A strategy written to the 4-argument `play`, recording what it saw."""
+
+    def __init__(self):
+        self.plays = []
+
+    def play(self, suit_led, legal, current_cards, trump):
+        card = legal[-1]
+        self.plays.append((list(legal), list(current_cards), trump, card))
+        return card
+
+
+def test_shuffled_deck_matches_random_shuffle():
+    for seed in range(200):
+        deck = list(DECK)
+        random.Random(seed).shuffle(deck)
+        assert shuffled_deck(random.Random(seed)) == deck
+
+
+def test_play_round_scores_every_trick_and_the_bonus():
+    rng = random.Random(3)
+    strategies = [TbotStrategy() for _ in range(4)]
+    for dealer in range(4):
+        for _ in range(100):
+            result = play_round(strategies, dealer, rng)
+            assert sum(result.points) == (HAND_SIZE + 1) * TRICK_POINTS
+            assert result.bid_seat is not None and result.trump in Suit
+            assert all(points % TRICK_POINTS == 0 for points in result.points)
+
+
+def test_play_round_is_deterministic():
+    strategies = [TbotStrategy(), RandomStrategy(random.Random(1))] * 2
+    first = play_round(strategies, 1, random.Random(9))
+    strategies = [TbotStrategy(), RandomStrategy(random.Random(1))] * 2
+    assert play_round(strategies, 1, random.Random(9)) == first
+
+
+def test_plain_strategies_get_legal_cards():
+    plain = PlainStrategy()
+    rng = random.Random(5)
+    for _ in range(50):
+        play_round([plain, TbotStrategy(), TbotStrategy(), TbotStrategy()], 0, rng)
+    assert len(plain.plays) == 50 * HAND_SIZE
+    assert all(card in legal for legal, _, _, card in plain.plays)
+
+
+def test_play_game_ends_at_the_winning_score():
+    rng = random.Random(11)
+    for _ in range(50):
+        result = play_game([TbotStrategy() for _ in range(4)], rng)
+        assert result.scores[result.winner] >= WINNING_SCORE
+        assert result.rounds
+
+
+def test_invalid_bid_raises():
+    class Overbidder(TbotStrategy):
+        def bid(self, hand, max_bid, bagged):
+            return 35, Suit.HEARTS
+
+    with pytest.raises(ValueError):
+        play_round([Overbidder()] * 4, 0, random.Random(0))
@@ -0,0 +1,216 @@
+"""Multi-core tournament runner for bot strategies.
+
+Plays seeded games of `sim.py` with a strategy in each fixed seat (seats 0
+and 2 are team 0, seats 1 and 3 team 1). Games are split into shards with
+their own deterministic RNG, so results only depend on --seed and --games,
+not on how many workers ran them:
+
+    python tournament.py --seats tbot,random,tbot,random --games 100000
+
+A seat is either a name from STRATEGIES or a `module:attribute` path to a
+class with the `bid`/`discard`/`play` methods of `sim.TbotStrategy`. A
+class whose constructor takes an `rng` keyword gets its own seeded
+`random.Random`. `play(suit_led, legal, current_cards, trump)` may also
+take `hand` and `seen` keywords (the full hand and the earlier tricks'
+cards); they are only passed to a `play` that declares them.
+"""
+
+import argparse
+import importlib
+import inspect
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields
+from typing import Optional
+
+from card import Suit, Card
+from rules import BID_VALUES, team_for
+from sim import TbotStrategy, play_game
+
+
+class RandomStrategy:
+    """Bids, discards and plays at random among legal options."""
+
+    name = "random"
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self.rng = rng or random.Random()
+
+    def bid(self, hand: list[Card], max_bid: int, bagged: bool) -> tuple[int, Suit]:
+        suit = self.rng.choice(hand).suit
+        if suit == Suit.PASS:
+            suit = Suit.HEARTS
+        higher = [bid for bid in BID_VALUES if bid > max_bid]
+        if bagged or (higher and self.rng.random() < 0.25):
+            return higher[0], suit
+        return 0, Suit.PASS
+
+    def discard(self, hand: list[Card], trump: Suit) -> list[Card]:
+        return self.rng.sample(hand, self.rng.randint(1, min(5, len(hand))))
+
+    def play(self, suit_led, legal, current_cards, trump, hand=None, seen=()) -> Card:
+        return self.rng.choice(legal)
+
+
+# The search strategies are named by path so that importing this module
+# (as transcript.py and tbot.py do) doesn't load their engines.
+STRATEGIES = {
+    "tbot": TbotStrategy,
+    "random": RandomStrategy,
+    "rollout": "rollout:RolloutStrategy",
+    "equity": "bid_equity:BidEquityStrategy",
+    "ismcts": "ismcts:ISMCTSStrategy",
+    "discard": "discard:SearchDiscardStrategy",
+}
+
+
+def load_strategy(spec: str):
+    spec = STRATEGIES.get(spec, spec)
+    if not isinstance(spec, str):
+        return spec
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Unknown strategy {spec!r}; use one of {sorted(STRATEGIES)} "
+                         "or module:attribute")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def make_strategy(spec: str, rng: random.Random, time_budget: Optional[float] = None):
+    """Builds a strategy, seeded with `rng` if its constructor takes an
+    `rng` keyword. Live bots pass `time_budget`, the seconds a search may
+    take per decision, to the strategies that take one; offline searches
+    stop at their iteration cap only. Errors inside the constructor
+    propagate."""
+    cls = load_strategy(spec)
+    parameters = inspect.signature(cls).parameters
+    kwargs = {}
+    if "rng" in parameters:
+        kwargs["rng"] = rng
+    if time_budget is not None and "time_budget" in parameters:
+        kwargs["time_budget"] = time_budget
+    return cls(**kwargs)
+
+
+@dataclass
+class TeamStats:
+    wins: int = 0
+    rounds: int = 0
+    points: int = 0
+    points_sq: int = 0
+    bids: int = 0
+    bids_made: int = 0
+
+    def merge(self, other: "TeamStats") -> None:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+
+@dataclass
+class TournamentStats:
+    games: int = 0
+    teams: list[TeamStats] = field(default_factory=lambda: [TeamStats(), TeamStats()])
+
+    def merge(self, other: "TournamentStats") -> None:
+        self.games += other.games
+        for team, other_team in zip(self.teams, other.teams):
+            team.merge(other_team)
+
+
+def shard_rng(seed: int, shard: int) -> random.Random:
+    """Independent, reproducible stream for one shard of games."""
+    return random.Random(f"{seed}/{shard}")
+
+
+def run_shard(seats: list[str], seed: int, shard: int, games: int) -> TournamentStats:
+    rng = shard_rng(seed, shard)
+    strategies = [make_strategy(spec, random.Random(rng.getrandbits(64))) for spec in seats]
+    stats = TournamentStats(games=games)
+
+    for _ in range(games):
+        result = play_game(strategies, rng)
+        stats.teams[result.winner].wins += 1
+        for round_result in result.rounds:
+            for team, team_stats in enumerate(stats.teams):
+                points = round_result.points[team]
+                team_stats.rounds += 1
+                team_stats.points += points
+                team_stats.points_sq += points * points
+            bidder = stats.teams[team_for(round_result.bid_seat)]
+            bidder.bids += 1
+            bidder.bids_made += round_result.made
+    return stats
+
+
+def wilson_interval(successes: int, trials: int, z: float = 1.96) -> tuple[float, float]:
+    if trials == 0:
+        return 0.0, 0.0
+    p = successes / trials
+    denom = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denom
+    return centre - half, centre + half
+
+
+def mean_interval(total: int, total_sq: int, n: int, z: float = 1.96) -> tuple[float, float]:
+    if n == 0:
+        return 0.0, 0.0
+    mean = total / n
+    variance = max(total_sq / n - mean * mean, 0.0)
+    return mean, z * math.sqrt(variance / n)
+
+
+def report(seats: list[str], stats: TournamentStats, elapsed: float) -> str:
+    lines = [f"{stats.games} games in {elapsed:.1f}s ({stats.games / elapsed:,.0f} games/s)"]
+    for team, team_stats in enumerate(stats.teams):
+        names = ",".join(seats[seat] for seat in range(4) if team_for(seat) == team)
+        low, high = wilson_interval(team_stats.wins, stats.games)
+        mean, half = mean_interval(team_stats.points, team_stats.points_sq, team_stats.rounds)
+        made_low, made_high = wilson_interval(team_stats.bids_made, team_stats.bids)
+        made = team_stats.bids_made / team_stats.bids if team_stats.bids else 0.0
+        lines.append(
+            f"team {team} [{names}]: "
+            f"win {team_stats.wins / max(stats.games, 1):.2%} ({low:.2%}-{high:.2%}), "
+            f"points/round {mean:.2f} ±{half:.2f}, "
+            f"bids made {made:.2%} ({made_low:.2%}-{made_high:.2%}) of {team_stats.bids}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a 45s bot strategy tournament.")
+    parser.add_argument("--seats", default="tbot,tbot,tbot,tbot",
+                        help="comma-separated strategies for seats 0-3")
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shard-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    seats = args.seats.split(",")
+    if len(seats) != 4:
+        parser.error("--seats needs exactly four strategies")
+    for spec in seats:
+        load_strategy(spec)
+
+    shards = [
+        (shard, min(args.shard_size, args.games - offset))
+        for shard, offset in enumerate(range(0, args.games, args.shard_size))
+    ]
+    stats = TournamentStats()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(run_shard, seats, args.seed, shard, games) for shard, games in shards]
+        for done, future in enumerate(as_completed(futures), 1):
+            stats.merge(future.result())
+            if done % max(len(futures) // 10, 1) == 0 and done < len(futures):
+                print(f"[{done}/{len(futures)} shards] "
+                      f"{report(seats, stats, time.perf_counter() - start)}", flush=True)
+
+    print(report(seats, stats, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
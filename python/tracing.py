@@ -0,0 +1,150 @@
+"""Chrome trace-event timelines of bot runs.
+
+`Tracer.span` records how long a block took as a complete ("X") event of
+the Trace Event Format, so a run opens in chrome://tracing or Perfetto.
+tbot.py wraps each game phase, every wait_until and every click in a
+span, along with the browser round trips and the bot's own decisions:
+
+    phase    bidding_phase, discard_phase, playing_phase, scoring_phase
+    wait     wait_until (the server's turn, or other players'), and the
+             wait_for_change calls inside it (polling slack in poll mode)
+    browser  snapshot and click round trips to Chrome
+    think    choose_bid, choose_discard, choose_card
+
+tbot.py traces only with TBOT_TRACE=1. A tracer keeps its last
+`max_events` events, so a long session stays in bounded memory; the
+oldest fall off first.
+
+Timestamps are wall-clock microseconds, so traces of bots in different
+processes or containers line up. Each bot's events carry a pid derived
+from its TBOT_INSTANCE and named after it, so merged traces show one
+track per bot:
+
+    python tracing.py game.json artifacts/tbot_*_trace.json
+"""
+
+import argparse
+import json
+import threading
+import time
+import zlib
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+DEFAULT_MAX_EVENTS = 100_000
+
+
+def instance_pid(instance: str) -> int:
+    """A stable trace pid for a bot instance: the number itself if it is one."""
+    return int(instance) if instance.isdigit() else zlib.crc32(instance.encode())
+
+
+class Tracer:
+    def __init__(
+        self, instance: str, enabled: bool = True, max_events: Optional[int] = DEFAULT_MAX_EVENTS
+    ) -> None:
+        self.instance = instance
+        self.pid = instance_pid(instance)
+        self.enabled = enabled
+        self.events: deque[dict] = deque(maxlen=max_events)
+        # perf_counter for durations, anchored to the wall clock once.
+        self._offset = time.time_ns() // 1000 - time.perf_counter_ns() // 1000
+        self._lock = threading.Lock()
+
+    def _now(self) -> int:
+        return time.perf_counter_ns() // 1000 + self._offset
+
+    def _tid(self) -> int:
+        return threading.get_native_id()
+
+    @contextmanager
+    def span(self, name: str, category: str, **args) -> Iterator[dict]:
+        """Times the block. Yields the span's args, which the block may add
+        to; an exception escaping the block is recorded as `error`."""
+        if not self.enabled:
+            yield args
+            return
+        start = self._now()
+        try:
+            yield args
+        except BaseException as error:
+            args["error"] = type(error).__name__
+            raise
+        finally:
+            event = {
+                "name": name, "cat": category, "ph": "X", "ts": start,
+                "dur": self._now() - start, "pid": self.pid, "tid": self._tid(),
+            }
+            if args:
+                event["args"] = args
+            with self._lock:
+                self.events.append(event)
+
+    def instant(self, name: str, category: str, **args) -> None:
+        if not self.enabled:
+            return
+        event = {
+            "name": name, "cat": category, "ph": "i", "s": "t", "ts": self._now(),
+            "pid": self.pid, "tid": self._tid(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    def trace_events(self) -> list[dict]:
+        """The recorded events, after metadata naming this bot's track."""
+        with self._lock:
+            events = list(self.events)
+        tids = {event["tid"] for event in events}
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": self.pid,
+             "args": {"name": f"tbot {self.instance}"}},
+            {"name": "process_sort_index", "ph": "M", "pid": self.pid,
+             "args": {"sort_index": self.pid}},
+        ]
+        metadata += [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": "bot"}}
+            for tid in sorted(tids)
+        ]
+        return metadata + events
+
+    def export(self, path: Path) -> Path:
+        return write_trace(path, self.trace_events())
+
+
+def write_trace(path: Path, events: list[dict]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, separators=(",", ":")),
+        encoding="utf-8",
+    )
+    return path
+
+
+def merge_traces(paths: list[Path]) -> list[dict]:
+    """The events of several trace files, in one list. Bots keep their own
+    tracks, since pids come from TBOT_INSTANCE."""
+    events: list[dict] = []
+    for path in paths:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        events.extend(data["traceEvents"] if isinstance(data, dict) else data)
+    return events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Merge tbot traces into one timeline.")
+    parser.add_argument("output", type=Path)
+    parser.add_argument("traces", type=Path, nargs="+")
+    args = parser.parse_args()
+
+    events = merge_traces(args.traces)
+    write_trace(args.output, events)
+    bots = {event["pid"] for event in events}
+    print(f"Wrote {len(events)} events from {len(bots)} bots to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
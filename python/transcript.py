@@ -0,0 +1,316 @@
+"""Compact game transcripts and a replay engine for the decision rules.
+
+A `Transcript` records every decision a player made together with the
+state it saw: the hand and bidding state for a bid, the hand and trump for
+a discard, and the legal cards, trick so far, full hand and earlier tricks
+for a play. Each round's outcome and the scores are recorded too. Cards
+are stored as `Card.index` and suits by their `Suit` value, one game per
+JSON line:
+
+    {"source": "sim", "seats": [...], "decisions": [["bid", 1, [4, 17, ...], 0, false, 20, "H"], ...],
+     "rounds": [[dealer, bid_seat, bid, "H", [20, 10], [20, -25]], ...], "winner": 0, "scores": [...]}
+
+tbot records only its own decisions, with seat null, and sees the rest
+of the game through the page: its rounds carry what it could not see as
+null, plus the bids it saw (`[player, bid]`, 0 for a pass) and the cards
+of each trick (null for a trick it missed). Its source names the play
+and discard modes, e.g. "tbot:ismcts/search"; `replay --source` keeps
+games of one source, so decisions of a search mode are not counted as
+changes of a greedy strategy.
+
+`replay` decodes transcripts once into the shared `DECK` cards and re-runs a
+strategy's `bid`/`discard`/`play` on every recorded decision, so a change
+to `strategy.py` or to the ordering in `card.py` can be checked against
+thousands of recorded games with no browser or server:
+
+    python transcript.py record --games 5000 --seed 1 --out games.jsonl
+    python transcript.py replay games.jsonl artifacts/tbot_*_transcripts.jsonl
+"""
+
+import argparse
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Sequence
+
+from card import DECK, Suit, Card
+from rules import score_round
+from sim import play_card, play_game
+from tournament import make_strategy
+
+KINDS = ("bid", "discard", "play")
+
+
+def encode_cards(cards: Sequence[Card]) -> list[int]:
+    return [card.index for card in cards]
+
+
+def decode_cards(indices: Sequence[int]) -> list[Card]:
+    return [DECK[i] for i in indices]
+
+
+def encode_suit(suit: Optional[Suit]) -> Optional[str]:
+    return suit.value if suit is not None else None
+
+
+def decode_suit(raw: Optional[str]) -> Optional[Suit]:
+    return Suit(raw) if raw is not None else None
+
+
+# ── Recording ───────────────────────────────────────────────────────
+
+
+class Transcript:
+    def __init__(self, source: str, seats: Optional[list[str]] = None) -> None:
+        self.source = source
+        self.seats = seats
+        self.decisions: list[list] = []
+        self.rounds: list[list] = []
+
+    def bid(
+        self,
+        seat: Optional[int],
+        hand: list[Card],
+        max_bid: int,
+        bagged: bool,
+        decision: tuple[int, Suit],
+    ) -> None:
+        bid, suit = decision
+        self.decisions.append(
+            ["bid", seat, encode_cards(hand), max_bid, bagged, bid, encode_suit(suit)]
+        )
+
+    def discard(self, seat: Optional[int], hand: list[Card], trump: Suit, keep: list[Card]) -> None:
+        self.decisions.append(
+            ["discard", seat, encode_cards(hand), encode_suit(trump), encode_cards(keep)]
+        )
+
+    def play(
+        self,
+        seat: Optional[int],
+        suit_led: Optional[Suit],
+        legal: list[Card],
+        current_cards: list[Card],
+        trump: Suit,
+        hand: Optional[list[Card]],
+        seen: Sequence[Card],
+        card: Card,
+    ) -> None:
+        self.decisions.append([
+            "play",
+            seat,
+            encode_suit(suit_led),
+            encode_cards(legal),
+            encode_cards(current_cards),
+            encode_suit(trump),
+            encode_cards(hand) if hand is not None else None,
+            encode_cards(seen),
+            card.index,
+        ])
+
+    def end_round(
+        self,
+        dealer: Optional[int],
+        bid_seat: Optional[int],
+        bid: int,
+        trump: Optional[Suit],
+        points: Optional[list[int]],
+        scores: list[int],
+        bids: Optional[list[list]] = None,
+        tricks: Optional[list[Optional[list[Card]]]] = None,
+    ) -> None:
+        record = [dealer, bid_seat, bid, encode_suit(trump), points, scores]
+        if bids is not None or tricks is not None:
+            record += [
+                bids,
+                [encode_cards(trick) if trick is not None else None for trick in tricks or ()],
+            ]
+        self.rounds.append(record)
+
+    def to_dict(self, winner: Optional[int] = None, scores: Optional[list[int]] = None) -> dict:
+        return {
+            "source": self.source,
+            "seats": self.seats,
+            "decisions": self.decisions,
+            "rounds": self.rounds,
+            "winner": winner,
+            "scores": scores,
+        }
+
+
+class RecordingStrategy:
+    """Wraps a strategy and records each of its decisions for `seat`."""
+
+    def __init__(self, inner, transcript: Transcript, seat: int) -> None:
+        self.inner = inner
+        self.transcript = transcript
+        self.seat = seat
+        self.name = getattr(inner, "name", type(inner).__name__)
+
+    def bid(self, hand: list[Card], max_bid: int, bagged: bool) -> tuple[int, Suit]:
+        decision = self.inner.bid(hand, max_bid, bagged)
+        self.transcript.bid(self.seat, hand, max_bid, bagged, decision)
+        return decision
+
+    def discard(self, hand: list[Card], trump: Suit) -> list[Card]:
+        keep = self.inner.discard(hand, trump)
+        self.transcript.discard(self.seat, hand, trump, keep)
+        return keep
+
+    def play(self, suit_led, legal, current_cards, trump, hand=None, seen=()) -> Card:
+        card = play_card(self.inner, suit_led, legal, current_cards, trump, hand, seen)
+        self.transcript.play(self.seat, suit_led, legal, current_cards, trump, hand, seen, card)
+        return card
+
+
+def record_game(strategies: list, rng: random.Random) -> dict:
+    """Plays one `sim.play_game` with every seat recorded."""
+    transcript = Transcript("sim", [getattr(s, "name", type(s).__name__) for s in strategies])
+    result = play_game(
+        [RecordingStrategy(s, transcript, seat) for seat, s in enumerate(strategies)], rng
+    )
+    scores = [0, 0]
+    for r in result.rounds:
+        scores, _ = score_round(r.points, scores, r.bid, r.bid_seat)
+        transcript.end_round(r.dealer, r.bid_seat, r.bid, r.trump, r.points, scores)
+    return transcript.to_dict(result.winner, result.scores)
+
+
+def append_transcript(path: Path, game: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(game, separators=(",", ":")) + "\n")
+
+
+def load_transcripts(paths: Sequence[Path]) -> list[dict]:
+    games = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            games.extend(json.loads(line) for line in f if line.strip())
+    return games
+
+
+# ── Replay ──────────────────────────────────────────────────────────
+
+
+def decode_decisions(games: list[dict]) -> list[tuple[str, tuple, object]]:
+    """`(kind, strategy call arguments, recorded decision)` per decision,
+    decoded up front so the replay loop only runs the strategy."""
+    decisions = []
+    for game in games:
+        for record in game["decisions"]:
+            kind = record[0]
+            if kind == "bid":
+                _, _, hand, max_bid, bagged, bid, suit = record
+                decisions.append(
+                    (kind, (decode_cards(hand), max_bid, bagged), (bid, decode_suit(suit)))
+                )
+            elif kind == "discard":
+                _, _, hand, trump, keep = record
+                decisions.append(
+                    (kind, (decode_cards(hand), decode_suit(trump)), sorted(keep))
+                )
+            elif kind == "play":
+                _, _, suit_led, legal, current, trump, hand, seen, card = record
+                decisions.append((
+                    kind,
+                    (decode_suit(suit_led), decode_cards(legal), decode_cards(current),
+                     decode_suit(trump), decode_cards(hand) if hand is not None else None,
+                     decode_cards(seen)),
+                    card,
+                ))
+            else:
+                raise ValueError(f"Unknown decision kind {kind!r}")
+    return decisions
+
+
+@dataclass
+class ReplayResult:
+    total: dict[str, int] = field(default_factory=lambda: dict.fromkeys(KINDS, 0))
+    changed: dict[str, int] = field(default_factory=lambda: dict.fromkeys(KINDS, 0))
+    # (kind, arguments, recorded, replayed) for the first few changes.
+    examples: list[tuple] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def replay(decisions: list[tuple[str, tuple, object]], strategy, max_examples: int = 10) -> ReplayResult:
+    result = ReplayResult()
+    start = time.perf_counter()
+    for kind, args, recorded in decisions:
+        if kind == "bid":
+            replayed = strategy.bid(*args)
+            same = replayed[0] == recorded[0] and (replayed[0] == 0 or replayed[1] == recorded[1])
+        elif kind == "discard":
+            replayed = strategy.discard(*args)
+            same = sorted(card.index for card in replayed) == recorded
+        else:
+            suit_led, legal, current, trump, hand, seen = args
+            replayed = play_card(strategy, suit_led, legal, current, trump, hand, seen)
+            same = replayed.index == recorded
+        result.total[kind] += 1
+        if not same:
+            result.changed[kind] += 1
+            if len(result.examples) < max_examples:
+                result.examples.append((kind, args, recorded, replayed))
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def format_replay(result: ReplayResult) -> str:
+    total = sum(result.total.values())
+    lines = [
+        f"{total} decisions replayed in {result.seconds:.2f}s "
+        f"({total / max(result.seconds, 1e-9):,.0f}/s)"
+    ]
+    for kind in KINDS:
+        lines.append(f"  {kind:<8}{result.changed[kind]:>8} changed of {result.total[kind]}")
+    for kind, args, recorded, replayed in result.examples:
+        lines.append(f"  {kind} {args}: recorded {recorded}, now {replayed}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record and replay 45s game transcripts.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="record offline games")
+    record.add_argument("--games", type=int, default=1000)
+    record.add_argument("--seed", type=int, default=0)
+    record.add_argument("--seats", default="tbot,tbot,tbot,tbot")
+    record.add_argument("--out", type=Path, default=Path("transcripts.jsonl"))
+
+    rerun = commands.add_parser("replay", help="re-run a strategy on recorded decisions")
+    rerun.add_argument("paths", type=Path, nargs="+")
+    rerun.add_argument("--strategy", default="tbot")
+    rerun.add_argument("--source", help='only games of this source, e.g. "tbot:greedy/greedy"')
+    rerun.add_argument("--seed", type=int, default=0)
+    rerun.add_argument("--examples", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        seats = args.seats.split(",")
+        if len(seats) != 4:
+            parser.error("--seats needs exactly four strategies")
+        rng = random.Random(args.seed)
+        strategies = [make_strategy(spec, random.Random(rng.getrandbits(64))) for spec in seats]
+        start = time.perf_counter()
+        with args.out.open("w", encoding="utf-8") as f:
+            for _ in range(args.games):
+                f.write(json.dumps(record_game(strategies, rng), separators=(",", ":")) + "\n")
+        print(f"Recorded {args.games} games to {args.out} in {time.perf_counter() - start:.1f}s")
+        return
+
+    games = load_transcripts(args.paths)
+    if args.source is not None:
+        games = [game for game in games if game["source"] == args.source]
+    decisions = decode_decisions(games)
+    result = replay(decisions, make_strategy(args.strategy, random.Random(args.seed)), args.examples)
+    print(format_replay(result))
+    if any(result.changed.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
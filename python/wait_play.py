@@ -1,34 +1,52 @@
+"""Queue smoke check and matchmaking benchmark.
+
+With no arguments, one headless Chrome checks that the queue LiveView
+connects and that a player can join and leave it (the CI smoke check).
+
+With `--clients K`, K browser-free clients (`lvclient.LiveViewClient`)
+hammer the queue at once: each runs `--cycles` join/leave cycles with a
+random dwell in the queue, then joins and stays until it is matched into
+a four-player game. Whenever a client is matched it loads the game page
+and exits it, so it can keep cycling. The report has the distributions of
+
+    join_ack    join submitted until the queue shows the player
+    leave_ack   leave submitted until the join button is back
+    match       join submitted until the redirect to a game
+    game_load   redirect until the game page is joined
+    exit        exit_game until the queue page is back
+
+and the clients that went wrong: stuck in a stage past its timeout,
+matched into two games for one join, matched after their leave was
+acknowledged, or seated in a game with more than four of them. Matches
+that arrive before the join is acknowledged are counted on their own:
+
+    python wait_play.py --clients 32 --cycles 5 --json queue.json
+"""
+
+import argparse
+import asyncio
+import json
 import os
+import random
 import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Optional
 
+from browserpool import get_driver
+from loadtest import latency_summary
+from lvclient import ACTION_TIMEOUT, LiveViewClient
 from selenium import webdriver
 from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
 QUEUE_READY_TIMEOUT_SECONDS = 180
 ACTION_TIMEOUT_SECONDS = 30
-
-
-def get_driver() -> webdriver.Chrome:
-    """Return a headless Chrome driver for CI and local smoke checks."""
-    chrome_options = Options()
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--window-size=1920,1080")
-
-    chromedriver_path = "/usr/local/bin/chromedriver"
-    if os.path.exists(chromedriver_path):
-        service = Service(executable_path=chromedriver_path)
-        return webdriver.Chrome(service=service, options=chrome_options)
-
-    return webdriver.Chrome(options=chrome_options)
+MATCH_TIMEOUT_SECONDS = 180
+STAGES = ("join_ack", "leave_ack", "match", "game_load", "exit")
 
 
 def live_socket_connected(driver: webdriver.Chrome) -> bool:
@@ -79,5 +97,254 @@ def verify_queue_ready(url: str) -> None:
         driver.quit()
 
 
+# ── Matchmaking benchmark ───────────────────────────────────────────
+
+
+class QueueClient(LiveViewClient):
+    """A `LiveViewClient` that logs every redirect to a game, with whether
+    the client still meant to be in the queue when it arrived."""
+
+    def __init__(self) -> None:
+        super().__init__(log=lambda msg: None)
+        self.queued = False
+        self.cycle = 0
+        # (cycle, game path, wall-clock time, queued)
+        self.matches: list[tuple[int, str, float, bool]] = []
+
+    def _handle(self, ref, topic, event, payload) -> None:
+        super()._handle(ref, topic, event, payload)
+        if self.redirect and "/game/" in self.redirect and (
+            not self.matches or self.matches[-1][1] != self.redirect
+        ):
+            self.matches.append((self.cycle, self.redirect, time.time(), self.queued))
+
+
+@dataclass
+class ClientResult:
+    client: int
+    # (stage, wall-clock start, seconds)
+    samples: list[tuple[str, float, float]] = field(default_factory=list)
+    matches: list[tuple[int, str, float, bool]] = field(default_factory=list)
+    # Joins whose leave raced a match: the match won.
+    matched_while_leaving: int = 0
+    # Joins matched before the server acknowledged them.
+    matched_before_ack: int = 0
+    stuck: Optional[str] = None
+    error: Optional[str] = None
+
+
+class QueueCycler:
+    def __init__(self, url: str, index: int, rng: random.Random, match_timeout: float) -> None:
+        self.url = url
+        self.client = QueueClient()
+        self.result = ClientResult(index)
+        self.rng = rng
+        self.match_timeout = match_timeout
+        # When the last join was acknowledged.
+        self.acknowledged = 0.0
+
+    def record(self, stage: str, started: float) -> None:
+        self.result.samples.append((stage, started, time.time() - started))
+
+    async def wait(self, predicate, timeout: float, stage: str) -> None:
+        try:
+            await self.client.wait_until(predicate, timeout, stage)
+        except TimeoutError:
+            self.result.stuck = stage
+            raise
+
+    def matched(self) -> bool:
+        return self.client.redirect is not None and "/game/" in self.client.redirect
+
+    async def run(self, cycles: int, dwell: float, churned: asyncio.Barrier) -> ClientResult:
+        client = self.client
+        try:
+            try:
+                await client.open(self.url)
+                await self.wait(lambda: client.view.queue_ready, ACTION_TIMEOUT, "queue_page")
+                for cycle in range(cycles):
+                    client.cycle = cycle
+                    submitted = await self.join()
+                    try:
+                        await client.wait_until(self.matched, self.rng.uniform(0, dwell), "dwell")
+                    except TimeoutError:
+                        await self.leave()
+                    if self.matched():
+                        await self.play_out(submitted)
+            finally:
+                # Everyone queues for the last match together, so the queue
+                # fills whole tables and whoever is left waiting is stuck.
+                await churned.wait()
+
+            client.cycle = cycles
+            submitted = await self.join()
+            await self.wait(self.matched, self.match_timeout, "match")
+            await self.play_out(submitted)
+        except Exception as error:
+            # Stage timeouts are already recorded as stuck.
+            if self.result.stuck is None:
+                self.result.error = f"{type(error).__name__}: {error}"
+        finally:
+            await client.close()
+            self.result.matches = client.matches
+        return self.result
+
+    async def join(self) -> float:
+        """Joins the queue; returns when the join was submitted."""
+        client = self.client
+        start = time.time()
+        client.queued = True
+        await client.submit("join")
+        await self.wait(lambda: client.view.in_queue or self.matched(), ACTION_TIMEOUT, "join_ack")
+        self.record("join_ack", start)
+        self.acknowledged = time.time()
+        return start
+
+    async def leave(self) -> None:
+        client = self.client
+        start = time.time()
+        await client.submit("leave")
+        await self.wait(
+            lambda: "join-queue-button" in client.view.buttons or self.matched(),
+            ACTION_TIMEOUT,
+            "leave_ack",
+        )
+        if self.matched():
+            self.result.matched_while_leaving += 1
+        else:
+            client.queued = False
+            self.record("leave_ack", start)
+
+    async def play_out(self, submitted: float) -> None:
+        """Loads the game it was matched into and leaves it for the queue."""
+        client = self.client
+        matched_at = client.matches[-1][2] if client.matches else time.time()
+        self.result.samples.append(("match", submitted, matched_at - submitted))
+        if matched_at < self.acknowledged:
+            self.result.matched_before_ack += 1
+        client.queued = False
+
+        start = time.time()
+        await client.follow_redirect()
+        await self.wait(lambda: client.view.in_game or client.redirect is not None, ACTION_TIMEOUT, "game_load")
+        if not client.view.in_game:
+            raise RuntimeError(f"Matched into {client.url} but sent on to {client.redirect}")
+        self.record("game_load", start)
+
+        start = time.time()
+        await client.click("exit_game")
+        await self.wait(lambda: client.redirect is not None, ACTION_TIMEOUT, "exit")
+        await client.follow_redirect()
+        await self.wait(lambda: "join-queue-button" in client.view.buttons, ACTION_TIMEOUT, "exit")
+        self.record("exit", start)
+
+
+async def run_clients(
+    url: str, clients: int, cycles: int, dwell: float, stagger: float, seed: int, match_timeout: float
+) -> list[ClientResult]:
+    rng = random.Random(seed)
+    churned = asyncio.Barrier(clients)
+
+    async def run_one(index: int, client_rng: random.Random) -> ClientResult:
+        await asyncio.sleep(index * stagger)
+        return await QueueCycler(url, index, client_rng, match_timeout).run(cycles, dwell, churned)
+
+    return await asyncio.gather(*(
+        run_one(index, random.Random(rng.getrandbits(64))) for index in range(clients)
+    ))
+
+
+def summarize(results: list[ClientResult], duration: float) -> dict:
+    by_stage: dict[str, list[float]] = {stage: [] for stage in STAGES}
+    for result in results:
+        for stage, _, seconds in result.samples:
+            by_stage[stage].append(seconds)
+
+    games: dict[str, list[int]] = defaultdict(list)
+    double_matched, ghost_matched = [], []
+    for result in results:
+        per_cycle: dict[int, list[str]] = defaultdict(list)
+        for cycle, game, _, queued in result.matches:
+            games[game].append(result.client)
+            per_cycle[cycle].append(game)
+            if not queued:
+                ghost_matched.append({"client": result.client, "cycle": cycle, "game": game})
+        for cycle, cycle_games in per_cycle.items():
+            if len(cycle_games) > 1:
+                double_matched.append({"client": result.client, "cycle": cycle, "games": cycle_games})
+
+    return {
+        "clients": len(results),
+        "duration": duration,
+        "latency": {stage: latency_summary(values) for stage, values in by_stage.items()},
+        "games": len(games),
+        "matched_while_leaving": sum(result.matched_while_leaving for result in results),
+        "matched_before_ack": sum(result.matched_before_ack for result in results),
+        "stuck": [{"client": r.client, "stage": r.stuck} for r in results if r.stuck],
+        "errors": [{"client": r.client, "error": r.error} for r in results if r.error],
+        "double_matched": double_matched,
+        "ghost_matched": ghost_matched,
+        "overfull_games": [
+            {"game": game, "clients": players} for game, players in games.items() if len(players) > 4
+        ],
+    }
+
+
+def anomalies(report: dict) -> int:
+    return sum(
+        len(report[key]) for key in ("stuck", "errors", "double_matched", "ghost_matched", "overfull_games")
+    )
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{report['clients']} clients, {report['games']} games in {report['duration']:.1f}s; "
+        f"{report['matched_while_leaving']} leaves lost a race with a match, "
+        f"{report['matched_before_ack']} joins matched before their acknowledgement",
+        f"{'stage':<12}{'count':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}",
+    ]
+    for stage, summary in report["latency"].items():
+        lines.append(
+            f"{stage:<12}{summary['count']:>8}{summary['p50']:>9.3f}{summary['p95']:>9.3f}"
+            f"{summary['p99']:>9.3f}{summary['max']:>9.3f}"
+        )
+    for key in ("stuck", "errors", "double_matched", "ghost_matched", "overfull_games"):
+        if report[key]:
+            lines.append(f"{key}: {len(report[key])} {report[key][:5]}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check the queue page, or benchmark matchmaking.")
+    parser.add_argument("--url", default=os.getenv("APP_BASE_URL", "http://localhost:4000/play"))
+    parser.add_argument("--clients", type=int, default=0,
+                        help="run the matchmaking benchmark with this many clients")
+    parser.add_argument("--cycles", type=int, default=3, help="join/leave cycles per client")
+    parser.add_argument("--dwell", type=float, default=1.0, help="most seconds to stay queued per cycle")
+    parser.add_argument("--stagger", type=float, default=0.01, help="seconds between client starts")
+    parser.add_argument("--match-timeout", type=float, default=MATCH_TIMEOUT_SECONDS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="write the report and raw samples here")
+    args = parser.parse_args()
+
+    if not args.clients:
+        verify_queue_ready(args.url)
+        return
+    if args.clients % 4:
+        parser.error("--clients must be a multiple of 4 so every client ends up in a game")
+
+    start = time.time()
+    results = asyncio.run(run_clients(
+        args.url, args.clients, args.cycles, args.dwell, args.stagger, args.seed, args.match_timeout
+    ))
+    report = summarize(results, time.time() - start)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**report, "args": vars(args), "results": [asdict(r) for r in results]}, f)
+    if anomalies(report):
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
-    verify_queue_ready(os.getenv("APP_BASE_URL", "http://localhost:4000/play"))
+    main()